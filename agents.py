@@ -0,0 +1,169 @@
+# agents.py
+# Decision-making agents: one per seat, console or AI
+
+from typing import List, Optional, Tuple
+
+from cards import (
+    Card,
+    CARD_INDEX,
+    CARD_NAMES,
+    CHARACTER_NAMES,
+    WEAPON_NAMES,
+    ROOM_NAMES,
+)
+from planner import plan
+from players import Player, AIPlayer
+
+
+class Agent:
+    """
+    Interface for every decision a seat has to make during a game.
+    The engine never calls input() itself; it asks the seat's agent.
+    Cards are passed as card ids and board positions as position ids
+    (see cards.py); names are only for showing to a human.
+    """
+
+    def choose_action(self, game, player: Player) -> str:
+        """Return "A" to accuse or "M" to move this turn."""
+        raise NotImplementedError
+
+    def use_secret_passage(self, game, player: Player) -> bool:
+        """Return True to take the secret passage out of the current room."""
+        raise NotImplementedError
+
+    def before_roll(self, game, player: Player) -> None:
+        """Hook called right before the dice are rolled."""
+
+    def choose_destination(self, game, player: Player, destinations: List[int]) -> int:
+        """Pick one of the (sorted) reachable destination positions."""
+        raise NotImplementedError
+
+    def choose_suggestion(self, game, player: Player, room: int) -> Tuple[int, int]:
+        """Return (suspect, weapon) card ids to suggest in the given room card."""
+        raise NotImplementedError
+
+    def choose_card_to_show(
+        self, game, player: Player, suggester: Player, matching_cards: List[Card]
+    ) -> Card:
+        """Pick which matching card to show the suggester."""
+        raise NotImplementedError
+
+    def choose_accusation(self, game, player: Player) -> Tuple[int, int, int]:
+        """Return (suspect, weapon, room) card ids for an accusation."""
+        raise NotImplementedError
+
+    def suggestion_result(
+        self, game, player: Player, refuter: Optional[Player], card: Optional[Card]
+    ) -> None:
+        """Hook called after this seat's suggestion: who refuted it with which
+        card, or (None, None) if nobody could."""
+
+
+def _choose_from_list(prompt: str, options: list):
+    """Keep asking until the user picks a valid 1-based option number."""
+    while True:
+        choice = input(prompt).strip()
+        if choice.isdigit() and 1 <= int(choice) <= len(options):
+            return options[int(choice) - 1]
+        print("Invalid choice. Try again.")
+
+
+class ConsoleAgent(Agent):
+    """Human seat: every decision is read from the terminal."""
+
+    def choose_action(self, game, player):
+        while True:
+            choice = input(
+                "Do you want to (A)ccuse or (M)ove this turn? [M]: "
+            ).strip().upper()
+            if choice in ("", "M", "A"):
+                return choice or "M"
+            print("Please enter 'A' or 'M'.")
+
+    def use_secret_passage(self, game, player):
+        use_sp = input(
+            "You are in a room with a SECRET PASSAGE.\n"
+            "Type 'S' to use it (no dice required) or press Enter to roll the dice: "
+        ).strip().upper()
+        return use_sp == "S"
+
+    def before_roll(self, game, player):
+        input("\nPress Enter to roll the dice...")
+
+    def choose_destination(self, game, player, destinations):
+        return _choose_from_list("Choose destination number: ", destinations)
+
+    def choose_suggestion(self, game, player, room):
+        from suggestion import prompt_for_suggestion
+
+        suspect, weapon, _ = prompt_for_suggestion(player, CARD_NAMES[room])
+        return CARD_INDEX[suspect], CARD_INDEX[weapon]
+
+    def choose_card_to_show(self, game, player, suggester, matching_cards):
+        if len(matching_cards) == 1:
+            return matching_cards[0]
+        print("You have the following matching cards:")
+        for i, c in enumerate(matching_cards, start=1):
+            print(f"  {i}. {c.name}")
+        while True:
+            choice = input("Choose a card number to show: ").strip()
+            if choice.isdigit() and 1 <= int(choice) <= len(matching_cards):
+                return matching_cards[int(choice) - 1]
+            print("Invalid choice. Try again.")
+
+    def choose_accusation(self, game, player):
+        print("Choose a suspect:")
+        for i, name in enumerate(CHARACTER_NAMES, start=1):
+            print(f"  {i}. {name}")
+        suspect = _choose_from_list("Suspect number: ", CHARACTER_NAMES)
+
+        print("\nChoose a weapon:")
+        for i, name in enumerate(WEAPON_NAMES, start=1):
+            print(f"  {i}. {name}")
+        weapon = _choose_from_list("Weapon number: ", WEAPON_NAMES)
+
+        print("\nChoose a room:")
+        for i, name in enumerate(ROOM_NAMES, start=1):
+            print(f"  {i}. {name}")
+        room = _choose_from_list("Room number: ", ROOM_NAMES)
+
+        return CARD_INDEX[suspect], CARD_INDEX[weapon], CARD_INDEX[room]
+
+
+class AIAgent(Agent):
+    """AI seat: decisions come from the AIPlayer's knowledge base, no I/O."""
+
+    def choose_action(self, game, player: AIPlayer):
+        return "A" if player.should_accuse() else "M"
+
+    def use_secret_passage(self, game, player: AIPlayer):
+        # Skip the dice when the room at the other end beats the expected roll.
+        moves = plan(game, player)
+        dest = game.board.destination_of_secret_passage(player.position)
+        return moves.score(dest) >= moves.roll_value(player.position)
+
+    def choose_destination(self, game, player: AIPlayer, destinations):
+        # Rooms worth suggesting in, now and within the next few turns.
+        return plan(game, player).best(destinations)
+
+    def choose_suggestion(self, game, player: AIPlayer, room):
+        suspect, weapon, _ = player.choose_suggestion(room)
+        return suspect, weapon
+
+    def choose_card_to_show(self, game, player, suggester, matching_cards):
+        return matching_cards[0]
+
+    def choose_accusation(self, game, player: AIPlayer):
+        return player.get_accusation()
+
+
+def default_agent_for(player: Player) -> Agent:
+    """
+    AI seats get an AIAgent (an MCTSAgent for mcts.MCTSPlayer), everyone
+    else plays from the console.
+    """
+    if not player.is_ai:
+        return ConsoleAgent()
+    from mcts import MCTSAgent, MCTSPlayer
+
+    return MCTSAgent() if isinstance(player, MCTSPlayer) else AIAgent()
@@ -0,0 +1,153 @@
+# batch.py
+# Struct-of-arrays store for many parked games: NumPy arrays indexed by game and seat
+
+import random
+
+import numpy as np
+
+from cards import CARDS, WEAPON_IDS
+from state import GameState
+
+# card bitmasks: uint64 while every card fits, Python ints beyond (large rulesets)
+MASK_DTYPE = np.uint64 if len(CARDS) <= 64 else object
+_RNG_WORDS = 625  # random.Random.getstate(): 624 Mersenne Twister words and the index
+_RNG_VERSION = random.Random(0).getstate()[0]
+
+
+class GameArrays:
+    """
+    The states of many games, one row per game, in contiguous arrays:
+    positions, hands and elimination flags per [game, seat], weapon
+    locations per [game, weapon], and the turn counters per game. AI
+    knowledge is packed too: each AI seat's deduction engine becomes its
+    HAS / NOT bitmasks per owner (the players, then the envelope), and the
+    per-owner counts the engine keeps are recomputed when a row is loaded.
+    Only the engine's open clauses and the rest of each snapshot_kb() (for
+    BitsetAIPlayer two small ints) stay Python objects.
+
+    store() / load() convert to and from state.GameState, so a few live
+    CluedoGame objects can step any number of parked games: restore a row,
+    play, snapshot it back. With rng=True each game's dice RNG is kept as
+    its 625 state words, which is most of a row.
+    """
+
+    def __init__(self, games: int, num_players: int = 6, rng: bool = False):
+        owners = num_players + 1  # as DeductionEngine.owners: players, then ENVELOPE
+        self.games = games
+        self.num_players = num_players
+        self.positions = np.zeros((games, num_players), np.int16)
+        self.weapons = np.zeros((games, len(WEAPON_IDS)), np.int16)
+        self.hands = np.zeros((games, num_players), MASK_DTYPE)
+        self.eliminated = np.zeros((games, num_players), np.bool_)
+        self.current = np.zeros(games, np.int16)
+        self.turn_count = np.zeros(games, np.int32)
+        self.wrong_accusations = np.zeros(games, np.int16)
+        self.winner = np.full(games, -1, np.int16)
+        self.game_over = np.zeros(games, np.bool_)
+
+        # knowledge of each AI seat ([game, seat, owner] for the engine masks)
+        self.has = np.zeros((games, num_players, owners), MASK_DTYPE)
+        self.not_have = np.zeros((games, num_players, owners), MASK_DTYPE)
+        self.next_clause = np.zeros((games, num_players), np.int32)
+        self.clauses = np.empty((games, num_players), dtype=object)
+        self.clauses.fill(())  # engine clause tuples, mostly the shared ()
+        self.kb = np.full((games, num_players), None, dtype=object)  # None = not AI
+
+        self.rng = np.zeros((games, _RNG_WORDS), np.uint32) if rng else None
+
+    # --- Rows -------------------------------------------------------------------
+
+    def store(self, g: int, state: GameState) -> None:
+        """Pack a snapshot into row g."""
+        self.positions[g] = state.positions
+        self.weapons[g] = state.weapons
+        self.hands[g] = state.hands
+        self.eliminated[g] = [bool(state.eliminated >> s & 1) for s in range(self.num_players)]
+        self.current[g] = state.current
+        self.turn_count[g] = state.turn_count
+        self.wrong_accusations[g] = state.wrong_accusations
+        self.winner[g] = state.winner
+        self.game_over[g] = state.game_over
+        for seat, snap in enumerate(state.knowledge):
+            if snap is None:
+                self.kb[g, seat] = None
+                continue
+            *own, engine = snap
+            has, not_have, _, _, _, clauses, next_clause = engine
+            self.has[g, seat] = has
+            self.not_have[g, seat] = not_have
+            self.clauses[g, seat] = clauses
+            self.next_clause[g, seat] = next_clause
+            self.kb[g, seat] = tuple(own)
+        if self.rng is not None:
+            if state.rng is None:
+                raise ValueError("GameArrays(rng=True) needs snapshot(rng=True) states.")
+            version, words, gauss = state.rng
+            if gauss is not None:
+                raise ValueError("The game RNG has a pending gauss() value.")
+            self.rng[g] = words
+
+    def load(self, g: int) -> GameState:
+        """Row g as a GameState, ready for CluedoGame.restore()."""
+        eliminated = 0
+        for seat, out in enumerate(self.eliminated[g].tolist()):
+            if out:
+                eliminated |= 1 << seat
+        knowledge = []
+        for seat, own in enumerate(self.kb[g].tolist()):
+            if own is None:
+                knowledge.append(None)
+                continue
+            has = tuple(self.has[g, seat].tolist())
+            not_have = tuple(self.not_have[g, seat].tolist())
+            excluded = [0] * len(CARDS)
+            for mask in not_have:
+                while mask:
+                    low = mask & -mask
+                    excluded[low.bit_length() - 1] += 1
+                    mask ^= low
+            engine = (
+                has,
+                not_have,
+                tuple(bin(m).count("1") for m in has),
+                tuple(bin(m).count("1") for m in not_have),
+                tuple(excluded),
+                self.clauses[g, seat],
+                int(self.next_clause[g, seat]),
+            )
+            knowledge.append((*own, engine))
+        rng = None
+        if self.rng is not None:
+            rng = (_RNG_VERSION, tuple(self.rng[g].tolist()), None)
+        return GameState(
+            positions=tuple(self.positions[g].tolist()),
+            weapons=tuple(self.weapons[g].tolist()),
+            hands=tuple(self.hands[g].tolist()),
+            eliminated=eliminated,
+            current=int(self.current[g]),
+            turn_count=int(self.turn_count[g]),
+            wrong_accusations=int(self.wrong_accusations[g]),
+            winner=int(self.winner[g]),
+            game_over=bool(self.game_over[g]),
+            knowledge=tuple(knowledge),
+            rng=rng,
+        )
+
+    def store_game(self, g: int, game) -> None:
+        self.store(g, game.snapshot(rng=self.rng is not None))
+
+    def load_game(self, g: int, game) -> None:
+        game.restore(self.load(g))
+
+    # --- Footprint ----------------------------------------------------------------
+
+    @property
+    def array_bytes(self) -> int:
+        """Bytes in the arrays themselves (object columns count 8 per reference)."""
+        arrays = [v for v in vars(self).values() if isinstance(v, np.ndarray)]
+        return sum(a.nbytes for a in arrays)
+
+    @property
+    def bytes_per_game(self) -> float:
+        """Array bytes per row (the objects the object columns point to excluded)."""
+        return self.array_bytes / self.games
@@ -0,0 +1,74 @@
+# bench_board.py
+# Micro-benchmark: move generation on the room graph vs the square-level grid
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import Board, MAX_ROLL  # noqa: E402
+from grid_board import GridBoard  # noqa: E402
+
+
+def token_layouts(board, seed: int, count: int, tokens: int = 6):
+    """Random placements of six tokens; corridor squares hold one token each."""
+    rng = random.Random(seed)
+    layouts = []
+    for _ in range(count):
+        squares = rng.sample([p for p in board.positions if p not in board.rooms], tokens)
+        layouts.append(
+            [rng.choice(board.rooms) if rng.random() < 0.5 else sq for sq in squares]
+        )
+    return layouts
+
+
+def bench_moves(board, layouts, repeat: int, blocking: bool = True) -> float:
+    """Mean seconds to generate moves for every token and every roll, best of repeat."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for layout in layouts:
+            for i, pos in enumerate(layout):
+                others = layout[:i] + layout[i + 1:] if blocking else ()
+                for roll in range(1, MAX_ROLL + 1):
+                    board.moves(pos, roll, others)
+        best = min(best, (time.perf_counter() - start) / len(layouts))
+    return best
+
+
+def bench_build(board_class, count: int = 200) -> float:
+    board_class()  # the first board of a layout builds the shared tables
+    start = time.perf_counter()
+    for _ in range(count):
+        board_class()
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Moves for 6 tokens x 6 rolls, graph Board vs GridBoard."
+    )
+    parser.add_argument("--layouts", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for name, board_class in (("graph Board", Board), ("GridBoard", GridBoard)):
+        start = time.perf_counter()
+        board = board_class()
+        first = time.perf_counter() - start
+        layouts = token_layouts(board, args.seed, args.layouts)
+        free = bench_moves(board, layouts, args.repeat, blocking=False)
+        blocked = bench_moves(board, layouts, args.repeat)
+        print(f"{name} ({len(board.positions)} positions)")
+        print(f"  first build:          {first * 1e3:8.2f} ms")
+        print(f"  later builds:         {bench_build(board_class) * 1e6:8.2f} us")
+        print(f"  6x6 moves, no tokens: {free * 1e6:8.2f} us")
+        print(f"  6x6 moves, blocking:  {blocked * 1e6:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# bench_bus.py
+# Benchmark: every AI learning through the event bus vs only the suggester learning
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bus import EventBus  # noqa: E402
+from game import CluedoGame  # noqa: E402
+from kb_bits import BitsetAIPlayer  # noqa: E402
+from players import AIPlayer  # noqa: E402
+from simulate import game_seed  # noqa: E402
+
+
+class SuggesterOnlyBus(EventBus):
+    """The knowledge flow before the bus: only the suggester learns."""
+
+    __slots__ = ("_game", "_by_seat")
+
+    def __init__(self, game: CluedoGame):
+        super().__init__(len(game.players))
+        self._game = game
+        self._by_seat = {}
+
+    def subscribe(self, seat, listener):
+        super().subscribe(seat, listener)
+        self._by_seat[seat] = listener
+
+    def _suggester(self):
+        # suggestions are made on their suggester's own turn
+        return self._by_seat.get(self._game.current_player_idx)
+
+    def passed(self, player_id, cards):
+        listener = self._suggester()
+        if listener is not None:
+            listener.record_player_has_none(player_id, cards)
+
+    def refuted(self, player_id, cards):
+        listener = self._suggester()
+        if listener is not None:
+            listener.record_player_may_have(player_id, cards)
+
+
+class _NullListener:
+    __slots__ = ("id",)
+
+    def __init__(self, pid):
+        self.id = pid
+
+    def record_player_has_none(self, player_id, cards):
+        pass
+
+    def record_player_may_have(self, player_id, cards):
+        pass
+
+    def record_shown_card(self, player_id, card):
+        pass
+
+
+def play(seed: int, games: int, ai_class, everyone: bool):
+    """Turns played, turns/s and wins per seat over seeded 6-AI games."""
+    turns = 0
+    wins = [0] * 6
+    elapsed = 0.0
+    for i in range(games):
+        game = CluedoGame(ai_seats=range(6), verbose=False, seed=game_seed(seed, i),
+                          ai_class=ai_class)
+        if not everyone:
+            bus = SuggesterOnlyBus(game)
+            for seat, p in enumerate(game.players):
+                bus.subscribe(seat, p)
+            game.bus = bus
+        start = time.perf_counter()
+        while not game.game_over:
+            game.play_turn()
+        elapsed += time.perf_counter() - start
+        turns += game.turn_count
+        if game.winner is not None:
+            wins[game.players.index(game.winner)] += 1
+    return turns, turns / elapsed, wins
+
+
+def dispatch_rate(events: int) -> float:
+    """Bus events/s to six no-op subscribers: the cost of the dispatch itself."""
+    bus = EventBus(6)
+    for seat in range(6):
+        bus.subscribe(seat, _NullListener(seat + 1))
+    cards = (0, 6, 12)
+    start = time.perf_counter()
+    for i in range(events // 3):
+        pid = i % 6 + 1
+        bus.passed(pid, cards)
+        bus.refuted(pid, cards)
+        bus.shown(i % 6, pid, 0)
+    return events / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Turns/s with every AI learning from public suggestions vs the suggester only."
+    )
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--kb", choices=("set", "bitset"), default="set")
+    args = parser.parse_args()
+
+    ai_class = BitsetAIPlayer if args.kb == "bitset" else AIPlayer
+    print(f"bus dispatch (no-op subscribers): {dispatch_rate(400_000):12,.0f} events/s")
+    rates = {}
+    for everyone, label in ((False, "suggester only"), (True, "every AI (bus)")):
+        turns, rate, wins = play(args.seed, args.games, ai_class, everyone)
+        rates[everyone] = rate
+        print(f"{label:<16}{rate:10,.0f} turns/s  {turns / args.games:6.1f} turns/game"
+              f"  wins per seat {wins}")
+    print(f"cost per turn:  {rates[False] / rates[True]:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
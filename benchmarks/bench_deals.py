@@ -0,0 +1,70 @@
+# bench_deals.py
+# Micro-benchmark: bulk NumPy deals vs one-at-a-time deck dealing
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import deals  # noqa: E402
+from cards import create_all_cards  # noqa: E402
+from deck import deal_cards, select_solution  # noqa: E402
+from simulate import play_game  # noqa: E402
+
+
+def bench_deck(n: int, seed: int) -> float:
+    """Deals/sec with select_solution + deal_cards."""
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for _ in range(n):
+        *_, deck = select_solution(create_all_cards(), rng)
+        deal_cards(deck, 6)
+    return n / (time.perf_counter() - start)
+
+
+def bench_bulk(n: int, seed: int, chunk: int):
+    """Deals/sec streaming bulk_deals, and the peak traced memory in MB."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    for owners in deals.bulk_deals(n, seed, chunk=chunk):
+        pass
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return n / elapsed, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Deals/sec: deck.select_solution + deal_cards vs deals.bulk_deals."
+    )
+    parser.add_argument("--deals", type=int, default=2_000_000, help="bulk deals to stream")
+    parser.add_argument("--deck-deals", type=int, default=50_000)
+    parser.add_argument("--chunk", type=int, default=deals.BLOCK)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--games", type=int, default=0,
+                        help="also play this many bulk deals and print wins by seat")
+    args = parser.parse_args()
+
+    deck_rate = bench_deck(args.deck_deals, args.seed)
+    bulk_rate, peak = bench_bulk(args.deals, args.seed, args.chunk)
+    print(f"deck, one at a time:  {deck_rate:12,.0f} deals/s")
+    print(f"bulk, chunks of {args.chunk:,}: {bulk_rate:12,.0f} deals/s ({bulk_rate / deck_rate:.0f}x)")
+    print(f"peak memory:          {peak:12.1f} MB for {args.deals:,} deals")
+
+    if args.games:
+        wins = [0] * 6
+        owners = next(deals.bulk_deals(args.games, args.seed, chunk=args.games))
+        for i, row in enumerate(owners):
+            result = play_game(i, args.seed, deal=deals.game_deal(row))
+            if result.winner_seat >= 0:
+                wins[result.winner_seat] += 1
+        print("wins by seat:         " + "  ".join(f"{w / args.games:.1%}" for w in wins))
+
+
+if __name__ == "__main__":
+    main()
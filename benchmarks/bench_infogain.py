@@ -0,0 +1,63 @@
+# bench_infogain.py
+# Micro-benchmark: information-gain suggestion scoring, cold and cached
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import infogain  # noqa: E402
+from cards import ROOM_IDS  # noqa: E402
+from game import CluedoGame  # noqa: E402
+
+
+def states(games: int, turns: int):
+    """(engine, player id) of every AI after `turns` turns of `games` games."""
+    out = []
+    for seed in range(games):
+        game = CluedoGame(ai_seats=range(6), verbose=False, seed=seed)
+        for _ in range(turns):
+            if game.game_over:
+                break
+            game.play_turn()
+        out.extend((p.engine, p.id) for p in game.players)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Microseconds per suggestion decision (36 candidates), cold and cached."
+    )
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=18)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget-us", type=float, default=1000.0)
+    args = parser.parse_args()
+
+    kbs = states(args.games, args.turns)
+    decisions = [(engine, me, room) for engine, me in kbs for room in ROOM_IDS]
+
+    best_cold = best_cached = float("inf")
+    for _ in range(args.repeat):
+        infogain.clear_cache()
+        start = time.perf_counter()
+        for engine, me, room in decisions:
+            infogain.best_suggestion(engine, me, room)
+        best_cold = min(best_cold, time.perf_counter() - start)
+        start = time.perf_counter()
+        for engine, me, room in decisions:
+            infogain.best_suggestion(engine, me, room)
+        best_cached = min(best_cached, time.perf_counter() - start)
+
+    cold = best_cold / len(decisions) * 1e6
+    cached = best_cached / len(decisions) * 1e6
+    print(f"decisions:  {len(decisions):,} ({len(kbs)} knowledge states x {len(ROOM_IDS)} rooms)")
+    print(f"cold:       {cold:8.1f} us/decision")
+    print(f"cached:     {cached:8.1f} us/decision")
+    print(f"budget:     {args.budget_us:8.1f} us  ({'ok' if cold <= args.budget_us else 'OVER'})")
+
+
+if __name__ == "__main__":
+    main()
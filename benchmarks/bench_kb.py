@@ -0,0 +1,89 @@
+# bench_kb.py
+# Micro-benchmark: per-event knowledge-base update cost, set vs bitset AIPlayer
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cards import CHARACTER_IDS, WEAPON_IDS, ROOM_IDS, create_all_cards  # noqa: E402
+from deck import deal_cards, select_solution  # noqa: E402
+from kb_bits import BitsetAIPlayer  # noqa: E402
+from players import AIPlayer, create_players  # noqa: E402
+
+
+def make_event_script(seed: int, num_players: int = 6, suggestions: int = 40):
+    """
+    Deal a seeded game and script the KB events the last seat would receive
+    from random suggestions, exactly as CluedoGame.process_refutations does.
+    """
+    rng = random.Random(seed)
+    *_, deck = select_solution(create_all_cards(), rng)
+    hands = deal_cards(deck, num_players)
+    me = num_players - 1
+    events = []
+    for _ in range(suggestions):
+        trio = (
+            rng.choice(CHARACTER_IDS),
+            rng.choice(WEAPON_IDS),
+            rng.choice(ROOM_IDS),
+        )
+        for offset in range(1, num_players):
+            seat = (me + offset) % num_players
+            matching = [c.id for c in hands[seat] if c.id in trio]
+            if not matching:
+                for card in trio:
+                    events.append(("record_player_cannot_have", (seat + 1, card)))
+                continue
+            events.append(("record_seen_card", (matching[0],)))
+            events.append(("record_player_may_have", (seat + 1, list(trio))))
+            break
+    return hands, events
+
+
+def fresh_kb(ai_class, hands):
+    players = create_players(len(hands), ai_class=ai_class)
+    for p, hand in zip(players, hands):
+        p.hand = list(hand)
+    ai = players[-1]
+    ai.initialize_kb(CHARACTER_IDS, WEAPON_IDS, ROOM_IDS, players)
+    return ai
+
+
+def bench(ai_class, scripts, repeat: int) -> float:
+    """Mean seconds per KB event over every script, best of `repeat`."""
+    best = float("inf")
+    n_events = sum(len(events) for _, events in scripts)
+    for _ in range(repeat):
+        elapsed = 0.0
+        for hands, events in scripts:
+            ai = fresh_kb(ai_class, hands)
+            calls = [(getattr(ai, name), args) for name, args in events]
+            start = time.perf_counter()
+            for fn, args in calls:
+                fn(*args)
+            elapsed += time.perf_counter() - start
+        best = min(best, elapsed / n_events)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-event KB update cost, set vs bitset.")
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    scripts = [make_event_script(args.seed * 100003 + g) for g in range(args.games)]
+    set_cost = bench(AIPlayer, scripts, args.repeat)
+    bit_cost = bench(BitsetAIPlayer, scripts, args.repeat)
+    print(f"set-based AIPlayer:   {set_cost * 1e6:7.2f} us/event")
+    print(f"BitsetAIPlayer:       {bit_cost * 1e6:7.2f} us/event")
+    print(f"speedup:              {set_cost / bit_cost:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# bench_mcts.py
+# Micro-benchmark: MCTS decisions/sec, rollouts/sec and time-budget adherence
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import CluedoGame  # noqa: E402
+from mcts import mcts_seats  # noqa: E402
+
+
+def midgame(seed: int, turns: int, **options) -> CluedoGame:
+    """An all-AI game with an MCTS seat 0, played `turns` turns in."""
+    game = CluedoGame(ai_seats=range(6), verbose=False, seed=seed,
+                      seat_classes=mcts_seats([0], **options))
+    for _ in range(turns):
+        if game.game_over:
+            break
+        game.play_turn()
+    return game
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Destination decisions/sec of an MCTS seat and how well it keeps its budget."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--turns", type=int, default=12)
+    parser.add_argument("--decisions", type=int, default=40)
+    parser.add_argument("--budget", type=float, nargs="+", default=[0.01, 0.05, 0.2])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1])
+    args = parser.parse_args()
+
+    for workers in args.workers:
+        for budget in args.budget:
+            game = midgame(args.seed, args.turns, budget=budget, workers=workers)
+            player = game.players[0]
+            agent = game.agents[0]
+            state = game.snapshot()
+            rolls = random.Random(args.seed)
+            times = []
+            for _ in range(args.decisions):
+                game.restore(state)
+                moves = game.available_moves_for_player(player, rolls.randint(1, 6))
+                before = agent.stats.decisions
+                start = time.perf_counter()
+                agent.choose_destination(game, player, moves)
+                if agent.stats.decisions > before:  # only one move worth searching
+                    times.append(time.perf_counter() - start)
+            stats = agent.stats
+            if not times:
+                print(f"workers {workers}, budget {budget:.3f}s: nothing to search")
+                continue
+            times.sort()
+            print(
+                f"workers {workers}, budget {budget:.3f}s:"
+                f" {stats.decisions_per_sec:8.1f} decisions/s"
+                f" {stats.iterations / stats.seconds:8,.0f} rollouts/s"
+                f"  median {times[len(times) // 2] / budget:5.2f}x"
+                f"  max {times[-1] / budget:5.2f}x budget"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# bench_memory.py
+# Memory check: bytes per game, live and parked, measured with tracemalloc against ceilings;
+# parked games must play on exactly as live ones
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import infogain  # noqa: E402
+import planner  # noqa: E402
+from batch import GameArrays  # noqa: E402
+from board import Board  # noqa: E402
+from game import CluedoGame  # noqa: E402
+from kb_bits import BitsetAIPlayer  # noqa: E402
+from players import AIPlayer  # noqa: E402
+
+# bytes per classic 6-AI game after 30 turns; --check fails above these
+# (live games and snapshots include the shared public knowledge's engine)
+CEILINGS = {
+    "live game, set KB": 68_000,
+    "live game, bitset KB": 58_000,
+    "GameState snapshot": 11_000,
+    "GameArrays row": 2_000,
+    "GameArrays row + rng": 4_500,
+}
+
+
+def played(n: int, turns: int, seed: int, ai_class):
+    games = []
+    for i in range(n):
+        game = CluedoGame(ai_seats=range(6), verbose=False, seed=f"{seed}:{i}", ai_class=ai_class)
+        while game.turn_count < turns and not game.game_over:
+            game.play_turn()
+        games.append(game)
+    return games
+
+
+def traced(build) -> int:
+    """Bytes still allocated by build() once it returns (its result kept alive)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    infogain.clear_cache()  # shared between games, not part of any one game
+    planner.clear_cache()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def parked(n: int, games, rng: bool):
+    arrays = GameArrays(n, rng=rng)
+    for g, game in enumerate(games):
+        arrays.store_game(g, game)
+    return arrays
+
+
+def outcome(game) -> tuple:
+    """Everything a finished game is compared on: result, board and each AI's facts."""
+    return (
+        game.winner and game.winner.id,
+        game.turn_count,
+        game.wrong_accusations,
+        tuple(p.position for p in game.players),
+        tuple(p.eliminated for p in game.players),
+        tuple(w.location for w in game.weapons.values()),
+        tuple(
+            (tuple(p.engine.has.values()), tuple(p.engine.not_have.values()))
+            for p in game.players if p.is_ai
+        ),
+    )
+
+
+def mismatches(n: int, seed: int, ai_class) -> int:
+    """
+    Games (of n) that end differently when every turn is played on one
+    shared live game, loaded from a GameArrays row (dice RNG included) and
+    parked again, than when each game is played straight through.
+    """
+    straight = [outcome(g) for g in played(n, 10**6, seed, ai_class)]
+    arrays = GameArrays(n, rng=True)
+    for g, game in enumerate(played(n, 0, seed, ai_class)):
+        arrays.store_game(g, game)
+    live = CluedoGame(ai_seats=range(6), verbose=False, seed="live", ai_class=ai_class)
+    running = list(range(n))
+    while running:
+        for g in running:
+            arrays.load_game(g, live)
+            live.play_turn()
+            arrays.store_game(g, live)
+        running = [g for g in running if not arrays.game_over[g]]
+    differ = 0
+    for g in range(n):
+        arrays.load_game(g, live)
+        differ += outcome(live) != straight[g]
+    return differ
+
+
+def measure(n: int, turns: int, seed: int) -> dict:
+    Board()  # the shared movement tables are built once per process, not per game
+    played(2, turns, seed, AIPlayer)
+    games = played(n, turns, seed, BitsetAIPlayer)
+    return {
+        "live game, set KB": traced(lambda: played(n, turns, seed, AIPlayer)) / n,
+        "live game, bitset KB": traced(lambda: played(n, turns, seed, BitsetAIPlayer)) / n,
+        "GameState snapshot": traced(lambda: [g.snapshot() for g in games]) / n,
+        "GameArrays row": traced(lambda: parked(n, games, False)) / n,
+        "GameArrays row + rng": traced(lambda: parked(n, games, True)) / n,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Bytes per game (tracemalloc): live CluedoGames, snapshots, GameArrays rows."
+    )
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--turns", type=int, default=30, help="turns played before measuring")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true",
+                        help="exit 1 if any representation exceeds its ceiling, or a parked"
+                             " game plays differently")
+    args = parser.parse_args()
+
+    sizes = measure(args.games, args.turns, args.seed)
+    over = []
+    print(f"{'representation':<24}{'bytes/game':>12}{'ceiling':>10}{'100k games':>12}")
+    for name, size in sizes.items():
+        flag = ""
+        if size > CEILINGS[name]:
+            over.append(name)
+            flag = "  OVER"
+        print(f"{name:<24}{size:>12,.0f}{CEILINGS[name]:>10,}{size * 1e5 / 2**30:>9.2f} GB{flag}")
+    games = max(1, args.games // 10)
+    for label, ai_class in (("set KB", AIPlayer), ("bitset KB", BitsetAIPlayer)):
+        differ = mismatches(games, args.seed, ai_class)
+        if differ:
+            over.append(label)
+        print(f"park/unpark every turn, {label}: {games - differ} of {games} games identical"
+              + ("  MISMATCH" if differ else ""))
+    if args.check and over:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# bench_output.py
+# Micro-benchmark: game-loop cost of output, headless vs console vs collected
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import CluedoGame  # noqa: E402
+from output import INFO, ListSink, NULL, Output, console  # noqa: E402
+
+
+def play(games: int, seed: int, repeat: int, make_output) -> float:
+    """Best turns/sec over `games` all-AI games with the given output."""
+    best = 0.0
+    for _ in range(repeat):
+        turns = 0
+        start = time.perf_counter()
+        for i in range(games):
+            game = CluedoGame(ai_seats=range(6), seed=f"{seed}:{i}", output=make_output())
+            while not game.game_over:
+                game.play_turn()
+            turns += game.turn_count
+        best = max(best, turns / (time.perf_counter() - start))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Turns/sec of all-AI games with no listener, a console and a list sink."
+    )
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results = [
+            ("null output", play(args.games, args.seed, args.repeat, lambda: NULL)),
+            ("info list sink", play(args.games, args.seed, args.repeat,
+                                    lambda: Output(ListSink(INFO)))),
+            ("console, /dev/null", play(args.games, args.seed, args.repeat, console)),
+        ]
+    base = results[0][1]
+    for label, per_sec in results:
+        print(f"{label:<20}{per_sec:10,.0f} turns/s  ({per_sec / base:5.2f}x null)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# bench_planner.py
+# Benchmark: turns to solve and time per move, distance-aware planner vs first candidate room
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import planner  # noqa: E402
+from agents import AIAgent  # noqa: E402
+from board import Board, PROBABILITY_TURNS  # noqa: E402
+from cards import room_card  # noqa: E402
+from game import CluedoGame  # noqa: E402
+from grid_board import GridBoard  # noqa: E402
+from kb_bits import BitsetAIPlayer  # noqa: E402
+from players import AIPlayer  # noqa: E402
+from simulate import game_seed  # noqa: E402
+
+
+class FirstRoomAgent(AIAgent):
+    """Movement before the planner: the first reachable candidate room."""
+
+    def use_secret_passage(self, game, player):
+        dest = game.board.destination_of_secret_passage(player.position)
+        return room_card(dest) in player.possible_rooms
+
+    def choose_destination(self, game, player, destinations):
+        for dest in destinations:
+            if room_card(dest) in player.possible_rooms:
+                return dest
+        return destinations[0]
+
+
+class TimedAgent(AIAgent):
+    """AIAgent counting the time its movement decisions take."""
+
+    def __init__(self):
+        self.moves = 0
+        self.elapsed = 0.0
+
+    def use_secret_passage(self, game, player):
+        start = time.perf_counter()
+        choice = super().use_secret_passage(game, player)
+        self.elapsed += time.perf_counter() - start
+        self.moves += 1
+        return choice
+
+    def choose_destination(self, game, player, destinations):
+        start = time.perf_counter()
+        choice = super().choose_destination(game, player, destinations)
+        self.elapsed += time.perf_counter() - start
+        self.moves += 1
+        return choice
+
+
+def play(seed: int, games: int, agent_class, ai_class, board_class):
+    """Mean turns per game, decided games, and the agents' mean µs per move."""
+    planner.clear_cache()
+    turns = decided = moves = 0
+    elapsed = 0.0
+    for i in range(games):
+        agents = [agent_class() for _ in range(6)]
+        game = CluedoGame(ai_seats=range(6), verbose=False, seed=game_seed(seed, i),
+                          ai_class=ai_class, board_class=board_class, agents=agents)
+        for p in game.players:
+            p.engine  # deduce from the hands before timing anything
+        while not game.game_over:
+            game.play_turn()
+        turns += game.turn_count
+        decided += game.winner is not None
+        for agent in agents:
+            moves += getattr(agent, "moves", 0)
+            elapsed += getattr(agent, "elapsed", 0.0)
+    return turns / games, decided, elapsed / moves * 1e6 if moves else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Turns to solve with the distance-aware move planner vs the first candidate room."
+    )
+    parser.add_argument("--games", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--kb", choices=("set", "bitset"), default="set")
+    parser.add_argument("--grid", action="store_true", help="square-by-square board")
+    args = parser.parse_args()
+
+    ai_class = BitsetAIPlayer if args.kb == "bitset" else AIPlayer
+    board_class = GridBoard if args.grid else Board
+    board = board_class()  # reach tables are built once per process: not a move's cost
+    board.reach_probabilities(board.rooms[0], PROBABILITY_TURNS)
+    old, old_decided, _ = play(args.seed, args.games, FirstRoomAgent, ai_class, board_class)
+    new, new_decided, cost = play(args.seed, args.games, TimedAgent, ai_class, board_class)
+    print(f"first candidate room: {old:7.2f} turns/game  ({old_decided} of {args.games} solved)")
+    print(f"move planner:         {new:7.2f} turns/game  ({new_decided} of {args.games} solved)")
+    print(f"turns saved:          {1 - new / old:7.1%}")
+    print(f"planner per move:     {cost:7.1f} us  (cache hits {planner.cache_stats['hits']:,},"
+          f" misses {planner.cache_stats['misses']:,})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# bench_profiling.py
+# Micro-benchmark: game-loop cost of the phase profiler, attached vs not
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import infogain  # noqa: E402
+import planner  # noqa: E402
+from game import CluedoGame  # noqa: E402
+from profiling import Profiler  # noqa: E402
+
+
+def play(games: int, seed: int, repeat: int, profiler=None) -> float:
+    """Best turns/sec over `games` all-AI games, profiled if a profiler is given."""
+    best = 0.0
+    for _ in range(repeat):
+        infogain.clear_cache()  # a warm cache would flatter whichever runs second
+        planner.clear_cache()
+        turns = 0
+        start = time.perf_counter()
+        for i in range(games):
+            game = CluedoGame(ai_seats=range(6), verbose=False, seed=f"{seed}:{i}")
+            if profiler is not None:
+                profiler.attach(game)
+            while not game.game_over:
+                game.play_turn()
+            turns += game.turn_count
+        best = max(best, turns / (time.perf_counter() - start))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Turns/sec of all-AI games without and with a Profiler attached."
+    )
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # interleave so drift on a noisy machine hits both alike
+    off = on = 0.0
+    profiler = Profiler()
+    for _ in range(args.repeat):
+        off = max(off, play(args.games, args.seed, 1))
+        on = max(on, play(args.games, args.seed, 1, profiler))
+    calls = sum(p["calls"] for p in profiler.phases().values())
+    print(f"{'not attached':<16}{off:10,.0f} turns/s")
+    print(f"{'attached':<16}{on:10,.0f} turns/s  ({off / on - 1:+.1%} time)")
+    print(f"timed calls:    {calls / profiler.phases()['turn']['calls']:.1f} per turn")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# bench_refute.py
+# Micro-benchmark: suggestion throughput, hand scan vs card-owner index
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents import AIAgent  # noqa: E402
+from cards import CHARACTER_IDS, WEAPON_IDS, ROOM_IDS  # noqa: E402
+from game import CluedoGame  # noqa: E402
+
+
+def scan_refutations(game, suggester_index, suspect, weapon, room):
+    """The previous process_refutations: scan every hand clockwise."""
+    n = len(game.players)
+    suggester = game.players[suggester_index]
+    to_match = (suspect, weapon, room)
+    for offset in range(1, n):
+        idx = (suggester_index + offset) % n
+        refuter = game.players[idx]
+        matching_cards = [card for card in refuter.hand if card.id in to_match]
+        if not matching_cards:
+            game.bus.passed(refuter.id, to_match)
+            continue
+        game.out.info("\n%s can refute the suggestion.", refuter.name)
+        shown = game.agents[idx].choose_card_to_show(game, refuter, suggester, matching_cards)
+        game.out.info("\n%s shows a card to %s.", refuter.name, suggester.name)
+        game.bus.shown(suggester_index, refuter.id, shown.id)
+        game.bus.refuted(refuter.id, to_match)
+        return refuter, shown
+    game.out.info("\nNo one can refute this suggestion. The suggestion stands.")
+    return None, None
+
+
+def make_games(seed: int, count: int, suggestions: int = 40):
+    """Seeded games, each with a script of random (seat, suspect, weapon, room)."""
+    rng = random.Random(seed)
+    setups = []
+    for g in range(count):
+        game_seed = f"{seed}:{g}"
+        script = [
+            (rng.randrange(6), rng.choice(CHARACTER_IDS), rng.choice(WEAPON_IDS),
+             rng.choice(ROOM_IDS))
+            for _ in range(suggestions)
+        ]
+        setups.append((game_seed, script))
+    return setups
+
+
+def new_game(game_seed, ai: bool):
+    return CluedoGame(
+        ai_seats=range(6) if ai else (),
+        agents=[AIAgent() for _ in range(6)],
+        verbose=False,
+        seed=game_seed,
+    )
+
+
+def bench(setups, ai: bool, indexed: bool, repeat: int) -> float:
+    """Suggestions per second over every script, best of `repeat`."""
+    n = sum(len(script) for _, script in setups)
+    best = float("inf")
+    for _ in range(repeat):
+        elapsed = 0.0
+        for game_seed, script in setups:
+            game = new_game(game_seed, ai)  # fresh knowledge for every run
+            refute = game.process_refutations if indexed else (
+                lambda *args: scan_refutations(game, *args)
+            )
+            start = time.perf_counter()
+            for args in script:
+                refute(*args)
+            elapsed += time.perf_counter() - start
+        best = min(best, elapsed)
+    return n / best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Suggestions/sec through process_refutations, hand scan vs owner index."
+    )
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for ai, label in ((False, "no AI seats"), (True, "6 AI seats")):
+        setups = make_games(args.seed, args.games)
+        old = bench(setups, ai, indexed=False, repeat=args.repeat)
+        new = bench(setups, ai, indexed=True, repeat=args.repeat)
+        print(f"{label}:")
+        print(f"  hand scan:    {old:12,.0f} suggestions/s")
+        print(f"  owner index:  {new:12,.0f} suggestions/s")
+        print(f"  speedup:      {new / old:12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# bench_replay.py
+# Micro-benchmark: event-log overhead, replay speed and memory-mapped scans
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eventlog import EventLog, WIN, game_starts, load, replay, words_of  # noqa: E402
+from kb_bits import BitsetAIPlayer  # noqa: E402
+from players import AIPlayer  # noqa: E402
+from simulate import play_game  # noqa: E402
+
+
+def play(games: int, seed: int, logged: bool, repeat: int):
+    """(best seconds, log) for `games` all-AI games, with or without logging."""
+    best = float("inf")
+    for _ in range(repeat):
+        log = EventLog() if logged else None
+        start = time.perf_counter()
+        for i in range(games):
+            play_game(i, seed, event_log=log)
+        best = min(best, time.perf_counter() - start)
+    return best, log
+
+
+def replay_all(games, ai_class, repeat: int, ai_seats=None) -> float:
+    """Best seconds to replay every game; ai_seats=() skips the AI knowledge."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for words in games:
+            replay(words, ai_class, ai_seats)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Games/sec with and without the event log, replay events/sec, memmap scans."
+    )
+    parser.add_argument("--games", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    plain, _ = play(args.games, args.seed, logged=False, repeat=args.repeat)
+    logged, log = play(args.games, args.seed, logged=True, repeat=args.repeat)
+    print(f"games, no log:           {args.games / plain:10,.0f} games/s")
+    print(f"games, logged:           {args.games / logged:10,.0f} games/s"
+          f"  ({len(log):,} events, {len(log.to_bytes()):,} bytes)")
+
+    games = log.games()
+    for ai_class in (AIPlayer, BitsetAIPlayer):
+        elapsed = replay_all(games, ai_class, args.repeat)
+        print(f"replay, {ai_class.__name__ + ':':<15}{len(log) / elapsed:10,.0f} events/s")
+    elapsed = replay_all(games, None, args.repeat, ai_seats=())
+    print(f"replay, {'no AI seats:':<15}{len(log) / elapsed:10,.0f} events/s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.log")
+        log.save(path)
+        start = time.perf_counter()
+        mm = load(path)
+        wins = (mm["kind"] == WIN).sum()
+        starts = game_starts(mm)
+        elapsed = time.perf_counter() - start
+        print(f"memmap scan:             {len(mm) / elapsed:10,.0f} events/s"
+              f"  ({len(starts)} games, {wins} wins)")
+        assert words_of(mm[starts[0]:starts[1]]) == games[0].tolist()
+        del mm
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# bench_rules.py
+# Benchmark: startup and hot paths across rulesets of growing size (classic to large variants)
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import rules  # noqa: E402
+
+# (characters, weapons, rooms) of the generated variants; classic runs first
+SIZES = [(8, 10, 14), (12, 24, 24), (16, 60, 40), (16, 150, 40)]
+
+
+def measure(games: int, max_turns: int, seed: int) -> dict:
+    """
+    Runs in a child process whose CLUEDO_RULES is already set: startup (the
+    imports plus the first Board, i.e. ruleset load and table build), then
+    the rates of the hot paths on that ruleset.
+    """
+    start = time.perf_counter()
+    from board import Board, MAX_ROLL
+    board = Board()
+    startup = time.perf_counter() - start
+
+    from bench_kb import fresh_kb, make_event_script
+    from bench_refute import make_games, new_game
+    from kb_bits import BitsetAIPlayer
+    from simulate import play_game
+
+    scripts = [make_event_script(seed * 1000 + i) for i in range(games)]
+    events = 0
+    start = time.perf_counter()
+    for hands, script in scripts:
+        ai = fresh_kb(BitsetAIPlayer, hands)
+        for name, args in script:
+            getattr(ai, name)(*args)
+        events += len(script)
+    kb_rate = events / (time.perf_counter() - start)
+
+    queries = [(p, roll) for p in board.positions for roll in range(1, MAX_ROLL + 1)]
+    start = time.perf_counter()
+    for p, roll in queries:
+        board.reachable_with_steps(p, roll)
+    move_rate = len(queries) / (time.perf_counter() - start)
+
+    setups = make_games(seed, games)
+    suggestions = 0
+    start = time.perf_counter()
+    for game_seed, script in setups:
+        game = new_game(game_seed, ai=True)
+        for args in script:
+            game.process_refutations(*args)
+        suggestions += len(script)
+    refute_rate = suggestions / (time.perf_counter() - start)
+
+    turns = 0
+    start = time.perf_counter()
+    for i in range(games):
+        turns += play_game(i, seed, max_turns=max_turns).turns
+    turn_rate = turns / (time.perf_counter() - start)
+
+    return {"startup": startup, "kb": kb_rate, "moves": move_rate,
+            "refute": refute_rate, "turns": turn_rate}
+
+
+def check_log(log_path: str) -> dict:
+    """
+    Runs in a child process whose CLUEDO_RULES is already set: replay every
+    game of a tournament --log file and compare it with its own WIN and
+    TURN events (replay also checks every refuter against the deal).
+    """
+    from eventlog import EventLog, TURN, WIN, replay
+
+    with open(log_path, "rb") as f:
+        log = EventLog.from_bytes(f.read())
+    games = log.games()
+    ok = 0
+    for words in games:
+        game = replay(words)
+        turns = sum(1 for w in words if w & 0xFF == TURN)
+        won = [w >> 8 & 0xFF for w in words if w & 0xFF == WIN]
+        winner = None if game.winner is None else game.players.index(game.winner)
+        ok += game.turn_count == turns and won == ([] if winner is None else [winner])
+    return {"games": len(games), "ok": ok}
+
+
+def logged_tournament(path: str, tmp: str, args) -> dict:
+    """tournament.py --log on one ruleset, then the log replayed (check_log)."""
+    env = dict(os.environ, **{rules.RULES_ENV: path})
+    log_path = os.path.join(tmp, "games.log")
+    if os.path.exists(log_path):
+        os.remove(log_path)  # tournament.py appends
+    subprocess.run(
+        [sys.executable, os.path.join(os.path.dirname(BENCH_DIR), "tournament.py"),
+         "-n", str(args.games), "--seed", str(args.seed), "-j", "2",
+         "--max-turns", str(args.max_turns), "--log", log_path],
+        env=env, check=True, capture_output=True,
+    )
+    out = subprocess.run(
+        [sys.executable, __file__, "--check-log", log_path],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def run_child(path: str, args) -> dict:
+    env = dict(os.environ, **{rules.RULES_ENV: path})
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", "--games", str(args.games),
+         "--max-turns", str(args.max_turns), "--seed", str(args.seed)],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Startup (cold vs compiled) and hot-path rates per ruleset size."
+    )
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--max-turns", type=int, default=150)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true",
+                        help="also log a tournament on each ruleset, replay it, exit 1 on a mismatch")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--check-log", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.games, args.max_turns, args.seed)))
+        return
+    if args.check_log:
+        print(json.dumps(check_log(args.check_log)))
+        return
+
+    print(f"{'ruleset':<24}{'cards':>6}{'cold ms':>9}{'compiled ms':>13}"
+          f"{'kb ev/s':>11}{'moves/s':>11}{'refute/s':>10}{'turns/s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [rules.resolve("classic")]
+        for c, w, r in SIZES:
+            paths.append(os.path.join(tmp, f"{c}x{w}x{r}.json"))
+            with open(paths[-1], "w") as f:
+                json.dump(rules.generate(c, w, r, args.seed, passages=2).to_json(), f)
+        for path in paths:
+            ruleset = rules.load(path)
+            classic_cache = path == paths[0]
+            if not classic_cache and os.path.exists(rules.compiled_path(path)):
+                os.remove(rules.compiled_path(path))
+            # the classic cache is shared with the checkout: time it warm only
+            cold = None if classic_cache else run_child(path, args)["startup"]
+            warm = run_child(path, args)
+            cold_ms = "-" if cold is None else f"{cold * 1000:.0f}"
+            print(f"{ruleset.name:<24}{ruleset.num_cards:>6}{cold_ms:>9}"
+                  f"{warm['startup'] * 1000:>13.0f}{warm['kb']:>11,.0f}"
+                  f"{warm['moves']:>11,.0f}{warm['refute']:>10,.0f}{warm['turns']:>9,.0f}",
+                  flush=True)
+        if args.check:
+            failed = 0
+            for path in paths:
+                ruleset = rules.load(path)
+                result = logged_tournament(path, tmp, args)
+                failed += result["games"] - result["ok"]
+                print(f"--log and replay, {ruleset.name} ({ruleset.num_cards} cards): "
+                      f"{result['ok']} of {result['games']} games match")
+            if failed:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# bench_sampler.py
+# Throughput of the vectorized hand sampler, checked against the exact solver
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import CluedoGame  # noqa: E402
+from sampler import HandSampler  # noqa: E402
+from solver import posterior  # noqa: E402
+
+
+def mid_game_engines(seed: int, turns: int):
+    """Knowledge of every AI seat after `turns` turns of a seeded all-AI game."""
+    game = CluedoGame(ai_seats=range(6), verbose=False, max_turns=1000, seed=seed)
+    for _ in range(turns):
+        if game.game_over:
+            break
+        game.play_turn()
+    return [p.engine for p in game.players]
+
+
+def max_error(result, exact) -> float:
+    return max(
+        abs(result.owner_freq[c, j] - exact.card_probs[c].get(o, 0.0))
+        for c in range(len(exact.card_probs))
+        for j, o in enumerate(result.owners)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hand sampler samples/sec.")
+    parser.add_argument("--samples", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=10)
+    args = parser.parse_args()
+
+    engines = mid_game_engines(args.seed, args.turns)
+    sampler = HandSampler(seed=args.seed)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    attempted = 0
+    peaks = []
+    for i in range(args.calls):
+        result = sampler.sample(engines[i % len(engines)], args.samples)
+        attempted += result.attempted
+        peaks.append(tracemalloc.get_traced_memory()[0])
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+
+    print(f"samples/sec:          {attempted / elapsed:,.0f}")
+    print(f"memory after call 1:  {peaks[0] / 1e6:.1f} MB")
+    print(f"memory after call {args.calls}: {peaks[-1] / 1e6:.1f} MB")
+    for seat, engine in enumerate(engines[:3]):
+        result = sampler.sample(engine, args.samples)
+        print(
+            f"seat {seat}: acceptance {result.acceptance:.2f}, "
+            f"ESS {result.effective:,.0f}, "
+            f"max |error| vs exact {max_error(result, posterior(engine, exact=True)):.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
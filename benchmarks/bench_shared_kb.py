@@ -0,0 +1,89 @@
+# bench_shared_kb.py
+# Benchmark: deduction cost with one AI seat vs six, own engines vs shared public knowledge
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import infogain  # noqa: E402
+from agents import AIAgent  # noqa: E402
+from bench_refute import make_games  # noqa: E402
+from game import CluedoGame  # noqa: E402
+from kb_bits import BitsetAIPlayer  # noqa: E402
+from players import AIPlayer  # noqa: E402
+from simulate import game_seed  # noqa: E402
+
+
+def deduce(setups, ai_seats, shared: bool, ai_class, readers: str, repeat: int) -> float:
+    """
+    Suggestions/s through process_refutations. After each one the suggester
+    reads its engine, as an AI does on its own turn (readers="suggester"),
+    or every AI seat does (readers="all").
+    """
+    n = sum(len(script) for _, script in setups)
+    best = float("inf")
+    for _ in range(repeat):
+        elapsed = 0.0
+        for seed, script in setups:
+            game = CluedoGame(ai_seats=ai_seats, agents=[AIAgent() for _ in range(6)],
+                              verbose=False, seed=seed, ai_class=ai_class, shared_kb=shared)
+            ais = [p for p in game.players if p.is_ai]
+            start = time.perf_counter()
+            for args in script:
+                game.process_refutations(*args)
+                if readers == "all":
+                    for p in ais:
+                        p.engine
+                elif game.players[args[0]].is_ai:
+                    game.players[args[0]].engine
+            elapsed += time.perf_counter() - start
+        best = min(best, elapsed)
+    return n / best
+
+
+def play(seed: int, games: int, shared: bool, ai_class) -> float:
+    """Turns/s over complete seeded 6-AI games, from a cold suggestion cache."""
+    infogain.clear_cache()
+    turns = 0
+    elapsed = 0.0
+    for i in range(games):
+        game = CluedoGame(ai_seats=range(6), verbose=False, seed=game_seed(seed, i),
+                          ai_class=ai_class, shared_kb=shared)
+        start = time.perf_counter()
+        while not game.game_over:
+            game.play_turn()
+        elapsed += time.perf_counter() - start
+        turns += game.turn_count
+    return turns / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Deduction cost per suggestion for 1 and 6 AI seats, own vs shared public KB."
+    )
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--kb", choices=("set", "bitset"), default="set")
+    args = parser.parse_args()
+
+    ai_class = BitsetAIPlayer if args.kb == "bitset" else AIPlayer
+    setups = make_games(args.seed, args.games)
+    one = deduce(setups, (5,), False, ai_class, "suggester", args.repeat)
+    print(f"1 AI seat:              {one:10,.0f} suggestions/s")
+    for readers in ("suggester", "all"):
+        print(f"6 AI seats, {readers} reads:")
+        for shared, label in ((False, "own engines"), (True, "shared public KB")):
+            rate = deduce(setups, range(6), shared, ai_class, readers, args.repeat)
+            print(f"  {label:<18}{rate:10,.0f} suggestions/s  {one / rate:5.2f}x the 1-seat cost")
+    own = play(args.seed, args.games // 2, False, ai_class)
+    shared = play(args.seed, args.games // 2, True, ai_class)
+    print(f"complete 6-AI games:    {own:10,.0f} turns/s own, {shared:,.0f} shared"
+          f"  ({shared / own:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# bench_snapshot.py
+# Micro-benchmark: game clones/sec, snapshot/restore vs copy.deepcopy
+
+import argparse
+import copy
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import CluedoGame  # noqa: E402
+from kb_bits import BitsetAIPlayer  # noqa: E402
+from players import AIPlayer  # noqa: E402
+
+
+def midgame(seed: int, ai_class: type, turns: int) -> CluedoGame:
+    """An all-AI game played `turns` turns in, so the knowledge bases have content."""
+    game = CluedoGame(ai_seats=range(6), verbose=False, seed=seed, ai_class=ai_class)
+    for _ in range(turns):
+        if game.game_over:
+            break
+        game.play_turn()
+    return game
+
+
+def rate(fn, count: int, repeat: int) -> float:
+    """Calls per second, best of `repeat`."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(count):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Clones/sec of a mid-game CluedoGame: snapshot/restore vs deepcopy."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--turns", type=int, default=12)
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for ai_class in (AIPlayer, BitsetAIPlayer):
+        game = midgame(args.seed, ai_class, args.turns)
+        state = game.snapshot()
+
+        def forget_kb_snapshots():
+            # as if every AI had recorded something since the last snapshot
+            for p in game.players:
+                p._kb_snapshot = None
+
+        def fresh_snapshot():
+            forget_kb_snapshots()
+            return game.snapshot()
+
+        def dirty_restore():
+            # what search does after a rollout: knowledge changed, put it back
+            forget_kb_snapshots()
+            game.restore(state)
+
+        results = [
+            ("deepcopy", rate(lambda: copy.deepcopy(game), max(1, args.count // 100),
+                              args.repeat)),
+            ("snapshot (cached kb)", rate(game.snapshot, args.count, args.repeat)),
+            ("snapshot (fresh kb)", rate(fresh_snapshot, args.count, args.repeat)),
+            ("snapshot with rng", rate(lambda: game.snapshot(rng=True), args.count,
+                                       args.repeat)),
+            ("restore (unchanged kb)", rate(lambda: game.restore(state), args.count,
+                                            args.repeat)),
+            ("restore (changed kb)", rate(dirty_restore, args.count, args.repeat)),
+        ]
+        print(f"{ai_class.__name__}, {game.turn_count} turns in:")
+        base = results[0][1]
+        for label, per_sec in results:
+            print(f"  {label:<24}{per_sec:12,.0f} /s  ({per_sec / base:8.0f}x deepcopy)")
+
+
+if __name__ == "__main__":
+    main()
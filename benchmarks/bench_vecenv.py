@@ -0,0 +1,70 @@
+# bench_vecenv.py
+# Micro-benchmark: env-steps/sec of the batched VectorEnv vs CluedoGame turns/sec
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import CluedoGame  # noqa: E402
+from vecenv import VectorEnv, seen_cards_policy  # noqa: E402
+
+
+def bench_env(num_envs: int, steps: int, seed: int, policy: bool):
+    """Env-steps/sec (best of 3), and episodes finished / won per env-step."""
+    env = VectorEnv(num_envs, seed=seed)
+    rng = np.random.default_rng(seed)
+    obs = env.reset()
+    # without the policy, replay a pool of its actions so only step() is timed
+    pool = [seen_cards_policy(obs, rng) for _ in range(8)]
+    best, finished, won = 0.0, 0, 0
+    for _ in range(3):
+        start = time.perf_counter()
+        for i in range(steps):
+            actions = seen_cards_policy(obs, rng) if policy else pool[i % len(pool)]
+            obs, _, terminated, truncated, info = env.step(actions)
+            finished += int(terminated.sum() + truncated.sum())
+            won += int((info["winner"] >= 0).sum())
+        best = max(best, num_envs * steps / (time.perf_counter() - start))
+    return best, finished, won
+
+
+def bench_games(games: int, seed: int) -> float:
+    """Turns/sec of ordinary 6-AI CluedoGames, one turn at a time."""
+    turns = 0
+    start = time.perf_counter()
+    for i in range(games):
+        game = CluedoGame(ai_seats=range(6), verbose=False, seed=f"{seed}:{i}")
+        while not game.game_over:
+            game.play_turn()
+        turns += game.turn_count
+    return turns / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Env-steps/sec of vecenv.VectorEnv (6 players) by batch size."
+    )
+    parser.add_argument("--envs", type=int, nargs="*", default=[1, 256, 4096, 16384])
+    parser.add_argument("--steps", type=int, default=200, help="steps per timed run")
+    parser.add_argument("--games", type=int, default=50, help="CluedoGames for comparison")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    turns = bench_games(args.games, args.seed)
+    print(f"{'CluedoGame, 6 AIs':<22}{turns:>14,.0f} turns/s")
+    print(f"\n{'envs':>8}{'env only':>16}{'with policy':>16}{'mean length':>13}{'won':>7}")
+    for n in args.envs:
+        steps = max(args.steps, 20_000 // n)  # small batches need more steps to time
+        env_rate, _, _ = bench_env(n, steps, args.seed, policy=False)
+        rate, finished, won = bench_env(n, steps, args.seed, policy=True)
+        length = 3 * n * steps / max(finished, 1)
+        print(f"{n:>8,}{env_rate:>16,.0f}{rate:>16,.0f}{length:>13.1f}{won / max(finished, 1):>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
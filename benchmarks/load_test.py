@@ -0,0 +1,133 @@
+# load_test.py
+# Load test for server.py: local bots play many concurrent sessions
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import Server  # noqa: E402
+
+
+def bot_answer(rng: random.Random, kind: str, options):
+    """A legal answer for any question: a bot that never accuses."""
+    if kind == "action":
+        return "M"
+    if kind in ("passage", "destination", "show"):
+        return rng.choice(options)
+    if kind == "suggestion":
+        return [rng.choice(options["suspects"]), rng.choice(options["weapons"])]
+    return [rng.choice(options[k]) for k in ("suspects", "weapons", "rooms")]
+
+
+async def client(reader, writer, sessions: int, first_seed: int, players: int,
+                 humans: int, stats: dict):
+    """One connection playing `sessions` sessions with `humans` bot seats each."""
+    rng = random.Random(first_seed)
+    for i in range(sessions):
+        msg = {"op": "create", "players": players, "humans": list(range(humans)),
+               "seed": first_seed + i}
+        writer.write(json.dumps(msg).encode() + b"\n")
+    await writer.drain()
+
+    open_sessions = sessions
+    while open_sessions:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        msg = json.loads(line)
+        kind = msg["type"]
+        if kind == "ask":
+            stats["asks"] += 1
+            answer = {"op": "answer", "session": msg["session"], "id": msg["id"],
+                      "value": bot_answer(rng, msg["kind"], msg["options"])}
+            writer.write(json.dumps(answer).encode() + b"\n")
+            await writer.drain()
+        elif kind == "over" and msg["seat"] == 0:
+            open_sessions -= 1
+            stats["games"] += 1
+            stats["bot wins"] += msg["winner"] is not None and msg["winner"] < humans
+        elif kind == "error":
+            raise RuntimeError(msg["error"])
+    writer.close()
+
+
+async def run(args) -> None:
+    server = listener = None
+    if args.port is None and args.unix is None:
+        server = Server(max_sessions=args.sessions)
+        listener = await server.serve(port=0)
+        host, port = listener.sockets[0].getsockname()[:2]
+    else:
+        host, port = args.host, args.port
+
+    stats = {"asks": 0, "games": 0, "bot wins": 0}
+    per_conn = -(-args.sessions // args.connections)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    clients = []
+    for c in range(args.connections):
+        count = min(per_conn, args.sessions - c * per_conn)
+        if count <= 0:
+            break
+        if args.unix:
+            reader, writer = await asyncio.open_unix_connection(args.unix)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        clients.append(client(reader, writer, count, args.seed + c * per_conn,
+                              args.players, args.humans, stats))
+
+    peak = 0
+
+    async def watch():
+        nonlocal peak
+        while True:
+            if server is not None:
+                peak = max(peak, len(server.sessions))
+            await asyncio.sleep(0.05)
+
+    watcher = asyncio.ensure_future(watch())
+    await asyncio.gather(*clients)
+    watcher.cancel()
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(f"sessions:        {stats['games']:,} over {len(clients)} connections"
+          f" ({args.humans} bot seat(s), {args.players - args.humans} AI seats each)")
+    print(f"wall time:       {elapsed:.1f} s")
+    print(f"games/sec:       {stats['games'] / elapsed:,.1f}")
+    print(f"questions/sec:   {stats['asks'] / elapsed:,.0f} ({stats['asks']:,} answered)")
+    if server is not None:
+        print(f"turns/sec:       {server.turns / elapsed:,.0f}")
+        print(f"peak sessions:   {peak:,}")
+        # ru_maxrss is in KB on Linux; the client side is included
+        print(f"peak RSS growth: {(rss_after - rss_before) / 1024:,.1f} MB"
+              f" (~{(rss_after - rss_before) / max(peak, 1):,.0f} KB per live session)")
+        listener.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Bots play many concurrent sessions against server.py "
+                    "(an in-process server unless --port/--unix is given)."
+    )
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--connections", type=int, default=10)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--humans", type=int, default=1, help="bot seats per session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--unix")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
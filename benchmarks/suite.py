@@ -0,0 +1,315 @@
+# suite.py
+# Benchmark suite: seeded cases, JSON report, stored baseline and regression check
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import deals  # noqa: E402
+import infogain  # noqa: E402
+import planner  # noqa: E402
+from bench_kb import fresh_kb, make_event_script  # noqa: E402
+from bench_refute import make_games, new_game  # noqa: E402
+from board import Board, MAX_ROLL  # noqa: E402
+from cards import create_all_cards  # noqa: E402
+from deck import deal_cards, select_solution  # noqa: E402
+from grid_board import GridBoard  # noqa: E402
+from kb_bits import BitsetAIPlayer  # noqa: E402
+from players import AIPlayer  # noqa: E402
+from simulate import play_game  # noqa: E402
+
+BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+# name -> (unit, function(seed, scale, repeat) -> rate); every rate is higher-is-better
+CASES = {}
+
+
+def case(name: str, unit: str):
+    def register(fn):
+        CASES[name] = (unit, fn)
+        return fn
+    return register
+
+
+def best_rate(count: int, repeat: int, run, min_time: float = 0.2) -> float:
+    """
+    count / seconds per run(), which does `count` operations and returns the
+    seconds they took. Runs are batched until a batch takes min_time (short
+    timings are mostly noise), and the fastest of `repeat` batches counts.
+    The garbage collector is off meanwhile, as in timeit.
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        loops = 1
+        while True:
+            best = sum(run() for _ in range(loops))
+            if best >= min_time:
+                break
+            loops *= 2
+        for _ in range(repeat - 1):
+            best = min(best, sum(run() for _ in range(loops)))
+    finally:
+        gc.enable()
+    return count * loops / best
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+# --- Cases ------------------------------------------------------------------
+
+def _reachable(board_class, repeat: int) -> float:
+    board = board_class()
+    queries = [(p, roll) for p in board.positions for roll in range(1, MAX_ROLL + 1)]
+
+    def run():
+        reachable = board.reachable_with_steps
+        for p, roll in queries:
+            reachable(p, roll)
+
+    return best_rate(len(queries), repeat, lambda: timed(run))
+
+
+@case("board.reachable[graph]", "calls/s")
+def bench_reachable_graph(seed, scale, repeat):
+    """reachable_with_steps for every position and roll, room graph."""
+    return _reachable(Board, repeat)
+
+
+@case("board.reachable[grid]", "calls/s")
+def bench_reachable_grid(seed, scale, repeat):
+    """reachable_with_steps for every square and roll, grid board."""
+    return _reachable(GridBoard, repeat)
+
+
+@case("deck.deal", "deals/s")
+def bench_deal(seed, scale, repeat):
+    """select_solution + deal_cards on a fresh deck."""
+    deals = 2000 * scale
+
+    def run():
+        rng = random.Random(seed)
+        for _ in range(deals):
+            *_, deck = select_solution(create_all_cards(), rng)
+            deal_cards(deck, 6)
+
+    return best_rate(deals, repeat, lambda: timed(run))
+
+
+@case("deals.bulk", "deals/s")
+def bench_bulk_deals(seed, scale, repeat):
+    """deals.bulk_deals, whole blocks of NumPy owner codes."""
+    n = deals.BLOCK * scale
+
+    def run():
+        start = time.perf_counter()
+        for _ in deals.bulk_deals(n, seed):
+            pass
+        return time.perf_counter() - start
+
+    return best_rate(n, repeat, run)
+
+
+def _kb_updates(ai_class, seed, scale, repeat, stage=None) -> float:
+    """
+    KB events per second while replaying scripted refutation outcomes; stage
+    (0-3) times only that quarter of each script, as knowledge grows.
+    """
+    scripts = [make_event_script(seed * 100_000 + i) for i in range(40 * scale)]
+
+    def run():
+        elapsed = 0.0
+        for hands, events in scripts:
+            ai = fresh_kb(ai_class, hands)
+            calls = [(getattr(ai, name), args) for name, args in events]
+            q = len(calls) // 4
+            lo, hi = (0, len(calls)) if stage is None else (stage * q, (stage + 1) * q)
+            for fn, args in calls[:lo]:
+                fn(*args)
+            start = time.perf_counter()
+            for fn, args in calls[lo:hi]:
+                fn(*args)
+            elapsed += time.perf_counter() - start
+        return elapsed
+
+    if stage is None:
+        n = sum(len(events) for _, events in scripts)
+    else:
+        n = sum(len(events) // 4 for _, events in scripts)
+    return best_rate(n, repeat, run)
+
+
+@case("kb.update[set]", "events/s")
+def bench_kb_set(seed, scale, repeat):
+    return _kb_updates(AIPlayer, seed, scale, repeat)
+
+
+@case("kb.update[set] first quarter", "events/s")
+def bench_kb_set_early(seed, scale, repeat):
+    return _kb_updates(AIPlayer, seed, scale, repeat, stage=0)
+
+
+@case("kb.update[set] last quarter", "events/s")
+def bench_kb_set_late(seed, scale, repeat):
+    return _kb_updates(AIPlayer, seed, scale, repeat, stage=3)
+
+
+@case("kb.update[bitset]", "events/s")
+def bench_kb_bitset(seed, scale, repeat):
+    return _kb_updates(BitsetAIPlayer, seed, scale, repeat)
+
+
+@case("refute", "suggestions/s")
+def bench_refute(seed, scale, repeat):
+    """process_refutations with six AI seats learning from every suggestion."""
+    setups = make_games(seed, 20 * scale)
+
+    def run():
+        elapsed = 0.0
+        for game_seed, script in setups:
+            game = new_game(game_seed, ai=True)
+            elapsed += timed(lambda: [game.process_refutations(*args) for args in script])
+        return elapsed
+
+    return best_rate(sum(len(script) for _, script in setups), repeat, run)
+
+
+@case("game", "games/s")
+def bench_game(seed, scale, repeat):
+    """Complete headless 6-AI games (simulate.play_game)."""
+    games = 20 * scale
+
+    def run():
+        infogain.clear_cache()  # every run starts cold
+        planner.clear_cache()
+        start = time.perf_counter()
+        for i in range(games):
+            play_game(i, seed)
+        return time.perf_counter() - start
+
+    return best_rate(games, repeat, run)
+
+
+# --- Reports ----------------------------------------------------------------
+
+def run_suite(names, seed: int, scale: int, repeat: int, rounds: int = 1) -> dict:
+    """Run the cases `rounds` times over; each keeps its median rate."""
+    results = {}
+    for name in names:
+        unit, fn = CASES[name]
+        rates = sorted(fn(seed, scale, repeat) for _ in range(rounds))
+        results[name] = {"value": rates[len(rates) // 2], "unit": unit}
+        print(f"{name:<32}{results[name]['value']:>16,.1f} {unit}", flush=True)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "seed": seed,
+            "scale": scale,
+            "repeat": repeat,
+            "rounds": rounds,
+        },
+        "results": results,
+    }
+
+
+def regressions(report: dict, baseline: dict, threshold: float):
+    """Cases more than threshold slower than in the baseline."""
+    slow = []
+    for name, result in report["results"].items():
+        old = baseline["results"].get(name)
+        if old is not None and result["value"] < old["value"] * (1 - threshold):
+            slow.append(name)
+    return slow
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> int:
+    """Print each case against the baseline; returns the number of regressions."""
+    for key in ("seed", "scale"):
+        if report["meta"][key] != baseline["meta"].get(key):
+            print(f"warning: baseline was run with {key}={baseline['meta'].get(key)}")
+    slow = regressions(report, baseline, threshold)
+    print(f"\n{'case':<32}{'baseline':>16}{'now':>16}{'change':>9}")
+    for name, result in report["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            print(f"{name:<32}{'-':>16}{result['value']:>16,.1f}      new")
+            continue
+        change = result["value"] / old["value"] - 1
+        flag = "  REGRESSION" if name in slow else ""
+        print(f"{name:<32}{old['value']:>16,.1f}{result['value']:>16,.1f}{change:>+9.1%}{flag}")
+    print(f"\n{len(slow)} regression(s) beyond {threshold:.0%}")
+    return len(slow)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Seeded benchmark suite with a stored baseline and a regression check."
+    )
+    parser.add_argument("--only", nargs="*", default=[], metavar="PREFIX",
+                        help="run only the cases whose names start with these")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scale", type=int, default=1, help="multiply every case's work")
+    parser.add_argument("--repeat", type=int, default=5, help="best of this many batches")
+    parser.add_argument("--rounds", type=int, default=1,
+                        help="run every case this many times and keep the median "
+                             "(use 3+ for --save-baseline)")
+    parser.add_argument("--output", metavar="PATH", help="write the JSON report here")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help=f"store the report as the baseline ({BASELINE})")
+    parser.add_argument("--compare", nargs="?", const=BASELINE, metavar="BASELINE",
+                        help="compare with a stored report; exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="slowdown that counts as a regression (0.15 = 15%%)")
+    parser.add_argument("--retries", type=int, default=2,
+                        help="re-measure apparent regressions this many times first")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (unit, _) in CASES.items():
+            print(f"{name:<32}{unit}")
+        return
+    names = [n for n in CASES if not args.only or any(n.startswith(p) for p in args.only)]
+    report = run_suite(names, args.seed, args.scale, args.repeat, args.rounds)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        # a slow case is re-measured and keeps its best value: on a busy
+        # machine one run can easily lose 20%
+        for _ in range(args.retries):
+            slow = regressions(report, baseline, args.threshold)
+            if not slow:
+                break
+            print(f"re-measuring {len(slow)} slow case(s)")
+            again = run_suite(slow, args.seed, args.scale, args.repeat)["results"]
+            for name, result in again.items():
+                if result["value"] > report["results"][name]["value"]:
+                    report["results"][name] = result
+
+    for path in filter(None, (args.output, BASELINE if args.save_baseline else None)):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=1)
+            f.write("\n")
+    if baseline is not None and compare(report, baseline, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
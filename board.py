@@ -1,103 +1,209 @@
 # board.py
 # Graph-based mansion layout and secret passages
 
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Set
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+from cards import RULES, position_id, start_name
+from rules import board_tables, store_board_tables
+
+MAX_ROLL = 6  # 1d6
+PROBABILITY_TURNS = 4  # reach-probability tables precomputed up to this many turns
+
+# layout key -> precomputed movement tables, shared between Board instances
+_TABLES: Dict[tuple, dict] = {}
 
 
 @dataclass
 class Board:
-    """Graph of positions (rooms + starting spots)."""
+    """
+    Graph of positions (rooms + starting spots). Positions are the int ids
+    from cards.position_id; the layout below is written with names.
+    """
 
-    adjacency: Dict[str, List[str]] = field(default_factory=dict)
-    secret_passages: Dict[str, str] = field(default_factory=dict)
+    adjacency: Dict[int, List[int]] = field(default_factory=dict)
+    secret_passages: Dict[int, int] = field(default_factory=dict)
 
     def __post_init__(self):
         self._init_rooms()
         self._init_secret_passages()
         self._init_start_positions()
+        self._init_tables()
 
     def _add_edge(self, a: str, b: str):
+        a, b = position_id(a), position_id(b)
         self.adjacency.setdefault(a, []).append(b)
         self.adjacency.setdefault(b, []).append(a)
 
     def _init_rooms(self):
-        # Rooms from classic Cluedo, adjacencies approximated as a graph.
-        rooms = [
-            "Kitchen",
-            "Ballroom",
-            "Conservatory",
-            "Dining Room",
-            "Billiard Room",
-            "Library",
-            "Lounge",
-            "Hall",
-            "Study",
-        ]
-        for r in rooms:
+        # Rooms and their connections come from the ruleset (rules.py).
+        self.rooms: List[int] = [position_id(r) for r in RULES.rooms]
+        self._room_set = frozenset(self.rooms)
+        for r in self.rooms:
             self.adjacency.setdefault(r, [])
-
-        self._add_edge("Kitchen", "Ballroom")
-        self._add_edge("Kitchen", "Dining Room")
-        self._add_edge("Ballroom", "Conservatory")
-        self._add_edge("Ballroom", "Hall")
-        self._add_edge("Ballroom", "Dining Room")
-        self._add_edge("Conservatory", "Billiard Room")
-        self._add_edge("Dining Room", "Hall")
-        self._add_edge("Dining Room", "Lounge")
-        self._add_edge("Billiard Room", "Library")
-        self._add_edge("Billiard Room", "Hall")
-        self._add_edge("Library", "Hall")
-        self._add_edge("Library", "Study")
-        self._add_edge("Lounge", "Hall")
-        self._add_edge("Hall", "Study")
+        for a, b in RULES.edges:
+            self._add_edge(a, b)
 
     def _init_secret_passages(self):
         # Secret passages do NOT require a dice roll.
-        self.secret_passages = {
-            "Kitchen": "Study",
-            "Study": "Kitchen",
-            "Conservatory": "Lounge",
-            "Lounge": "Conservatory",
-        }
+        self.secret_passages = {}
+        for a, b in RULES.passages:
+            self.secret_passages[position_id(a)] = position_id(b)
+            self.secret_passages[position_id(b)] = position_id(a)
 
     def _init_start_positions(self):
         # Starting hallway-like nodes for each character.
-        starts = {
-            "Miss Scarlett Start": "Lounge",
-            "Colonel Mustard Start": "Dining Room",
-            "Mrs. White Start": "Kitchen",
-            "Reverend Green Start": "Ballroom",
-            "Mrs. Peacock Start": "Conservatory",
-            "Professor Plum Start": "Study",
+        for character, room in zip(RULES.characters, RULES.doors):
+            self._add_edge(start_name(character), room)
+
+    def _init_tables(self):
+        """
+        Precompute everything movement needs, once per board:
+        - all-pairs shortest distances (BFS from every position)
+        - (position, roll) -> sorted destinations within that many steps
+        - room reach probabilities under 1d6 for up to PROBABILITY_TURNS turns
+
+        Tables are read-only and shared by every Board with the same layout,
+        so creating a Board per game stays cheap. They are also kept in the
+        ruleset's compiled file, so large layouts are built only once.
+        """
+        key = (
+            tuple((p, tuple(nbs)) for p, nbs in self.adjacency.items()),
+            tuple(sorted(self.secret_passages.items())),
+        )
+        cached = _TABLES.get(key) or board_tables(key)
+        if cached is not None:
+            _TABLES[key] = cached
+            self.__dict__.update(cached)
+            return
+        self.positions: List[int] = list(self.adjacency)
+        self.index: Dict[int, int] = {p: i for i, p in enumerate(self.positions)}
+
+        n = len(self.positions)
+        unreachable = n  # longer than any shortest path
+        self.distance_matrix: List[List[int]] = []
+        for start in self.positions:
+            row = [unreachable] * n
+            row[self.index[start]] = 0
+            q = deque([start])
+            while q:
+                current = q.popleft()
+                d = row[self.index[current]] + 1
+                for nb in self.adjacency[current]:
+                    if row[self.index[nb]] > d:
+                        row[self.index[nb]] = d
+                        q.append(nb)
+            self.distance_matrix.append(row)
+
+        self._moves: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+        self._reachable: Dict[Tuple[int, int], FrozenSet[int]] = {}
+        for start in self.positions:
+            row = self.distance_matrix[self.index[start]]
+            for roll in range(MAX_ROLL + 1):
+                dests = frozenset(
+                    p for p, d in zip(self.positions, row) if 0 < d <= roll
+                )
+                self._reachable[(start, roll)] = dests
+                self._moves[(start, roll)] = tuple(sorted(dests))
+
+        self._reach_prob: Dict[int, Dict[int, Dict[int, float]]] = {}
+        self._reach_prob_upto(PROBABILITY_TURNS)
+
+        _TABLES[key] = {
+            name: getattr(self, name)
+            for name in (
+                "positions", "index", "distance_matrix",
+                "_moves", "_reachable", "_reach_prob",
+            )
         }
-        for start, room in starts.items():
-            self._add_edge(start, room)
+        store_board_tables(key, _TABLES[key])
 
-    def neighbors(self, position: str) -> List[str]:
+    def neighbors(self, position: int) -> List[int]:
         return self.adjacency.get(position, [])
 
-    def reachable_with_steps(self, start: str, steps: int) -> Set[str]:
-        """Return all positions reachable with <= steps along edges."""
-        from collections import deque
+    def distance(self, a: int, b: int) -> int:
+        """Shortest number of steps between two positions (no secret passages)."""
+        return self.distance_matrix[self.index[a]][self.index[b]]
 
-        visited = {start: 0}
-        q = deque([start])
-
-        while q:
-            current = q.popleft()
-            current_dist = visited[current]
-            if current_dist == steps:
+    def reachable_with_steps(
+        self, start: int, steps: int, blocked: Iterable[int] = ()
+    ) -> FrozenSet[int]:
+        """Return all positions reachable with <= steps along edges."""
+        dests = self._reachable.get((start, steps))
+        if dests is None:
+            row = self.distance_matrix[self.index[start]]
+            dests = frozenset(p for p, d in zip(self.positions, row) if 0 < d <= steps)
+        if blocked:
+            dests = dests - self._occupied(blocked)
+        return dests
+
+    def moves(self, start: int, roll: int, blocked: Iterable[int] = ()) -> Tuple[int, ...]:
+        """Sorted destinations for a dice roll (table lookup)."""
+        dests = self._moves.get((start, roll))
+        if dests is None:
+            dests = tuple(sorted(self.reachable_with_steps(start, roll)))
+        if blocked:
+            taken = self._occupied(blocked)
+            dests = tuple(d for d in dests if d not in taken)
+        return dests
+
+    def _occupied(self, blocked: Iterable[int]) -> FrozenSet[int]:
+        # Rooms hold any number of tokens. Start nodes are dead ends, so an
+        # occupied one only stops a token landing there.
+        return frozenset(blocked) - self._room_set
+
+    def reach_probabilities(self, position: int, turns: int = 1) -> Dict[int, float]:
+        """
+        Probability, for each room, that a player at position can be in that
+        room within `turns` turns, rolling 1d6 each turn and moving toward it
+        as well as possible (a secret passage takes a whole turn, no roll).
+        """
+        if turns not in self._reach_prob:
+            self._reach_prob_upto(turns)
+        return self._reach_prob[turns][position]
+
+    def _reach_prob_upto(self, turns: int):
+        # value[target][pos] = best chance to be in target within t turns
+        value = {
+            target: {p: (1.0 if p == target else 0.0) for p in self.positions}
+            for target in self.rooms
+        }
+        for t in range(1, turns + 1):
+            if t in self._reach_prob:
+                value = self._values_at(t)
                 continue
-            for nb in self.neighbors(current):
-                if nb not in visited or visited[nb] > current_dist + 1:
-                    visited[nb] = current_dist + 1
-                    q.append(nb)
-
-        return {pos for pos, dist in visited.items() if dist <= steps and pos != start}
+            new_value = {}
+            for target, v in value.items():
+                nv = {}
+                for pos in self.positions:
+                    if pos == target:
+                        nv[pos] = 1.0
+                        continue
+                    rolled = 0.0
+                    for roll in range(1, MAX_ROLL + 1):
+                        dests = self._reachable[(pos, roll)]
+                        rolled += max((v[d] for d in dests), default=v[pos])
+                    best = rolled / MAX_ROLL
+                    if pos in self.secret_passages:
+                        best = max(best, v[self.secret_passages[pos]])
+                    nv[pos] = best
+                new_value[target] = nv
+            value = new_value
+            self._reach_prob[t] = {
+                pos: {target: value[target][pos] for target in self.rooms}
+                for pos in self.positions
+            }
+
+    def _values_at(self, t: int) -> Dict[int, Dict[int, float]]:
+        table = self._reach_prob[t]
+        return {
+            target: {pos: table[pos][target] for pos in self.positions}
+            for target in self.rooms
+        }
 
-    def has_secret_passage(self, room: str) -> bool:
+    def has_secret_passage(self, room: int) -> bool:
         return room in self.secret_passages
 
-    def destination_of_secret_passage(self, room: str) -> str:
+    def destination_of_secret_passage(self, room: int) -> int:
         return self.secret_passages[room]
@@ -0,0 +1,80 @@
+# bus.py
+# Game-wide event bus: public suggestion events to every AI, shown cards to the suggester only
+
+from typing import Callable, List, Optional, Tuple
+
+
+class EventBus:
+    """
+    Dispatches what happens during a suggestion to the knowledge bases that
+    can see it. Public events (each seat that passed, who refuted) go to
+    every subscriber; the card shown goes to the suggester's
+    seat only.
+
+    Handlers are bound once, at subscribe(), into one plain list per event
+    as (player_id, bound method) pairs, so a dispatch is a loop over the
+    subscribers with no lookups and no event objects. A subscriber is never
+    told about its own pass or refutation: it knows its own hand already.
+    rebind() re-fetches the bound methods after a listener's methods were
+    replaced (profiling.attach does this).
+
+    With a shared public_kb.PublicKnowledge, the public events go to it
+    alone (subscribed with seat None) and the AIs subscribe with
+    public=False, for their shown cards only.
+    """
+
+    __slots__ = ("_listeners", "_passed", "_refuted", "_shown")
+
+    def __init__(self, num_seats: int):
+        self._listeners: List[Tuple[Optional[int], object, bool]] = []
+        self._passed: List[Tuple[int, Callable]] = []
+        self._refuted: List[Tuple[int, Callable]] = []
+        self._shown: List[Callable] = [_ignore] * num_seats
+
+    def subscribe(self, seat: Optional[int], listener, public: bool = True) -> None:
+        """
+        Deliver events to listener (an AIPlayer or BitsetAIPlayer): the
+        public ones to its record_player_has_none and record_player_may_have,
+        and the cards shown to seat to its record_shown_card. seat None takes public
+        events only; public=False, shown cards only.
+        """
+        self._listeners.append((seat, listener, public))
+        self._bind(seat, listener, public)
+
+    def rebind(self) -> None:
+        """Bind every handler again, e.g. after a profiler wrapped them."""
+        self._passed.clear()
+        self._refuted.clear()
+        self._shown = [_ignore] * len(self._shown)
+        for seat, listener, public in self._listeners:
+            self._bind(seat, listener, public)
+
+    def _bind(self, seat: Optional[int], listener, public: bool) -> None:
+        if public:
+            pid = listener.id
+            self._passed.append((pid, listener.record_player_has_none))
+            self._refuted.append((pid, listener.record_player_may_have))
+        if seat is not None:
+            self._shown[seat] = listener.record_shown_card
+
+    # --- Dispatch ---------------------------------------------------------------
+
+    def passed(self, player_id: int, cards: Tuple[int, int, int]) -> None:
+        """Player player_id could not refute: they hold none of the cards."""
+        for pid, handler in self._passed:
+            if pid != player_id:
+                handler(player_id, cards)
+
+    def refuted(self, player_id: int, cards: Tuple[int, int, int]) -> None:
+        """Player player_id refuted: they hold at least one of the cards."""
+        for pid, handler in self._refuted:
+            if pid != player_id:
+                handler(player_id, cards)
+
+    def shown(self, seat: int, player_id: int, card: int) -> None:
+        """Player player_id showed card to the player in seat (only they see it)."""
+        self._shown[seat](player_id, card)
+
+
+def _ignore(player_id: int, card: int) -> None:
+    """Shown-card handler of a seat with no subscriber (a human)."""
@@ -3,6 +3,9 @@
 
 from enum import Enum, auto
 from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from rules import active
 
 
 class CardType(Enum):
@@ -11,50 +14,94 @@ class CardType(Enum):
     ROOM = auto()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class Card:
     name: str
     card_type: CardType
+    id: int = -1  # dense card id (CARD_INDEX); filled in from the name
+
+    def __post_init__(self):
+        if self.id < 0:
+            object.__setattr__(self, "id", CARD_INDEX[self.name])
+
+    # Cards compare and hash by id, so card sets never hash strings.
+    def __eq__(self, other):
+        return isinstance(other, Card) and other.id == self.id
 
+    def __hash__(self):
+        return self.id
 
-CHARACTER_NAMES = [
-    "Miss Scarlett",
-    "Colonel Mustard",
-    "Mrs. White",
-    "Reverend Green",
-    "Mrs. Peacock",
-    "Professor Plum",
-]
-
-WEAPON_NAMES = [
-    "Candlestick",
-    "Dagger",
-    "Lead Pipe",
-    "Revolver",
-    "Rope",
-    "Wrench",
-]
-
-ROOM_NAMES = [
-    "Kitchen",
-    "Ballroom",
-    "Conservatory",
-    "Dining Room",
-    "Billiard Room",
-    "Library",
-    "Lounge",
-    "Hall",
-    "Study",
-]
+
+# The cards come from the active ruleset (rules.py; rulesets/classic.json
+# unless CLUEDO_RULES names another), fixed for the life of the process.
+RULES = active()
+
+CHARACTER_NAMES: List[str] = list(RULES.characters)
+WEAPON_NAMES: List[str] = list(RULES.weapons)
+ROOM_NAMES: List[str] = list(RULES.rooms)
 
 
 def create_all_cards():
-    """Return a list of all 6 + 6 + 9 cards."""
-    cards = []
-    for n in CHARACTER_NAMES:
-        cards.append(Card(n, CardType.CHARACTER))
-    for n in WEAPON_NAMES:
-        cards.append(Card(n, CardType.WEAPON))
-    for n in ROOM_NAMES:
-        cards.append(Card(n, CardType.ROOM))
-    return cards
+    """Return a list of all cards (6 + 6 + 9 in the classic game)."""
+    return list(CARDS)
+
+
+# --- Card registry ------------------------------------------------------------
+# Every card gets a dense id in create_all_cards() order. The game, the AI
+# knowledge bases and the boards work on these ids; names are only looked up
+# for display. Card sets can also be stored as int bitmasks (bit i = card i).
+CARD_NAMES = [*CHARACTER_NAMES, *WEAPON_NAMES, *ROOM_NAMES]
+CARD_INDEX = {name: i for i, name in enumerate(CARD_NAMES)}
+CARD_BIT = {name: 1 << i for i, name in enumerate(CARD_NAMES)}
+
+CHARACTER_IDS = range(0, len(CHARACTER_NAMES))
+WEAPON_IDS = range(CHARACTER_IDS.stop, CHARACTER_IDS.stop + len(WEAPON_NAMES))
+ROOM_IDS = range(WEAPON_IDS.stop, WEAPON_IDS.stop + len(ROOM_NAMES))
+
+CARDS = tuple(
+    [Card(n, CardType.CHARACTER, i) for n, i in zip(CHARACTER_NAMES, CHARACTER_IDS)]
+    + [Card(n, CardType.WEAPON, i) for n, i in zip(WEAPON_NAMES, WEAPON_IDS)]
+    + [Card(n, CardType.ROOM, i) for n, i in zip(ROOM_NAMES, ROOM_IDS)]
+)
+
+SUSPECT_MASK = (1 << len(CHARACTER_NAMES)) - 1
+WEAPON_MASK = ((1 << len(WEAPON_NAMES)) - 1) << len(CHARACTER_NAMES)
+ROOM_MASK = ((1 << len(ROOM_NAMES)) - 1) << (len(CHARACTER_NAMES) + len(WEAPON_NAMES))
+CATEGORY_MASKS = (SUSPECT_MASK, WEAPON_MASK, ROOM_MASK)
+
+
+# --- Position registry --------------------------------------------------------
+# Board positions get dense ids too. Rooms come first, in ROOM_NAMES order, so
+# room position i is room card ROOM_IDS[i]; then one starting spot per character.
+# Boards intern any further positions (grid squares) when they are built.
+def start_name(character: str) -> str:
+    """Name of a character's starting spot."""
+    return f"{character} Start"
+
+
+START_NAMES = [start_name(name) for name in CHARACTER_NAMES]
+POSITION_NAMES: List[str] = [*ROOM_NAMES, *START_NAMES]
+POSITION_INDEX: Dict[str, int] = {name: i for i, name in enumerate(POSITION_NAMES)}
+
+
+def position_id(name: str) -> int:
+    """Id of a board position, registering the name on first use."""
+    pid = POSITION_INDEX.get(name)
+    if pid is None:
+        pid = POSITION_INDEX[name] = len(POSITION_NAMES)
+        POSITION_NAMES.append(name)
+    return pid
+
+
+def position_name(pid: int) -> str:
+    return POSITION_NAMES[pid]
+
+
+def room_card(pid: int) -> Optional[int]:
+    """Card id of the room at position pid, or None if pid is not a room."""
+    return ROOM_IDS.start + pid if pid < len(ROOM_NAMES) else None
+
+
+def room_position(card: int) -> int:
+    """Position id of a room card."""
+    return card - ROOM_IDS.start
@@ -0,0 +1,109 @@
+# deals.py
+# Vectorized bulk dealing: many seeded deals at once as owner-code arrays (NumPy)
+
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from cards import CARDS, Card, CHARACTER_IDS, ROOM_IDS, WEAPON_IDS
+
+ENVELOPE = -1  # owner code of the three solution cards
+NUM_CARDS = len(CARDS)
+_CARD_DTYPE = np.int8 if NUM_CARDS <= 127 else np.int16  # card ids of the ruleset
+BLOCK = 1 << 16  # deals drawn per generator block
+
+_CATEGORY_LOW = np.array([ids.start for ids in (CHARACTER_IDS, WEAPON_IDS, ROOM_IDS)])
+_CATEGORY_HIGH = np.array([ids.stop for ids in (CHARACTER_IDS, WEAPON_IDS, ROOM_IDS)])
+
+
+def deal_block(seed: int, block: int, num_players: int = 6) -> np.ndarray:
+    """
+    Deals block * BLOCK ... (block + 1) * BLOCK - 1 of a seed, as a BLOCK x
+    NUM_CARDS int8 array: owners[d, card] is the seat holding the card, or ENVELOPE.
+
+    Each block has its own generator (the seed plus the block number), so
+    any deal depends only on the seed and its index, never on how the
+    stream is chunked. The envelope holds one uniform card per category.
+    The other 18 are shuffled uniformly and dealt round-robin, so seat i
+    gets deck.hand_sizes()[i] cards, as with deck.deal_cards.
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(block,)))
+    envelope = rng.integers(_CATEGORY_LOW, _CATEGORY_HIGH, size=(BLOCK, 3))
+    rows = np.arange(BLOCK)[:, None]
+
+    dealt = np.ones((BLOCK, NUM_CARDS), dtype=np.bool_)
+    dealt[rows, envelope] = False
+    deck = np.broadcast_to(np.arange(NUM_CARDS, dtype=_CARD_DTYPE), dealt.shape)[dealt]
+    deck = deck.reshape(BLOCK, NUM_CARDS - 3)
+    rng.permuted(deck, axis=1, out=deck)
+
+    owners = np.empty((BLOCK, NUM_CARDS), dtype=np.int8)
+    owners[rows, envelope] = ENVELOPE
+    owners[rows, deck] = np.arange(NUM_CARDS - 3) % num_players
+    return owners
+
+
+def bulk_deals(
+    n: int, seed: int, num_players: int = 6, chunk: int = BLOCK
+) -> Iterator[np.ndarray]:
+    """
+    The first n deals of a seed, as owner-code arrays of up to `chunk` rows.
+    Memory stays at about one block plus one chunk however large n is, and
+    the concatenated output is the same for every chunk size.
+    """
+    block, offset = 0, 0
+    current = deal_block(seed, 0, num_players)
+    while n > 0:
+        size = min(chunk, n)
+        parts = []
+        while size:
+            if offset == BLOCK:
+                block, offset = block + 1, 0
+                current = deal_block(seed, block, num_players)
+            take = min(size, BLOCK - offset)
+            parts.append(current[offset:offset + take])
+            offset += take
+            size -= take
+        out = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        n -= len(out)
+        yield out
+
+
+def deals(n: int, seed: int, num_players: int = 6) -> np.ndarray:
+    """All n deals in one n x NUM_CARDS array (bulk_deals for large n)."""
+    return np.concatenate(list(bulk_deals(n, seed, num_players)))
+
+
+def solutions(owners: np.ndarray) -> np.ndarray:
+    """N x 3 card ids of the envelope (suspect, weapon, room) of each deal."""
+    envelope = owners == ENVELOPE
+    return np.stack(
+        [envelope[:, ids.start:ids.stop].argmax(axis=1) + ids.start
+         for ids in (CHARACTER_IDS, WEAPON_IDS, ROOM_IDS)],
+        axis=1,
+    )
+
+
+def hand_masks(owners: np.ndarray, num_players: int = 6) -> np.ndarray:
+    """N x num_players card bitmasks (as in GameState.hands)."""
+    if NUM_CARDS < 63:
+        bits = np.left_shift(np.int64(1), np.arange(NUM_CARDS, dtype=np.int64))
+    else:  # Python ints for rulesets with more cards than int64 has bits
+        bits = np.array([1 << c for c in range(NUM_CARDS)], dtype=object)
+    return np.stack(
+        [((owners == seat) * bits).sum(axis=1) for seat in range(num_players)], axis=1
+    )
+
+
+def game_deal(owners: np.ndarray) -> Tuple[Tuple[Card, Card, Card], List[List[Card]]]:
+    """
+    One row as CluedoGame's deal= argument: the shared Card objects of
+    the solution and of each hand, in card-id order. No Card is created.
+    """
+    codes = owners.tolist()
+    solution = tuple(CARDS[c] for c, o in enumerate(codes) if o == ENVELOPE)
+    hands: List[List[Card]] = [[] for _ in range(max(codes) + 1)]
+    for card, owner in enumerate(codes):
+        if owner != ENVELOPE:
+            hands[owner].append(CARDS[card])
+    return solution, hands
@@ -2,23 +2,30 @@
 # Deck handling: solution selection and dealing
 
 import random
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from cards import Card, CardType, create_all_cards
 
 
-def select_solution(all_cards: List[Card]) -> Tuple[Card, Card, Card, List[Card]]:
-    """Pick one Character, one Weapon, one Room as solution, return rest as deck."""
+def select_solution(
+    all_cards: List[Card], rng: Optional[random.Random] = None
+) -> Tuple[Card, Card, Card, List[Card]]:
+    """
+    Pick one Character, one Weapon, one Room as solution, return rest as deck.
+    rng is the game's own random.Random; defaults to the global random module.
+    """
+    if rng is None:
+        rng = random  # module functions share the Random API
     characters = [c for c in all_cards if c.card_type == CardType.CHARACTER]
     weapons = [c for c in all_cards if c.card_type == CardType.WEAPON]
     rooms = [c for c in all_cards if c.card_type == CardType.ROOM]
 
-    solution_character = random.choice(characters)
-    solution_weapon = random.choice(weapons)
-    solution_room = random.choice(rooms)
+    solution_character = rng.choice(characters)
+    solution_weapon = rng.choice(weapons)
+    solution_room = rng.choice(rooms)
 
     solution_set = {solution_character, solution_weapon, solution_room}
     remaining = [c for c in all_cards if c not in solution_set]
-    random.shuffle(remaining)
+    rng.shuffle(remaining)
     return solution_character, solution_weapon, solution_room, remaining
 
 
@@ -30,3 +37,9 @@ def deal_cards(deck: List[Card], num_players: int) -> List[List[Card]]:
         hands[i % num_players].append(deck.pop())
         i += 1
     return hands
+
+
+def hand_sizes(num_cards: int, num_players: int) -> List[int]:
+    """Hand size per seat produced by deal_cards for a deck of num_cards."""
+    base, extra = divmod(num_cards, num_players)
+    return [base + (1 if i < extra else 0) for i in range(num_players)]
@@ -0,0 +1,335 @@
+# deduction.py
+# Event-driven constraint propagation over card locations
+
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Sequence, Set, Tuple
+
+from cards import CARDS, CATEGORY_MASKS
+from deck import hand_sizes
+
+ENVELOPE = -1  # owner id of the solution envelope
+
+# Fact kinds
+NOT = 0  # owner does not hold card
+HAS = 1  # owner holds card
+
+Fact = Tuple[int, int, int]  # (kind, owner_id, card_index)
+
+
+def _bits(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+@dataclass
+class PropagationStats:
+    """Counters for profiling how much work deduction does."""
+
+    events: int = 0  # facts/clauses fed in from outside
+    facts: int = 0  # new facts asserted (given + derived)
+    derived: int = 0  # facts derived by propagation
+    queue_pops: int = 0
+    clause_checks: int = 0  # clause re-examinations
+    clause_units: int = 0  # "at least one of" clause down to one card
+    exhaustion: int = 0  # card ruled out for every owner but one
+    hand_limit: int = 0  # hand-size rule fired
+    category: int = 0  # envelope category rule fired
+    contradictions: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class DeductionEngine:
+    """
+    Knowledge about where every card is: with one of the players or in the
+    envelope. New facts go on a queue and only the rules touched by each fact
+    are re-examined:
+
+    - a card is in exactly one place (HAS rules out every other owner, and
+      NOT for all owners but one forces the last);
+    - the envelope holds exactly one card per category;
+    - "player has at least one of X" clauses shrink as cards are ruled out
+      and become a HAS fact when one option is left;
+    - a player holds exactly their dealt hand size.
+    """
+
+    player_ids: Sequence[int]
+    hand_sizes: Dict[int, int]
+    num_cards: int = len(CARDS)
+    categories: Sequence[int] = CATEGORY_MASKS
+
+    has: Dict[int, int] = field(default_factory=dict)
+    not_have: Dict[int, int] = field(default_factory=dict)
+    stats: PropagationStats = field(default_factory=PropagationStats)
+    new_facts: List[Fact] = field(default_factory=list)
+
+    @classmethod
+    def for_deal(
+        cls, player_ids: Sequence[int], num_cards: int = len(CARDS)
+    ) -> "DeductionEngine":
+        """Engine for a game dealt by deck.deal_cards (3 cards in the envelope)."""
+        sizes = hand_sizes(num_cards - 3, len(player_ids))
+        return cls(
+            player_ids=list(player_ids),
+            hand_sizes=dict(zip(player_ids, sizes)),
+            num_cards=num_cards,
+        )
+
+    def __post_init__(self):
+        self.owners = [*self.player_ids, ENVELOPE]
+        self.all_cards = (1 << self.num_cards) - 1
+        for o in self.owners:
+            self.has[o] = 0
+            self.not_have[o] = 0
+        # owner -> number of HAS / NOT facts, kept so the hand-size rule
+        # never has to count bits
+        self._held = {o: 0 for o in self.owners}
+        self._ruled_out = {o: 0 for o in self.owners}
+        # card -> number of owners that cannot hold it
+        self._excluded = [0] * self.num_cards
+        self._category_of = [0] * self.num_cards
+        for cat in self.categories:
+            for c in _bits(cat):
+                self._category_of[c] = cat
+        # owner -> card -> ids of open clauses mentioning that card
+        self._clause_index: Dict[int, Dict[int, Set[int]]] = {
+            o: {} for o in self.player_ids
+        }
+        self._clauses: Dict[int, Tuple[int, int]] = {}  # id -> (owner, mask)
+        self._next_clause = 0
+        self._queue: List[Fact] = []
+
+    # --- Queries --------------------------------------------------------------
+
+    def envelope_candidates(self) -> int:
+        """Bitmask of cards that may still be in the envelope."""
+        return self.all_cards & ~self.not_have[ENVELOPE]
+
+    def open_clauses(self) -> List[Tuple[int, int]]:
+        return list(self._clauses.values())
+
+    # --- Input ----------------------------------------------------------------
+
+    def add_has(self, owner: int, card: int) -> None:
+        self.stats.events += 1
+        self._assert(HAS, owner, card, derived=False)
+        self._propagate()
+
+    def add_not_have(self, owner: int, card: int) -> None:
+        self.stats.events += 1
+        self._assert(NOT, owner, card, derived=False)
+        self._propagate()
+
+    def add_none_of(self, owner: int, mask: int) -> None:
+        """Owner holds none of the cards in mask (they could not refute)."""
+        self.stats.events += 1
+        for card in _bits(mask):
+            self._assert(NOT, owner, card, derived=False)
+        self._propagate()
+
+    def add_at_least_one(self, owner: int, mask: int) -> None:
+        """Owner holds at least one card of mask (they refuted a suggestion)."""
+        self.stats.events += 1
+        self._add_clause(owner, mask)
+        self._propagate()
+
+    def drain_new_facts(self) -> List[Fact]:
+        """Facts asserted since the last call, in the order they were found."""
+        facts, self.new_facts = self.new_facts, []
+        return facts
+
+    # --- Snapshots ----------------------------------------------------------
+
+    def snapshot(self) -> tuple:
+        """Immutable copy of the knowledge (not the stats), for restore()."""
+        owners = self.owners
+        return (
+            tuple([self.has[o] for o in owners]),
+            tuple([self.not_have[o] for o in owners]),
+            tuple([self._held[o] for o in owners]),
+            tuple([self._ruled_out[o] for o in owners]),
+            tuple(self._excluded),
+            tuple(self._clauses.items()),
+            self._next_clause,
+        )
+
+    def restore(self, snap: tuple) -> None:
+        """
+        Return to a snapshot() of this engine; the clause index is rebuilt.
+        Counters left empty (public_kb.PrivateKnowledge snapshots) are recounted.
+        """
+        has, not_have, held, ruled_out, excluded, clauses, next_clause = snap
+        owners = self.owners
+        if not held:
+            held = [bin(m).count("1") for m in has]
+            ruled_out = [bin(m).count("1") for m in not_have]
+            excluded = [0] * self.num_cards
+            for m in not_have:
+                for c in _bits(m):
+                    excluded[c] += 1
+        self.has = dict(zip(owners, has))
+        self.not_have = dict(zip(owners, not_have))
+        self._held = dict(zip(owners, held))
+        self._ruled_out = dict(zip(owners, ruled_out))
+        self._excluded = list(excluded)
+        self._clauses = dict(clauses)
+        self._next_clause = next_clause
+        self._clause_index = {o: {} for o in self.player_ids}
+        for cid, (owner, mask) in clauses:
+            index = self._clause_index[owner]
+            for c in _bits(mask):
+                index.setdefault(c, set()).add(cid)
+        self._queue = []
+        self.new_facts = []
+
+    # --- Propagation ---------------------------------------------------------
+
+    def _assert(self, kind: int, owner: int, card: int, derived: bool = True) -> None:
+        bit = 1 << card
+        if kind == HAS:
+            if self.has[owner] & bit:
+                return
+            if self.not_have[owner] & bit:
+                self.stats.contradictions += 1
+                return
+            self.has[owner] |= bit
+            self._held[owner] += 1
+        else:
+            if self.not_have[owner] & bit:
+                return
+            if self.has[owner] & bit:
+                self.stats.contradictions += 1
+                return
+            self.not_have[owner] |= bit
+            self._ruled_out[owner] += 1
+        self.stats.facts += 1
+        if derived:
+            self.stats.derived += 1
+        fact = (kind, owner, card)
+        self.new_facts.append(fact)
+        self._queue.append(fact)
+
+    def _propagate(self) -> None:
+        queue = self._queue
+        while queue:
+            kind, owner, card = queue.pop()
+            self.stats.queue_pops += 1
+            if kind == HAS:
+                self._on_has(owner, card)
+            else:
+                self._on_not(owner, card)
+
+    def _on_has(self, owner: int, card: int) -> None:
+        bit = 1 << card
+        for other in self.owners:
+            if other != owner:
+                self._assert(NOT, other, card)
+
+        if owner == ENVELOPE:
+            for c in _bits(self._category_of[card] & ~bit):
+                self._assert(NOT, ENVELOPE, c)
+            return
+
+        # Clauses mentioning this card are now satisfied.
+        ids = self._clause_index[owner].pop(card, None)
+        if ids:
+            for cid in list(ids):
+                self._drop_clause(cid)
+        self._check_hand_limit(owner)
+
+    def _on_not(self, owner: int, card: int) -> None:
+        self._excluded[card] += 1
+        if self._excluded[card] == len(self.owners) - 1:
+            bit = 1 << card
+            for o in self.owners:
+                if not self.not_have[o] & bit:
+                    if not self.has[o] & bit:
+                        self.stats.exhaustion += 1
+                        self._assert(HAS, o, card)
+                    break
+
+        if owner == ENVELOPE:
+            left = self._category_of[card] & ~self.not_have[ENVELOPE]
+            if left and left & (left - 1) == 0 and not self.has[ENVELOPE] & left:
+                self.stats.category += 1
+                self._assert(HAS, ENVELOPE, left.bit_length() - 1)
+            return
+
+        ids = self._clause_index[owner].pop(card, None)
+        if ids:
+            for cid in list(ids):
+                self._recheck_clause(cid)
+        self._check_hand_limit(owner)
+
+    def _check_hand_limit(self, owner: int) -> None:
+        size = self.hand_sizes.get(owner)
+        if size is None:
+            return
+        held = self._held[owner]
+        num_open = self.num_cards - held - self._ruled_out[owner]
+        if not num_open:
+            return
+        if held == size:
+            kind = NOT
+        elif held + num_open == size:
+            kind = HAS
+        else:
+            return
+        self.stats.hand_limit += 1
+        for c in _bits(self.all_cards & ~self.has[owner] & ~self.not_have[owner]):
+            self._assert(kind, owner, c)
+
+    # --- Clauses -------------------------------------------------------------
+
+    def _add_clause(self, owner: int, mask: int) -> None:
+        if owner == ENVELOPE:
+            raise ValueError("Clauses are about players' hands.")
+        if mask & self.has[owner]:
+            return
+        mask &= ~self.not_have[owner]
+        if not mask:
+            self.stats.contradictions += 1
+            return
+        if mask & (mask - 1) == 0:
+            self.stats.clause_units += 1
+            self._assert(HAS, owner, mask.bit_length() - 1)
+            return
+        for cid, (o, m) in self._clauses.items():
+            if o == owner and m & ~mask == 0:
+                return  # an equal or stronger clause is already open
+        cid = self._next_clause
+        self._next_clause += 1
+        self._clauses[cid] = (owner, mask)
+        index = self._clause_index[owner]
+        for c in _bits(mask):
+            index.setdefault(c, set()).add(cid)
+
+    def _drop_clause(self, cid: int) -> None:
+        owner, mask = self._clauses.pop(cid)
+        index = self._clause_index[owner]
+        for c in _bits(mask):
+            ids = index.get(c)
+            if ids:
+                ids.discard(cid)
+
+    def _recheck_clause(self, cid: int) -> None:
+        if cid not in self._clauses:
+            return
+        self.stats.clause_checks += 1
+        owner, mask = self._clauses[cid]
+        left = mask & ~self.not_have[owner]
+        if left & self.has[owner]:
+            self._drop_clause(cid)
+        elif not left:
+            self.stats.contradictions += 1
+            self._drop_clause(cid)
+        elif left & (left - 1) == 0:
+            self.stats.clause_units += 1
+            self._drop_clause(cid)
+            self._assert(HAS, owner, left.bit_length() - 1)
+        else:
+            self._clauses[cid] = (owner, left)
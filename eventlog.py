@@ -0,0 +1,259 @@
+# eventlog.py
+# Compact binary event log for games, and a replay engine that rebuilds state
+
+import itertools
+import sys
+from array import array
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from agents import Agent
+from board import Board
+from grid_board import GridBoard
+
+# Every event is one little-endian 32-bit word, 4 bytes on disk:
+#   byte 0: kind   byte 1: seat (0-based, NOBODY if none)   bytes 2-3: value
+# As a NumPy dtype that is EVENT_DTYPE below, so log files can be memory-mapped.
+
+GAME = 0  # seat = number of players, value = board code; starts every game
+INDEX = 1  # game index in a run (seat = bits 16-23, value = bits 0-15), after END
+DEAL = 2  # seat holds card `value` (seat NOBODY = the envelope)
+TURN = 3  # seat starts a turn
+ROLL = 4  # value = dice roll
+MOVE = 5  # value = position id moved to
+PASSAGE = 6  # value = position id reached through a secret passage
+SUGGEST = 7  # value = packed (suspect, weapon, room) card ids, or WIDE
+REFUTE = 8  # seat showed card `value` (seat NOBODY, value NO_CARD = unrefuted)
+ACCUSE = 9  # value = packed (suspect, weapon, room) card ids, or WIDE
+ELIMINATE = 10  # seat accused wrongly
+WIN = 11  # seat accused correctly
+END = 12  # game over
+CARD = 13  # value = card id; three follow a WIDE SUGGEST or ACCUSE
+
+KIND_NAMES = [
+    "GAME", "INDEX", "DEAL", "TURN", "ROLL", "MOVE", "PASSAGE",
+    "SUGGEST", "REFUTE", "ACCUSE", "ELIMINATE", "WIN", "END", "CARD",
+]
+
+NOBODY = 0xFF
+NO_CARD = 0xFFFF
+# SUGGEST / ACCUSE value when a card id does not fit in 5 bits (rulesets
+# of 32 cards or more): the three card ids follow as CARD events
+WIDE = 0x8000
+
+# board class <-> code stored in the GAME event
+BOARD_CODES = {Board: 0, GridBoard: 1}
+BOARD_CLASSES = {code: cls for cls, code in BOARD_CODES.items()}
+
+EVENT_DTYPE = [("kind", "u1"), ("seat", "u1"), ("value", "<u2")]
+
+
+def pack_cards(suspect: int, weapon: int, room: int) -> int:
+    """Three card ids (< 32 each) in one 15-bit value."""
+    if (suspect | weapon | room) >= 32:
+        raise ValueError("Packed card ids must be below 32; use EventLog.append_cards.")
+    return suspect | weapon << 5 | room << 10
+
+
+def unpack_cards(value: int) -> Tuple[int, int, int]:
+    return value & 31, value >> 5 & 31, value >> 10 & 31
+
+
+def _read_cards(value: int, events: Iterator[int]) -> Tuple[int, int, int]:
+    """Cards of a SUGGEST or ACCUSE event, taking its CARD events if WIDE."""
+    if value != WIDE:
+        return unpack_cards(value)
+    words = [next(events) for _ in range(3)]
+    if any(w & 0xFF != CARD for w in words):
+        raise ValueError("A WIDE event must be followed by three CARD events.")
+    return tuple(w >> 16 for w in words)
+
+
+def decode(word: int) -> Tuple[int, int, int]:
+    """(kind, seat, value) of one packed event."""
+    return word & 0xFF, word >> 8 & 0xFF, word >> 16
+
+
+class EventLog:
+    """Append-only event stream for one or more games."""
+
+    def __init__(self, words: Optional[Iterable[int]] = None):
+        self.words = array("I", words or ())
+
+    def append(self, kind: int, seat: int = 0, value: int = 0) -> None:
+        self.words.append(kind | seat << 8 | value << 16)
+
+    def append_cards(self, kind: int, seat: int, cards: Tuple[int, int, int]) -> None:
+        """A SUGGEST or ACCUSE event: one word, or WIDE plus three CARD words."""
+        if max(cards) < 32:
+            self.append(kind, seat, pack_cards(*cards))
+            return
+        self.append(kind, seat, WIDE)
+        for card in cards:
+            self.append(CARD, seat, card)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def events(self) -> Iterator[Tuple[int, int, int]]:
+        return map(decode, self.words)
+
+    def games(self) -> List[array]:
+        """The log split into one word array per game."""
+        return split_games(self.words)
+
+    def to_bytes(self) -> bytes:
+        """On-disk (little-endian) encoding."""
+        if sys.byteorder == "little":
+            return self.words.tobytes()
+        swapped = array("I", self.words)
+        swapped.byteswap()
+        return swapped.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "EventLog":
+        log = cls()
+        log.words.frombytes(data)
+        if sys.byteorder != "little":
+            log.words.byteswap()
+        return log
+
+    def save(self, path: str, append: bool = True) -> None:
+        with open(path, "ab" if append else "wb") as f:
+            f.write(self.to_bytes())
+
+    def format(self) -> str:
+        """Readable dump, one event per line (for debugging)."""
+        return "\n".join(
+            f"{KIND_NAMES[k]:<9} seat={s:<3} value={v}" for k, s, v in self.events()
+        )
+
+
+def split_games(words) -> List:
+    """Slices of a word sequence, one per game (each starts with GAME)."""
+    starts = [i for i, w in enumerate(words) if w & 0xFF == GAME]
+    starts.append(len(words))
+    return [words[a:b] for a, b in zip(starts, starts[1:])]
+
+
+def load(path: str):
+    """
+    Memory-map a log file as a NumPy structured array (fields kind, seat,
+    value), so whole tournaments can be scanned without unpacking events:
+
+        log = load("games.log")
+        wins = log["seat"][log["kind"] == WIN]
+    """
+    import numpy as np
+
+    return np.memmap(path, dtype=np.dtype(EVENT_DTYPE), mode="r")
+
+
+def game_starts(log):
+    """Row offsets of every GAME event in a memory-mapped log."""
+    import numpy as np
+
+    return np.flatnonzero(log["kind"] == GAME)
+
+
+def words_of(log) -> List[int]:
+    """Packed words of a memory-mapped log slice, e.g. for replay()."""
+    return log.view("<u4").tolist()
+
+
+# --- Replay ---------------------------------------------------------------
+
+
+class _ReplayAgent(Agent):
+    """
+    Answers the only question replay asks: which card was shown. The
+    engine's other hooks (suggestion_result) keep Agent's no-op defaults.
+    """
+
+    def __init__(self):
+        self.shown = None
+
+    def choose_card_to_show(self, game, player, suggester, matching_cards):
+        return self.shown
+
+
+def replay(words: Iterable[int], ai_class: type = None, ai_seats=None):
+    """
+    Rebuild a game from its events: deal, positions, weapon tokens,
+    eliminations, winner, turn counters and every AI seat's knowledge base
+    (updated through the same process_refutations call the live game made).
+    words is one game's packed events (EventLog.words, or words_of(slice)).
+    ai_seats defaults to every seat.
+    """
+    from cards import CARDS
+    from game import CluedoGame
+    from players import AIPlayer
+
+    events = iter(words)
+    first = next(events, None)
+    if first is None or first & 0xFF != GAME:
+        raise ValueError("A game log starts with a GAME event.")
+    num_players, board_code = first >> 8 & 0xFF, first >> 16
+
+    solution: List = []
+    hands: List[List] = [[] for _ in range(num_players)]
+    pending = []
+    for w in events:
+        kind = w & 0xFF
+        if kind == DEAL:
+            seat = w >> 8 & 0xFF
+            (solution if seat == NOBODY else hands[seat]).append(CARDS[w >> 16])
+        elif kind != INDEX:
+            pending.append(w)
+            break
+
+    agent = _ReplayAgent()
+    game = CluedoGame(
+        num_players=num_players,
+        ai_seats=range(num_players) if ai_seats is None else ai_seats,
+        agents=[agent] * num_players,
+        verbose=False,
+        ai_class=ai_class or AIPlayer,
+        board_class=BOARD_CLASSES[board_code],
+        deal=(solution, hands),
+    )
+    players = game.players
+    seat_of = {id(p): seat for seat, p in enumerate(players)}
+    suggestion = None
+    turn_seat = -1
+
+    stream = itertools.chain(pending, events)
+    for w in stream:
+        kind, seat, value = w & 0xFF, w >> 8 & 0xFF, w >> 16
+        if kind == TURN:
+            turn_seat = seat
+            game.current_player_idx = seat
+            game.turn_count += 1
+        elif kind == MOVE or kind == PASSAGE:
+            players[seat].position = value
+        elif kind == SUGGEST:
+            suggestion = (seat, *_read_cards(value, stream))
+            room = players[seat].position
+            game.move_character_token_to_room(suggestion[1], room)
+            game.move_weapon_token_to_room(suggestion[2], room)
+        elif kind == REFUTE:
+            agent.shown = None if value == NO_CARD else CARDS[value]
+            refuter, _ = game.process_refutations(*suggestion)
+            if (NOBODY if refuter is None else seat_of[id(refuter)]) != seat:
+                raise ValueError("Log does not match the deal it records.")
+        elif kind == ELIMINATE:
+            players[seat].eliminated = True
+            game.wrong_accusations += 1
+        elif kind == WIN:
+            game.winner = players[seat]
+            game.game_over = True
+        elif kind == END:
+            game.game_over = True
+        elif kind == ACCUSE:
+            _read_cards(value, stream)  # no state of its own; skip its CARD events
+        elif kind == GAME:
+            raise ValueError("replay() takes a single game; see split_games().")
+        # ROLL carries no state of its own
+
+    if not game.game_over and turn_seat >= 0:
+        game.next_player_index()
+    return game
@@ -2,102 +2,318 @@
 # Main game engine: setup, turns, movement, suggestions
 
 import random
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
+from agents import Agent, default_agent_for
 from board import Board
-from cards import Card, create_all_cards, ROOM_NAMES
+from bus import EventBus
+from cards import (
+    Card,
+    CARDS,
+    CARD_NAMES,
+    CHARACTER_IDS,
+    WEAPON_IDS,
+    ROOM_IDS,
+    create_all_cards,
+    position_name,
+    room_card,
+    room_position,
+)
 from deck import select_solution, deal_cards
+from eventlog import (
+    BOARD_CODES,
+    NO_CARD,
+    NOBODY,
+    ACCUSE,
+    DEAL,
+    ELIMINATE,
+    END,
+    GAME,
+    MOVE,
+    PASSAGE,
+    REFUTE,
+    ROLL,
+    SUGGEST,
+    TURN,
+    WIN,
+    EventLog,
+)
+from output import INFO, NULL, Output, console
 from players import Player, AIPlayer, WeaponToken, create_players
-from suggestion import prompt_for_suggestion
+from public_kb import PublicKnowledge
+from state import GameState, hand_mask
 
 
 
 class CluedoGame:
-    def __init__(self, num_players: int = 6):
-        self.board = Board()
-        self.players: List[Player] = create_players(num_players)
+    def __init__(
+        self,
+        num_players: int = 6,
+        ai_seats: Optional[Iterable[int]] = None,
+        agents: Optional[List[Agent]] = None,
+        verbose: bool = True,
+        max_turns: Optional[int] = None,
+        seed=None,
+        ai_class: type = AIPlayer,
+        board_class: type = Board,
+        event_log: Optional[EventLog] = None,
+        deal: Optional[Tuple[List[Card], List[List[Card]]]] = None,
+        seat_classes: Optional[Dict[int, type]] = None,
+        output: Optional[Output] = None,
+        shared_kb: bool = True,
+    ):
+        """
+        ai_seats: 0-based seats played by AIPlayer (default: last seat only).
+        agents:   one Agent per seat; defaults to AIAgent for AI seats and
+                  ConsoleAgent for the rest.
+        verbose:  False turns the game fully headless (no print output).
+        output:   where messages go (output.py), overriding verbose; the
+                  default is the console, or output.NULL when not verbose.
+        max_turns: stop with no winner after this many turns (None = no cap).
+        seed:     seeds this game's own RNG (solution, shuffle, dice), so a
+                  game is reproducible no matter what else shares the process.
+        ai_class: knowledge-base class for AI seats (AIPlayer, BitsetAIPlayer).
+        board_class: Board (room graph) or grid_board.GridBoard (squares).
+        event_log: append this game's events (eventlog.py) to the log.
+        deal:     (solution, hands) to use instead of dealing from the RNG;
+                  eventlog.replay uses it to rebuild a logged game.
+        seat_classes: seat -> player class overriding ai_class for that AI
+                  seat (e.g. mcts.MCTSPlayer).
+        shared_kb: with two or more AI seats, deduce from public events once,
+                  in one shared public_kb.PublicKnowledge, and let each AI add
+                  only what it saw itself; False gives every AI its own full
+                  deduction.
+        """
+        self.rng = random.Random(seed)
+        self.board = board_class()
+        self.players: List[Player] = create_players(
+            num_players, ai_seats, ai_class, seat_classes
+        )
         self.current_player_idx = 0
         self.game_over: bool = False
         self.winner: Optional["Player"] = None
+        self.out = output if output is not None else console() if verbose else NULL
+        self.max_turns = max_turns
+        self.turn_count = 0
+        self.wrong_accusations = 0
+        self.log = event_log
 
 
         # Cards and dealing
-        all_cards = create_all_cards()
-        (
-            self.solution_character,
-            self.solution_weapon,
-            self.solution_room,
-            remaining_deck,
-        ) = select_solution(all_cards)
-        
+        if deal is None:
+            all_cards = create_all_cards()
+            (
+                self.solution_character,
+                self.solution_weapon,
+                self.solution_room,
+                remaining_deck,
+            ) = select_solution(all_cards, self.rng)
+            hands = deal_cards(remaining_deck, num_players)
+        else:
+            (self.solution_character, self.solution_weapon, self.solution_room), hands = deal
+
 
         self.solution = (
             self.solution_character,
             self.solution_weapon,
             self.solution_room,
         )
+        self.solution_ids = tuple(card.id for card in self.solution)
 
-        hands = deal_cards(remaining_deck, num_players)
+        # Hands are kept in card-id order, so a hand mask (GameState.hands)
+        # says everything about it: refuters show their first matching card,
+        # and a game restored elsewhere must show the same one.
         for p, hand in zip(self.players, hands):
-            p.hand = hand
-
-        for p in self.players:
+            p.hand = sorted(hand, key=lambda card: card.id)
+        self._index_cards()
+
+        if self.log is not None:
+            self.log.append(GAME, num_players, BOARD_CODES[board_class])
+            for card in self.solution:
+                self.log.append(DEAL, NOBODY, card.id)
+            for seat, p in enumerate(self.players):
+                for card in p.hand:
+                    self.log.append(DEAL, seat, card.id)
+
+        # every AI hears every public suggestion event, and its own shown cards;
+        # with shared_kb the public events are deduced from once, for all of them
+        self.bus = EventBus(len(self.players))
+        self.public: Optional[PublicKnowledge] = None
+        shared_kb = shared_kb and sum(p.is_ai for p in self.players) > 1
+        if shared_kb:
+            self.public = PublicKnowledge([p.id for p in self.players], len(CARDS))
+            self.bus.subscribe(None, self.public)
+        for seat, p in enumerate(self.players):
             if p.is_ai:
-                from cards import CHARACTER_NAMES, WEAPON_NAMES, ROOM_NAMES
-                p.initialize_kb(CHARACTER_NAMES, WEAPON_NAMES, ROOM_NAMES, self.players)
-
-
-        # Weapon tokens start in arbitrary rooms (can be first 6 rooms)
-        self.weapons: Dict[str, WeaponToken] = {}
-        for weapon_name, room in zip(  # type: ignore
-            self._weapon_names(), ROOM_NAMES
-        ):
-            self.weapons[weapon_name] = WeaponToken(name=weapon_name, location=room)
-
-        # For fast lookup of character -> player
-        self.players_by_character = {p.character_name: p for p in self.players}
-    def move_character_token_to_room(self, character_name: str, room: str):
-        """Move the suggested character's token to the room."""
-        if character_name not in self.players_by_character:
+                p.out = self.out
+                p.initialize_kb(CHARACTER_IDS, WEAPON_IDS, ROOM_IDS, self.players, self.public)
+                self.bus.subscribe(seat, p, public=not shared_kb)
+
+        if agents is None:
+            agents = [default_agent_for(p) for p in self.players]
+        if len(agents) != len(self.players):
+            raise ValueError("Need exactly one agent per player.")
+        self.agents: List[Agent] = list(agents)
+
+
+        # Weapon tokens start in arbitrary rooms (the first rooms, in turn);
+        # keyed by weapon card id
+        self.weapons: Dict[int, WeaponToken] = {}
+        for i, weapon in enumerate(WEAPON_IDS):
+            room = ROOM_IDS[i % len(ROOM_IDS)]
+            self.weapons[weapon] = WeaponToken(
+                name=CARD_NAMES[weapon], location=room_position(room)
+            )
+
+        # For fast lookup of character card id -> player
+        self.players_by_character = {p.character_id: p for p in self.players}
+
+    def _index_cards(self) -> None:
+        """
+        card id -> seat holding it (-1 = envelope) and its place in that hand.
+        Built once after the deal, so refutation never has to scan hands.
+        """
+        self.card_owner: List[int] = [-1] * len(CARDS)
+        self.card_slot: List[int] = [0] * len(CARDS)
+        for seat, p in enumerate(self.players):
+            for slot, card in enumerate(p.hand):
+                self.card_owner[card.id] = seat
+                self.card_slot[card.id] = slot
+        self.hand_masks: Tuple[int, ...] = tuple(hand_mask(p.hand) for p in self.players)
+
+    def cards_held_by(self, seat: int, cards) -> List[Card]:
+        """The given card ids that seat holds, in hand order."""
+        owner = self.card_owner
+        held = [c for c in cards if owner[c] == seat]
+        if len(held) > 1:
+            held.sort(key=self.card_slot.__getitem__)
+        return [CARDS[c] for c in held]
+
+    # --- Snapshots -------------------------------------------------------------
+
+    def snapshot(self, rng: bool = False) -> GameState:
+        """
+        Immutable copy of the game's state (see state.GameState). The dice
+        RNG is only included with rng=True: its state is big, and search
+        usually wants fresh dice after a restore anyway.
+        """
+        players = self.players
+        eliminated = 0
+        for seat, p in enumerate(players):
+            if p.eliminated:
+                eliminated |= 1 << seat
+        return GameState(
+            positions=tuple([p.position for p in players]),
+            weapons=tuple([w.location for w in self.weapons.values()]),
+            hands=self.hand_masks,
+            eliminated=eliminated,
+            current=self.current_player_idx,
+            turn_count=self.turn_count,
+            wrong_accusations=self.wrong_accusations,
+            winner=-1 if self.winner is None else players.index(self.winner),
+            game_over=self.game_over,
+            knowledge=tuple([p.snapshot_kb() if p.is_ai else None for p in players]),
+            rng=self.rng.getstate() if rng else None,
+        )
+
+    def restore(self, state: GameState) -> None:
+        """
+        Put the game back into a snapshot()'s state. Hands given as other
+        bitmasks (e.g. a sampled deal) are re-dealt in card-id order, and the
+        envelope becomes whatever no hand holds. The shared public knowledge
+        goes back to the one the first AI seat's knowledge was built on.
+        """
+        players = self.players
+        base = None
+        for seat, p in enumerate(players):
+            p.position = state.positions[seat]
+            p.eliminated = bool(state.eliminated >> seat & 1)
+            snap = state.knowledge[seat]
+            if snap is not None:
+                p.restore_kb(snap)
+                if base is None:
+                    base = snap[-2]
+        if self.public is not None and base is not None:
+            self.public.restore(base)
+        for token, location in zip(self.weapons.values(), state.weapons):
+            token.location = location
+        if state.hands != self.hand_masks:
+            self._deal_masks(state.hands)
+        self.current_player_idx = state.current
+        self.turn_count = state.turn_count
+        self.wrong_accusations = state.wrong_accusations
+        self.winner = None if state.winner < 0 else players[state.winner]
+        self.game_over = state.game_over
+        if state.rng is not None:
+            self.rng.setstate(state.rng)
+
+    def _deal_masks(self, hands: Tuple[int, ...]) -> None:
+        held = 0
+        for p, mask in zip(self.players, hands):
+            p.hand = [card for card in CARDS if mask >> card.id & 1]
+            held |= mask
+        self.solution = tuple(card for card in CARDS if not held >> card.id & 1)
+        if len(self.solution) != 3:
+            raise ValueError("Hands must leave exactly three cards for the envelope.")
+        self.solution_character, self.solution_weapon, self.solution_room = self.solution
+        self.solution_ids = tuple(card.id for card in self.solution)
+        self._index_cards()
+
+    @property
+    def verbose(self) -> bool:
+        """True if anyone is listening to the narration."""
+        return self.out.enabled(INFO)
+
+    def agent_for(self, player: Player) -> Agent:
+        return self.agents[self.players.index(player)]
+
+    def move_character_token_to_room(self, character: int, room: int):
+        """Move the suggested character's token to the room position."""
+        if character not in self.players_by_character:
             return
-        player = self.players_by_character[character_name]
-        print(f"Moving {character_name} token from {player.position} to {room} due to suggestion.")
+        player = self.players_by_character[character]
+        if self.out.enabled(INFO):
+            self.out.info(
+                "Moving %s token from %s to %s due to suggestion.",
+                CARD_NAMES[character], position_name(player.position), position_name(room),
+            )
         player.position = room
 
-    def move_weapon_token_to_room(self, weapon_name: str, room: str):
-        """Move the suggested weapon token into the room."""
-        if weapon_name not in self.weapons:
+    def move_weapon_token_to_room(self, weapon_id: int, room: int):
+        """Move the suggested weapon token into the room position."""
+        if weapon_id not in self.weapons:
             return
-        weapon = self.weapons[weapon_name]
-        print(f"Moving weapon {weapon_name} from {weapon.location} to {room} due to suggestion.")
+        weapon = self.weapons[weapon_id]
+        if self.out.enabled(INFO):
+            self.out.info(
+                "Moving weapon %s from %s to %s due to suggestion.",
+                weapon.name, position_name(weapon.location), position_name(room),
+            )
         weapon.location = room
 
-    def _weapon_names(self):
-        # Quick access without importing again
-        from cards import WEAPON_NAMES
-
-        return WEAPON_NAMES
-
     def show_initial_info(self):
-        print("\n=== Welcome to Command-Line Cluedo (Part 1 & part 2) ===\n")
-        print("Players in this game:")
+        out = self.out
+        out.info("\n=== Welcome to Command-Line Cluedo (Part 1 & part 2) ===\n")
+        out.info("Players in this game:")
         for p in self.players:
-            print(f"  {p}")
-        print("\nYour individual cards will NOT be shown to other players.")
-        print("Each player should look at their hand when it is their turn.\n")
+            out.info("  %s", p)
+        out.info("\nYour individual cards will NOT be shown to other players.")
+        out.info("Each player should look at their hand when it is their turn.\n")
 
     def show_player_hand(self, player: Player):
-        print(f"\nCards dealt to {player.character_name}:")
+        out = self.out
+        out.info("\nCards dealt to %s:", player.character_name)
         for card in player.hand:
-            print(f"  - {card.name} ({card.card_type.name})")
-        print()
+            out.info("  - %s (%s)", card.name, card.card_type.name)
+        out.info()
 
     def roll_dice(self) -> int:
-        return random.randint(1, 6)
+        return self.rng.randint(1, 6)
 
     def available_moves_for_player(self, player: Player, roll: int):
-        reachable = self.board.reachable_with_steps(player.position, roll)
-        return sorted(list(reachable))
+        """Destinations for this roll; other tokens block the squares they hold."""
+        occupied = [p.position for p in self.players if p is not player]
+        return self.board.moves(player.position, roll, occupied)
 
     def take_turn(self, player: "Player") -> None:
         """
@@ -105,91 +321,67 @@ class CluedoGame:
         OR move (and possibly make a suggestion).
         """
         if player.eliminated:
-            print(f"\n{player.name} has been eliminated and skips their turn.")
+            self.out.info("\n%s has been eliminated and skips their turn.", player.name)
             return
 
-        print("\n" + "=" * 50)
-        print(f"It's {player.name}'s turn.")
-        print(f"Current position: {player.position}")
+        agent = self.agent_for(player)
+        out = self.out
+        if out.enabled(INFO):
+            out.info("\n" + "=" * 50)
+            out.info("It's %s's turn.", player.name)
+            out.info("Current position: %s", position_name(player.position))
 
         # Give the player a choice: accuse or move
-        while True:
-            choice = input(
-                "Do you want to (A)ccuse or (M)ove this turn? [M]: "
-            ).strip().upper()
-            if choice in ("", "M", "A"):
-                break
-            print("Please enter 'A' or 'M'.")
-        
-        if player.is_ai and player.should_accuse():
-            print(f"\n{player.name} (AI) decides to make an ACCUSATION!")
-            self.handle_accusation(player)
-            return
-
+        choice = agent.choose_action(self, player)
 
         if choice == "A":
+            if player.is_ai:
+                out.info("\n%s (AI) decides to make an ACCUSATION!", player.name)
             self.handle_accusation(player)
             return
 
-        # ----- NORMAL MOVEMENT FLOW (existing Part 1 logic) -----
-        # Secret passage option first
         # ----- NORMAL MOVEMENT FLOW -----
 
         # Secret passage option
         if player.position in self.board.secret_passages and not self.game_over:
-            use_sp = input(
-                "You are in a room with a SECRET PASSAGE.\n"
-                "Type 'S' to use it (no dice required) or press Enter to roll the dice: "
-            ).strip().upper()
-            if use_sp == "S":
+            if agent.use_secret_passage(self, player):
                 dest = self.board.destination_of_secret_passage(player.position)
-                print(f"Using secret passage to {dest}.")
+                if out.enabled(INFO):
+                    out.info("Using secret passage to %s.", position_name(dest))
+                if self.log is not None:
+                    self.log.append(PASSAGE, self.current_player_idx, dest)
                 player.position = dest
                 self.handle_suggestion_if_in_room(player)
                 return
 
         # Roll dice (both AI and human)
-        input("\nPress Enter to roll the dice...")
+        agent.before_roll(self, player)
         roll = self.roll_dice()
-        print(f"Dice roll result: {roll}")
+        out.info("Dice roll result: %d", roll)
+        if self.log is not None:
+            self.log.append(ROLL, self.current_player_idx, roll)
 
         # Compute reachable destinations
-        possible_destinations = sorted(
-            list(
-                self.board.reachable_with_steps(
-                    start=player.position,
-                    steps=roll,
-                )
-            )
-        )
+        possible_destinations = self.available_moves_for_player(player, roll)
 
         if not possible_destinations:
-            print("No valid moves available. Turn ends.")
+            out.info("No valid moves available. Turn ends.")
             return
 
-        print("\nPossible destinations with this roll:")
-        for i, room in enumerate(possible_destinations, start=1):
-            print(f"  {i}. {room}")
-
-        # --- AI chooses destination automatically ---
-        if player.is_ai:
-            dest = possible_destinations[0]
-            print(f"AI chooses to move to: {dest}")
-
-        # --- Human chooses manually ---
-        else:
-            while True:
-                choice = input("Choose destination number: ").strip()
-                if choice.isdigit():
-                    idx = int(choice)
-                    if 1 <= idx <= len(possible_destinations):
-                        dest = possible_destinations[idx - 1]
-                        break
-                print("Invalid choice. Try again.")
-
-        print(f"{player.name} moved to {dest}.")
+        if out.enabled(INFO):
+            out.info("\nPossible destinations with this roll:")
+            for i, pos in enumerate(possible_destinations, start=1):
+                out.info("  %d. %s", i, position_name(pos))
+
+        dest = agent.choose_destination(self, player, possible_destinations)
+        if out.enabled(INFO):
+            if player.is_ai:
+                out.info("AI chooses to move to: %s", position_name(dest))
+            out.info("%s moved to %s.", player.name, position_name(dest))
+        if self.log is not None:
+            self.log.append(MOVE, self.current_player_idx, dest)
         player.position = dest
-        self.handle_suggestion_if_in_room(player)     
+        self.handle_suggestion_if_in_room(player)
 
 
     def handle_suggestion_if_in_room(self, player: "Player") -> None:
@@ -197,26 +389,22 @@ class CluedoGame:
         If the current player is in a room, force them to make a suggestion.
         Then handle refutations according to clockwise order.
         """
-        from suggestion import prompt_for_suggestion  
-        from cards import ROOM_NAMES  
-
-        room = player.position
-        if room not in ROOM_NAMES:
+        room = room_card(player.position)
+        if room is None:
             return  # not in a room → no suggestion
 
-        print(f"\n{player.name}, you MUST make a suggestion.")
-        if player.is_ai:
-            suspect, weapon, _ = player.choose_suggestion(room)
-        else:
-            suspect, weapon, _ = prompt_for_suggestion(player, room)
-
+        self.out.info("\n%s, you MUST make a suggestion.", player.name)
+        suspect, weapon = self.agent_for(player).choose_suggestion(self, player, room)
+        if self.log is not None:
+            self.log.append_cards(SUGGEST, self.current_player_idx, (suspect, weapon, room))
 
-        # Move suggested character & weapon into the room 
-        self.move_character_token_to_room(suspect, room)
-        self.move_weapon_token_to_room(weapon, room)
+        # Move suggested character & weapon into the room
+        self.move_character_token_to_room(suspect, player.position)
+        self.move_weapon_token_to_room(weapon, player.position)
 
-        print(
-            f"\nSuggestion recorded: {suspect} with the {weapon} in the {room}."
+        self.out.info(
+            "\nSuggestion recorded: %s with the %s in the %s.",
+            CARD_NAMES[suspect], CARD_NAMES[weapon], CARD_NAMES[room],
         )
 
         # --- NEW: handle refutation phase ---
@@ -232,116 +420,120 @@ class CluedoGame:
     def next_player_index(self):
         self.current_player_idx = (self.current_player_idx + 1) % len(self.players)
 
-    def run(self):
-        self.show_initial_info()
-        print("Type CTRL+C at any time to quit the game.\n")
+    def play_turn(self) -> None:
+        """Play the current seat's turn, then check end conditions and advance."""
+        player = self.players[self.current_player_idx]
+        if self.log is not None:
+            self.log.append(TURN, self.current_player_idx)
 
-        round_counter = 1
-        try:
-            while not self.game_over:
-                print(f"\n************ ROUND {round_counter} ************")
-                player = self.players[self.current_player_idx]
-
-                self.show_player_hand(player)
-                self.take_turn(player)
+        if self.out.enabled(INFO):
+            self.show_player_hand(player)
+        self.take_turn(player)
+        self.end_turn()
 
-                # After each turn, check if ALL players are eliminated
-                if all(p.eliminated for p in self.players):
-                    print("\nAll players eliminated — no one can win the game.")
-                    self.game_over = True
-                    break
+    def end_turn(self) -> None:
+        """Count the turn, check end conditions and pass to the next seat."""
+        self.turn_count += 1
 
+        # After each turn, check if ALL players are eliminated
+        if all(p.eliminated for p in self.players):
+            self.out.info("\nAll players eliminated — no one can win the game.")
+            self.game_over = True
+        elif self.max_turns is not None and self.turn_count >= self.max_turns:
+            self.out.info("\nTurn limit (%d) reached — no winner.", self.max_turns)
+            self.game_over = True
 
-                if self.game_over:
-                    break
+        if not self.game_over:
+            self.next_player_index()
+        elif self.log is not None:
+            self.log.append(END)
 
-                self.next_player_index()
-                round_counter += 1
+    def run(self) -> Optional[Player]:
+        """Play until the game is over; returns the winner (or None)."""
+        self.show_initial_info()
+        out = self.out
+        out.info("Type CTRL+C at any time to quit the game.\n")
 
+        try:
+            while not self.game_over:
+                out.info("\n************ ROUND %d ************", self.turn_count + 1)
+                self.play_turn()
         except KeyboardInterrupt:
-            print("\n\nGame ended by user. Goodbye!")
+            out.info("\n\nGame ended by user. Goodbye!")
 
         if self.winner:
-            print(f"\nGAME OVER — Winner: {self.winner.name}")
+            out.info("\nGAME OVER — Winner: %s", self.winner.name)
+        return self.winner
+
 
 
-    
     def process_refutations(
         self,
         suggester_index: int,
-        suspect: str,
-        weapon: str,
-        room: str,
+        suspect: int,
+        weapon: int,
+        room: int,
     ) -> Tuple[Optional["Player"], Optional["Card"]]:
+        """Card ids in, the refuter and the card they showed (if any) out."""
 
         n = len(self.players)
         suggester = self.players[suggester_index]
-        names_to_match = {suspect, weapon, room}
-
-        # CLOCKWISE search for refuter
-        for offset in range(1, n):
-            idx = (suggester_index + offset) % n
+        to_match = (suspect, weapon, room)
+
+        # CLOCKWISE: the refuter is the nearest owner of any of the 3 cards
+        first = n  # offset from the suggester; n = nobody
+        owner = self.card_owner
+        for card in to_match:
+            seat = owner[card]
+            if seat >= 0:
+                offset = (seat - suggester_index) % n
+                if 0 < offset < first:
+                    first = offset
+
+        # --- Every AI learns the seats passed over have NONE of these 3 cards ---
+        bus = self.bus
+        for offset in range(1, first):
+            bus.passed(self.players[(suggester_index + offset) % n].id, to_match)
+
+        if first < n:
+            idx = (suggester_index + first) % n
             refuter = self.players[idx]
 
             # What cards can this refuter show?
-            matching_cards = [
-                card for card in refuter.hand
-                if getattr(card, "name", None) in names_to_match
-            ]
-
-            if not matching_cards:
-                # --- AI learns this refuter cannot have ANY of these 3 cards ---
-                if suggester.is_ai:
-                    suggester.record_player_cannot_have(refuter.id, suspect)
-                    suggester.record_player_cannot_have(refuter.id, weapon)
-                    suggester.record_player_cannot_have(refuter.id, room)
+            matching_cards = self.cards_held_by(idx, to_match)
 
-                continue
-
-            
-            print(f"\n{refuter.name} can refute the suggestion.")
+            self.out.info("\n%s can refute the suggestion.", refuter.name)
 
             # Choose card (AI/human)
-            if len(matching_cards) == 1 or refuter.is_ai:
-                shown = matching_cards[0]
-            else:
-                print("You have the following matching cards:")
-                for i, c in enumerate(matching_cards, start=1):
-                    print(f"  {i}. {c.name}")
-                while True:
-                    choice = input("Choose a card number to show: ").strip()
-                    if choice.isdigit() and 1 <= int(choice) <= len(matching_cards):
-                        shown = matching_cards[int(choice) - 1]
-                        break
-                    print("Invalid choice. Try again.")
+            shown = self.agents[idx].choose_card_to_show(
+                self, refuter, suggester, matching_cards
+            )
+            if self.log is not None:
+                self.log.append(REFUTE, idx, shown.id)
+            self.agents[suggester_index].suggestion_result(self, suggester, refuter, shown)
 
             # Show card to suggester
-            print(f"\n{refuter.name} shows a card to {suggester.name}.")
-            print(f"(DEBUG / CLI) Card shown: {shown.name}")
+            self.out.info("\n%s shows a card to %s.", refuter.name, suggester.name)
+            self.out.debug("(DEBUG / CLI) Card shown: %s", shown.name)
 
             # --- AI KNOWLEDGE UPDATE ---
-            if suggester.is_ai:
-                # AI directly sees the card
-                suggester.record_seen_card(shown.name)
-
-            if refuter.is_ai:
-                # AI knows it has at least one of these 3 cards
-                refuter.record_player_has(refuter.id, shown.name)
-
-            # AI learns refuter MAY have one of the suggested cards
-            if suggester.is_ai:
-                suggester.record_player_may_have(refuter.id, list(names_to_match))
+            # Only the suggester sees the card (and so knows who holds it);
+            # every other AI learns the refuter holds at least one of the 3
+            bus.shown(suggester_index, refuter.id, shown.id)
+            bus.refuted(refuter.id, to_match)
 
             return refuter, shown
 
         # No refutation
-        print("\nNo one can refute this suggestion. The suggestion stands.")
-    
+        self.out.info("\nNo one can refute this suggestion. The suggestion stands.")
+        if self.log is not None:
+            self.log.append(REFUTE, NOBODY, NO_CARD)
+        self.agents[suggester_index].suggestion_result(self, suggester, None, None)
+
         # --- AI DEDUCTION: nobody has any of these 3 cards ---
-        if suggester.is_ai:
-            suggester.record_player_cannot_have(-1, suspect)
-            suggester.record_player_cannot_have(-1, weapon)
-            suggester.record_player_cannot_have(-1, room)
+        # Every other seat was published as passed above and each AI's own
+        # row is complete, so every AI's deduction engine has already placed
+        # any card it does not hold in the solution.
 
         return None, None
 
@@ -352,75 +544,40 @@ class CluedoGame:
         If correct → game over with winner.
         If wrong   → player is eliminated (but may still refute others).
         """
-        from cards import CHARACTER_NAMES, WEAPON_NAMES, ROOM_NAMES
+        out = self.out
+        out.info("\n%s is making an ACCUSATION!", player.name)
+
+        accusation = self.agent_for(player).choose_accusation(self, player)
+        if self.log is not None:
+            self.log.append_cards(ACCUSE, self.current_player_idx, accusation)
+        if out.enabled(INFO):
+            suspect, weapon, room = (CARD_NAMES[c] for c in accusation)
+            if player.is_ai:
+                out.info("%s (AI) accuses: %s with the %s in the %s!",
+                         player.name, suspect, weapon, room)
 
-        print(f"\n{player.name} is making an ACCUSATION!")
 
-        
-        # AI ACCUSATION (NO INPUT)
-        
-        if player.is_ai:
-            suspect, weapon, room = player.get_accusation()
-            print(f"{player.name} (AI) accuses: {suspect} with the {weapon} in the {room}!")
-        else:
-            
-            # HUMAN ACCUSATION (INPUT)
-            
-
-            # --- Choose suspect ---
-            print("Choose a suspect:")
-            for i, name in enumerate(CHARACTER_NAMES, start=1):
-                print(f"  {i}. {name}")
-            while True:
-                c = input("Suspect number: ").strip()
-                if c.isdigit() and 1 <= int(c) <= len(CHARACTER_NAMES):
-                    suspect = CHARACTER_NAMES[int(c) - 1]
-                    break
-                print("Invalid choice. Try again.")
-
-            # --- Choose weapon ---
-            print("\nChoose a weapon:")
-            for i, name in enumerate(WEAPON_NAMES, start=1):
-                print(f"  {i}. {name}")
-            while True:
-                w = input("Weapon number: ").strip()
-                if w.isdigit() and 1 <= int(w) <= len(WEAPON_NAMES):
-                    weapon = WEAPON_NAMES[int(w) - 1]
-                    break
-                print("Invalid choice. Try again.")
-
-            # --- Choose room ---
-            print("\nChoose a room:")
-            for i, name in enumerate(ROOM_NAMES, start=1):
-                print(f"  {i}. {name}")
-            while True:
-                r = input("Room number: ").strip()
-                if r.isdigit() and 1 <= int(r) <= len(ROOM_NAMES):
-                    room = ROOM_NAMES[int(r) - 1]
-                    break
-                print("Invalid choice. Try again.")
-
-        
         # CHECK ACCUSATION RESULT
-        
 
-        print(f"\n{player.name} accuses: {suspect} with the {weapon} in the {room}!")
 
-        sol_char, sol_weapon, sol_room = self.solution
+        if out.enabled(INFO):
+            out.info("\n%s accuses: %s with the %s in the %s!", player.name, suspect, weapon, room)
 
-        if (
-            suspect == sol_char.name
-            and weapon == sol_weapon.name
-            and room == sol_room.name
-        ):
-            print("\n ACCUSATION CORRECT! ")
-            print(f"{player.name} WINS THE GAME!")
+        if tuple(accusation) == self.solution_ids:
+            out.info("\n ACCUSATION CORRECT! ")
+            out.info("%s WINS THE GAME!", player.name)
             self.game_over = True
             self.winner = player
+            if self.log is not None:
+                self.log.append(WIN, self.current_player_idx)
         else:
-            print("\n❌ ACCUSATION WRONG.")
-            print(
-                f"{player.name} is eliminated from making further moves/accusations "
-                "but will stay in the game to refute suggestions."
+            out.info("\n❌ ACCUSATION WRONG.")
+            out.info(
+                "%s is eliminated from making further moves/accusations "
+                "but will stay in the game to refute suggestions.",
+                player.name,
             )
             player.eliminated = True
+            self.wrong_accusations += 1
+            if self.log is not None:
+                self.log.append(ELIMINATE, self.current_player_idx)
@@ -0,0 +1,258 @@
+# grid_board.py
+# Square-level board: the classic 24x25 grid of corridor squares with room doors
+
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+from board import Board, MAX_ROLL
+from cards import ROOM_NAMES, START_NAMES, position_id
+
+# 25 rows x 24 columns. '.' corridor, '#' off the board, 'X' the cellar.
+# Upper-case letters are room floor (see ROOM_KEYS), lower-case letters are
+# the starting squares (see START_KEYS). Rooms are entered through DOORS.
+GRID = (
+    "#########w####g#########",
+    "KKKKKK............CCCCCC",
+    "KKKKKK..BBBBBBBB..CCCCCC",
+    "KKKKKK..BBBBBBBB..CCCCCC",
+    "KKKKKK..BBBBBBBB..CCCCCC",
+    "KKKKKK..BBBBBBBB..CCCCCC",
+    "KKKKKK..BBBBBBBB.......p",
+    "#.......BBBBBBBB.......#",
+    "#.................IIIIII",
+    "DDDDDDDD..........IIIIII",
+    "DDDDDDDD..XXXXX...IIIIII",
+    "DDDDDDDD..XXXXX...IIIIII",
+    "DDDDDDDD..XXXXX...IIIIII",
+    "DDDDDDDD..XXXXX........#",
+    "DDDDDDDD..XXXXX..LLLLLLL",
+    "DDDDDDDD..XXXXX..LLLLLLL",
+    "#.........XXXXX..LLLLLLL",
+    "m................LLLLLLL",
+    "#........HHHHHH..LLLLLLL",
+    "OOOOOOO..HHHHHH........u",
+    "OOOOOOO..HHHHHH........#",
+    "OOOOOOO..HHHHHH..SSSSSSS",
+    "OOOOOOO..HHHHHH..SSSSSSS",
+    "OOOOOOO..HHHHHH..SSSSSSS",
+    "OOOOOOOs#HHHHHH##SSSSSSS",
+)
+
+ROOM_KEYS = {
+    "K": "Kitchen",
+    "B": "Ballroom",
+    "C": "Conservatory",
+    "D": "Dining Room",
+    "I": "Billiard Room",
+    "L": "Library",
+    "O": "Lounge",
+    "H": "Hall",
+    "S": "Study",
+}
+
+START_KEYS = {
+    "s": "Miss Scarlett Start",
+    "m": "Colonel Mustard Start",
+    "w": "Mrs. White Start",
+    "g": "Reverend Green Start",
+    "p": "Mrs. Peacock Start",
+    "u": "Professor Plum Start",
+}
+
+# room -> corridor squares (row, col) just outside each of its doors
+DOORS = {
+    "Kitchen": [(7, 4)],
+    "Ballroom": [(5, 7), (5, 16), (8, 9), (8, 14)],
+    "Conservatory": [(6, 18)],
+    "Dining Room": [(8, 6), (12, 8)],
+    "Billiard Room": [(9, 17), (13, 22)],
+    "Library": [(13, 20), (16, 16)],
+    "Lounge": [(18, 6)],
+    "Hall": [(17, 11), (17, 12), (20, 15)],
+    "Study": [(20, 17)],
+}
+
+WALKABLE = ".smwgpu"
+
+# layout key -> precomputed GridBoard tables, shared between instances
+_GRID_TABLES: Dict[tuple, dict] = {}
+
+
+def square_name(row: int, col: int) -> str:
+    return f"Corridor {row},{col}"
+
+
+@dataclass
+class GridBoard(Board):
+    """
+    Drop-in replacement for Board that moves square by square.
+
+    Every room is one node joined to the corridor squares outside its doors;
+    every corridor and starting square is a node of its own. Adjacency is
+    stored in CSR form (`offsets`/`targets`, int arrays indexed by node id,
+    rooms first; `positions[node]` is the node's position id) and the
+    all-pairs distances in one flat array, so `adjacency` is left empty. Entering a room ends a move, and squares
+    held by other tokens can be neither crossed nor landed on.
+    """
+
+    def __post_init__(self):
+        if set(ROOM_KEYS.values()) != set(ROOM_NAMES) or set(START_KEYS.values()) != set(
+            START_NAMES
+        ):
+            raise ValueError("GridBoard only draws the classic mansion; use Board.")
+        self._init_secret_passages()
+        self._init_tables()
+
+    def _init_grid(self):
+        self.rooms: List[int] = [position_id(r) for r in ROOM_KEYS.values()]
+        self.positions: List[int] = list(self.rooms)
+        self.coords: List[Tuple[int, int]] = [(-1, -1)] * len(self.rooms)
+        cell: Dict[Tuple[int, int], int] = {}
+        for r, line in enumerate(GRID):
+            for c, ch in enumerate(line):
+                if ch in WALKABLE:
+                    cell[(r, c)] = len(self.positions)
+                    self.positions.append(position_id(START_KEYS.get(ch) or square_name(r, c)))
+                    self.coords.append((r, c))
+        self.index: Dict[int, int] = {p: i for i, p in enumerate(self.positions)}
+
+        links: List[List[int]] = [[] for _ in self.positions]
+        for (r, c), i in cell.items():
+            for nb in ((r - 1, c), (r, c - 1), (r, c + 1), (r + 1, c)):
+                j = cell.get(nb)
+                if j is not None:
+                    links[i].append(j)
+        for room, squares in DOORS.items():
+            i = self.index[position_id(room)]
+            for sq in squares:
+                j = cell[sq]  # KeyError here means a door opens onto a wall
+                links[i].append(j)
+                links[j].append(i)
+
+        self.offsets = array("i", [0])
+        self.targets = array("i")
+        for nbs in links:
+            self.targets.extend(sorted(nbs))
+            self.offsets.append(len(self.targets))
+
+    def _init_tables(self):
+        """
+        Grid arrays, distances and (position, roll) move tables, built once
+        per process and shared like Board's. Reach probabilities are filled
+        in on first use: over a couple of hundred squares they take a moment.
+        """
+        key = ("grid", GRID, tuple((r, tuple(sq)) for r, sq in DOORS.items()),
+               tuple(sorted(self.secret_passages.items())))
+        cached = _GRID_TABLES.get(key)
+        if cached is None:
+            cached = self._build_tables()
+            _GRID_TABLES[key] = cached
+        self.__dict__.update(cached)
+        self._seen = array("I", bytes(4 * len(self.positions)))
+        self._stamp = 0
+
+    def _build_tables(self) -> dict:
+        self._init_grid()
+        n = len(self.positions)
+        self.distance_matrix = array("H", [n]) * (n * n)  # n = unreachable
+        for s in range(n):
+            base = s * n
+            self.distance_matrix[base + s] = 0
+            q = deque([s])
+            while q:
+                u = q.popleft()
+                if u < len(self.rooms) and u != s:
+                    continue  # rooms end movement
+                d = self.distance_matrix[base + u] + 1
+                for k in range(self.offsets[u], self.offsets[u + 1]):
+                    v = self.targets[k]
+                    if self.distance_matrix[base + v] > d:
+                        self.distance_matrix[base + v] = d
+                        q.append(v)
+
+        self._moves: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+        self._reachable: Dict[Tuple[int, int], FrozenSet[int]] = {}
+        for s, start in enumerate(self.positions):
+            row = self.distance_matrix[s * n:(s + 1) * n]
+            for roll in range(MAX_ROLL + 1):
+                # node-id order: rooms first, then squares row by row
+                dests = tuple(self.positions[v] for v in range(n) if 0 < row[v] <= roll)
+                self._moves[(start, roll)] = dests
+                self._reachable[(start, roll)] = frozenset(dests)
+
+        self._reach_prob: Dict[int, Dict[int, Dict[int, float]]] = {}
+        return {
+            name: getattr(self, name)
+            for name in (
+                "rooms", "positions", "coords", "index", "offsets", "targets",
+                "distance_matrix", "_moves", "_reachable", "_reach_prob",
+            )
+        }
+
+    # --- Queries -----------------------------------------------------------
+
+    def neighbors(self, position: int) -> List[int]:
+        i = self.index.get(position)
+        if i is None:
+            return []
+        return [self.positions[self.targets[k]]
+                for k in range(self.offsets[i], self.offsets[i + 1])]
+
+    def distance(self, a: int, b: int) -> int:
+        """Shortest number of steps between two positions (no secret passages)."""
+        return self.distance_matrix[self.index[a] * len(self.positions) + self.index[b]]
+
+    def reachable_with_steps(
+        self, start: int, steps: int, blocked: Iterable[int] = ()
+    ) -> FrozenSet[int]:
+        """Positions reachable with <= steps, avoiding blocked squares."""
+        return frozenset(self.moves(start, steps, blocked))
+
+    def moves(self, start: int, roll: int, blocked: Iterable[int] = ()) -> Tuple[int, ...]:
+        """
+        Destinations for a dice roll. The precomputed table answers unless a
+        blocked square is close enough to cut a path (nearer than `roll`
+        steps), in which case a bounded BFS runs over the CSR arrays.
+        """
+        dests = self._moves.get((start, roll))
+        if dests is not None and not blocked:
+            return dests
+        s = self.index[start]
+        base = s * len(self.positions)
+        dist, num_rooms = self.distance_matrix, len(self.rooms)
+        # rooms never fill up, so only squares can block
+        cut = [b for b in map(self.index.get, blocked) if b is not None and b >= num_rooms]
+        nearest = min([dist[base + b] for b in cut], default=roll + 1)
+        if dests is not None and nearest >= roll:
+            if nearest == roll:  # only lands on them, cannot pass through
+                taken = {self.positions[b] for b in cut}
+                dests = tuple(d for d in dests if d not in taken)
+            return dests
+        return tuple(self.positions[v] for v in sorted(self._bfs(s, roll, cut)))
+
+    def _bfs(self, s: int, steps: int, blocked: List[int]) -> List[int]:
+        """Node ids within `steps` of s, never entering blocked ids."""
+        self._stamp += 1
+        stamp, seen = self._stamp, self._seen
+        offsets, targets, num_rooms = self.offsets, self.targets, len(self.rooms)
+        seen[s] = stamp
+        for b in blocked:
+            seen[b] = stamp
+        frontier, found = [s], []
+        for _ in range(steps):
+            nxt = []
+            for u in frontier:
+                if u < num_rooms and u != s:
+                    continue  # rooms end movement
+                for k in range(offsets[u], offsets[u + 1]):
+                    v = targets[k]
+                    if seen[v] != stamp:
+                        seen[v] = stamp
+                        nxt.append(v)
+            if not nxt:
+                break
+            found.extend(nxt)
+            frontier = nxt
+        return found
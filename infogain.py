@@ -0,0 +1,183 @@
+# infogain.py
+# Expected information gain of every suggestion in a room, in one NumPy pass
+
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import numpy as np
+
+from cards import CHARACTER_IDS, WEAPON_IDS
+from deduction import DeductionEngine, ENVELOPE
+
+# every (suspect, weapon) pair, suspect-major so argmax ties go to card order
+_PAIRS = np.array([(s, w) for s in CHARACTER_IDS for w in WEAPON_IDS], dtype=np.intp)
+
+_CACHE: "OrderedDict[tuple, Tuple[int, int]]" = OrderedDict()
+CACHE_SIZE = 4096
+cache_stats = {"hits": 0, "misses": 0}
+
+# tables that only depend on the ruleset, built on first use
+_CATEGORIES: Dict[tuple, np.ndarray] = {}  # (num_cards, categories) -> categories x cards
+_CANDIDATES: Dict[int, np.ndarray] = {}  # room -> rows of _PAIRS plus the room, x 3
+
+
+def _rows(masks, num_cards: int) -> np.ndarray:
+    """owners x cards 0/1 matrix of card bitmasks."""
+    if num_cards < 63:
+        masks = np.array(masks, dtype=np.int64)[:, None]
+        return ((masks >> np.arange(num_cards)) & 1).astype(np.float64)
+    # too many cards for int64 masks (large rulesets): unpack the bytes
+    size = (num_cards + 7) // 8
+    raw = np.frombuffer(b"".join(m.to_bytes(size, "little") for m in masks), dtype=np.uint8)
+    bits = np.unpackbits(raw.reshape(len(masks), size), axis=1, bitorder="little")
+    return bits[:, :num_cards].astype(np.float64)
+
+
+def _categories(engine: DeductionEngine) -> np.ndarray:
+    """categories x cards 0/1 matrix of the engine's card categories."""
+    key = (engine.num_cards, tuple(engine.categories))
+    rows = _CATEGORIES.get(key)
+    if rows is None:
+        rows = _CATEGORIES[key] = _rows(engine.categories, engine.num_cards)
+    return rows
+
+
+def knowledge_matrix(engine: DeductionEngine, owners) -> np.ndarray:
+    """
+    owners x cards probability that each owner holds each card. Known cards
+    are certain; a free card is shared between the owners that may hold it
+    in proportion to their open slots per open card (for the envelope: one
+    slot per category still unknown). An estimate, not solver.posterior.
+    """
+    k = len(owners)
+    bits = _rows([*[engine.has[o] for o in owners], *[engine.not_have[o] for o in owners]],
+                 engine.num_cards)
+    has = bits[:k]
+    possible = (1.0 - bits[k:]) * (1.0 - has.max(axis=0))
+
+    sizes = np.array([engine.hand_sizes.get(o, 0) for o in owners], dtype=np.float64)
+    scale = (sizes - has.sum(axis=1)) / np.maximum(possible.sum(axis=1), 1.0)
+    weight = possible * scale[:, None]
+    if ENVELOPE in owners:
+        i = owners.index(ENVELOPE)
+        cats = _categories(engine)
+        share = np.where(cats @ has[i] > 0, 1.0, 1.0 / np.maximum(cats @ possible[i], 1.0))
+        weight[i] = possible[i] * (share @ cats)
+
+    total = weight.sum(axis=0)
+    return weight / np.where(total > 0, total, 1.0) + has
+
+
+def _entropy(p: np.ndarray) -> np.ndarray:
+    """Elementwise -p log2 p, 0 at p = 0."""
+    return -p * np.log2(np.where(p > 0, p, 1.0))
+
+
+def _binary_entropy(x: np.ndarray) -> np.ndarray:
+    return _entropy(x) + _entropy(1.0 - x)
+
+
+def _category_entropy(envelope: np.ndarray, cats: np.ndarray):
+    """
+    Per card i: (entropy of its category's envelope distribution, entropy
+    of the rest of the category once i is ruled out). With those, the
+    category's entropy after i's envelope probability becomes x is
+    H(x) + (1 - x) * rest.
+    """
+    current = (cats @ _entropy(envelope)) @ cats
+    open_ = envelope < 1.0
+    rest = np.where(open_, (current - _binary_entropy(envelope)) / np.where(open_, 1.0 - envelope, 1.0), 0.0)
+    return current, rest
+
+
+def _candidates(room: int) -> np.ndarray:
+    """The three cards of every suggestion in room, rows in _PAIRS order."""
+    cards = _CANDIDATES.get(room)
+    if cards is None:
+        cards = _CANDIDATES[room] = np.column_stack([_PAIRS, np.full(len(_PAIRS), room)])
+    return cards
+
+
+def suggestion_scores(engine: DeductionEngine, me: int, room: int) -> np.ndarray:
+    """
+    Expected bits of envelope entropy removed by suggesting each (suspect,
+    weapon) in `room` (rows of _PAIRS). Opponents are asked clockwise from
+    `me` and the first that holds one of the cards refutes, showing one of
+    them (ruled out). Everyone asked before them passes, which makes the
+    three cards likelier to be in the envelope; if nobody refutes, every
+    suggested card the suggester does not hold is in the envelope.
+    """
+    players = list(engine.player_ids)
+    seat = players.index(me)
+    opponents = players[seat + 1:] + players[:seat]
+    probs = knowledge_matrix(engine, [*opponents, me, ENVELOPE])
+    envelope = probs[-1]
+    current, rest = _category_entropy(envelope, _categories(engine))
+
+    cards = _candidates(room)  # candidates x 3
+    num, opp = len(cards), len(opponents)
+    hold = probs[:opp].T[cards].transpose(0, 2, 1)  # candidates x opp x 3
+
+    refutes = 1.0 - np.prod(1.0 - hold, axis=2)  # opponent holds at least one
+    asked = np.ones((num, opp + 1))  # everyone before the opponent (last: everyone) passed
+    np.cumprod(1.0 - refutes, axis=1, out=asked[:, 1:])
+    first = refutes * asked[:, :-1]  # opponent is the refuter
+
+    # envelope probability of each card once the opponents before the
+    # refuter (and, in the last row, everyone) have passed
+    left = np.ones((num, opp + 1, 3))
+    np.cumsum(hold, axis=1, out=left[:, 1:])
+    left[:, 1:] = 1.0 - left[:, 1:]
+    x = np.divide(envelope[cards][:, None, :], left, out=np.zeros_like(left), where=left > 0)
+    np.clip(x, 0.0, 1.0, out=x)
+    rest_cards = rest[cards][:, None, :]
+    after = _binary_entropy(x) + (1.0 - x) * rest_cards  # cand x opp+1 x 3
+
+    # refuter k shows card t: t is ruled out, the other two keep the pass update
+    refuted = after[:, :-1]
+    shown = refuted.sum(axis=2, keepdims=True) - refuted + rest_cards
+    held = hold.sum(axis=2, keepdims=True)
+    which = np.divide(hold, held, out=np.zeros_like(hold), where=held > 0)
+    expected = (first * (which * shown).sum(axis=2)).sum(axis=1)
+    expected += asked[:, -1] * after[:, -1].sum(axis=1)
+    return current[cards].sum(axis=1) - expected
+
+
+def best_suggestion(engine: DeductionEngine, me: int, room: int) -> Tuple[int, int]:
+    """
+    (suspect, weapon) with the most expected information (cached), among
+    the pairs whose suspect and weapon may still be in the envelope:
+    probing with cards known to be elsewhere solved games more slowly.
+    The cache key is the facts alone: the scores do not read the clauses.
+    """
+    owners = engine.owners
+    key = (
+        me,
+        room,
+        tuple(engine.player_ids),
+        tuple([engine.hand_sizes[p] for p in engine.player_ids]),
+        tuple([engine.has[o] for o in owners]),
+        tuple([engine.not_have[o] for o in owners]),
+    )
+    hit = _CACHE.get(key)
+    if hit is not None:
+        cache_stats["hits"] += 1
+        _CACHE.move_to_end(key)
+        return hit
+    cache_stats["misses"] += 1
+
+    scores = suggestion_scores(engine, me, room)
+    candidates = _rows([engine.envelope_candidates()], engine.num_cards)[0]
+    open_pairs = candidates[_PAIRS[:, 0]] * candidates[_PAIRS[:, 1]]
+    if open_pairs.any():
+        scores = np.where(open_pairs > 0, scores, -np.inf)
+    suspect, weapon = _PAIRS[int(np.argmax(scores))]
+    result = _CACHE[key] = (int(suspect), int(weapon))
+    if len(_CACHE) > CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    return result
+
+
+def clear_cache() -> None:
+    _CACHE.clear()
+    cache_stats["hits"] = cache_stats["misses"] = 0
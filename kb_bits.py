@@ -0,0 +1,248 @@
+# kb_bits.py
+# Bitset-backed knowledge base: every card is a bit, every card set is an int
+
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, Optional
+
+from cards import (
+    CARD_NAMES,
+    CATEGORY_MASKS,
+    ROOM_MASK,
+    SUSPECT_MASK,
+    WEAPON_MASK,
+)
+from deduction import DeductionEngine, ENVELOPE, HAS
+from output import DEBUG, NULL, Output
+from players import Player, slotted
+from public_kb import PrivateKnowledge
+from solver import best_accusation
+
+
+def to_mask(cards: Iterable[int]) -> int:
+    mask = 0
+    for c in cards:
+        mask |= 1 << c
+    return mask
+
+
+def to_ids(mask: int) -> FrozenSet[int]:
+    ids = []
+    while mask:
+        low = mask & -mask
+        ids.append(low.bit_length() - 1)
+        mask ^= low
+    return frozenset(ids)
+
+
+def _lowest(mask: int) -> int:
+    """Id of the lowest set bit (card-list order)."""
+    return (mask & -mask).bit_length() - 1
+
+
+@slotted
+@dataclass
+class BitsetAIPlayer(Player):
+    """
+    Drop-in replacement for AIPlayer with the same record_* / should_accuse /
+    get_accusation API. The knowledge base is held as int bitmasks, so set
+    updates are single bitwise ops; deduction runs in the same
+    DeductionEngine, whose masks are used directly.
+    """
+
+    seen: int = 0
+
+    # player_id -> bitmask of refuted suggestion cards not disproven when
+    # recorded (known_may_have drops the ones ruled out since, as AIPlayer)
+    may_have: Dict[int, int] = field(default_factory=dict)
+
+    out: Output = field(default=NULL, repr=False, compare=False)  # [AI DEBUG] deductions
+
+    # incremental constraint propagation, created by initialize_kb (see engine)
+    _engine: Optional[DeductionEngine] = field(default=None, repr=False, compare=False)
+
+    # shared public knowledge, under a PrivateKnowledge engine (see AIPlayer)
+    public: Optional[object] = field(default=None, repr=False, compare=False)
+
+    # accuse once the best envelope triple reaches this probability
+    accuse_confidence: float = 1.0
+
+    # suggest by expected information gain (infogain.best_suggestion): fewer
+    # turns to solve, but headless games run about 3.5x slower
+    infogain: bool = False
+
+    # last snapshot_kb(), dropped whenever the knowledge changes
+    _kb_snapshot: Optional[tuple] = field(default=None, repr=False, compare=False)
+
+    # --- Shared public knowledge ------------------------------------------
+
+    @property
+    def engine(self) -> DeductionEngine:
+        """The deduction engine, caught up with the public knowledge first."""
+        self._sync()
+        return self._engine
+
+    def _sync(self):
+        if self.public is not None and self._engine.sync():
+            self._report_new_facts()
+
+    # --- Bitmask views ----------------------------------------------------
+
+    @property
+    def possible(self) -> int:
+        """Candidate solution cards, all categories."""
+        return self.engine.envelope_candidates()
+
+    @property
+    def not_have(self) -> Dict[int, int]:
+        return self.engine.not_have
+
+    @property
+    def has(self) -> Dict[int, int]:
+        return self.engine.has
+
+    # --- Card-id set views (same names as AIPlayer) ------------------------
+
+    @property
+    def possible_suspects(self) -> FrozenSet[int]:
+        return to_ids(self.possible & SUSPECT_MASK)
+
+    @property
+    def possible_weapons(self) -> FrozenSet[int]:
+        return to_ids(self.possible & WEAPON_MASK)
+
+    @property
+    def possible_rooms(self) -> FrozenSet[int]:
+        return to_ids(self.possible & ROOM_MASK)
+
+    @property
+    def seen_cards(self) -> FrozenSet[int]:
+        return to_ids(self.seen)
+
+    @property
+    def known_may_have(self) -> Dict[int, FrozenSet[int]]:
+        """player_id -> cards they MAY have (from refutations)."""
+        not_have = self.engine.not_have
+        may_have = dict(self.may_have)
+        if self.public is not None:
+            for p, m in self.public.may_have.items():
+                may_have[p] = may_have.get(p, 0) | m
+        return {p: to_ids(m & ~not_have[p]) for p, m in may_have.items()}
+
+    def initialize_kb(self, all_suspects, all_weapons, all_rooms, all_players, public=None):
+        """Initialize what the AI knows at the start (see AIPlayer.initialize_kb)."""
+        for p in all_players:
+            self.may_have[p.id] = 0
+
+        num_cards = len(all_suspects) + len(all_weapons) + len(all_rooms)
+        if public is not None:
+            self._engine = PrivateKnowledge(public)
+        else:
+            self._engine = DeductionEngine.for_deal([p.id for p in all_players], num_cards)
+        self.public = public
+        for card in self.hand:
+            self._engine.add_has(self.id, card.id)
+        self._report_new_facts()
+
+    # --- Basic Recording ------------------------------------------------------
+
+    def record_seen_card(self, card: int):
+        """AI sees a card directly, remove from solution sets."""
+        self.seen |= 1 << card
+        self._engine.add_not_have(ENVELOPE, card)
+        self._report_new_facts()
+
+    def record_player_cannot_have(self, player_id: int, card: int):
+        """Record that a player does NOT have a given card."""
+        self._engine.add_not_have(player_id, card)
+        self._report_new_facts()
+
+    def record_player_has_none(self, player_id: int, card_list):
+        """Record that a player could not refute: they hold none of these cards."""
+        self._engine.add_none_of(player_id, to_mask(card_list))
+        self._report_new_facts()
+
+    def record_player_may_have(self, player_id: int, card_list):
+        """Record that a player has AT LEAST ONE of these cards."""
+        mask = to_mask(card_list)
+        self.may_have[player_id] |= mask & ~self._engine.not_have[player_id]
+        self._engine.add_at_least_one(player_id, mask)
+        self._report_new_facts()
+
+    def record_player_has(self, player_id: int, card: int):
+        """If AI learns EXACTLY which card a player has."""
+        self._engine.add_has(player_id, card)
+        self._report_new_facts()
+
+    def record_shown_card(self, player_id: int, card: int):
+        """A player showed this AI a card: seen, and held by that player."""
+        self.record_seen_card(card)
+        self.record_player_has(player_id, card)
+
+    # --- Deduction Helpers ---------------------------------------------------
+
+    def _report_new_facts(self):
+        self._kb_snapshot = None
+        if not self.out.enabled(DEBUG):
+            # the masks are the knowledge: nothing to copy, only to drop
+            self._engine.new_facts.clear()
+            return
+        for kind, owner, card in self._engine.drain_new_facts():
+            if owner == ENVELOPE and kind == HAS:
+                self.out.debug("[AI DEBUG] AI infers: %s MUST be in the solution.", CARD_NAMES[card])
+
+    # --- Snapshots ------------------------------------------------------------
+
+    def snapshot_kb(self) -> tuple:
+        """Immutable copy of the knowledge base (see AIPlayer.snapshot_kb)."""
+        engine = self.engine
+        base = self.public.snapshot() if self.public is not None else None
+        snap = self._kb_snapshot
+        if snap is None or snap[-2] is not base:
+            snap = self._kb_snapshot = (
+                self.seen, tuple(self.may_have.items()), base, engine.snapshot()
+            )
+        return snap
+
+    def restore_kb(self, snap: tuple) -> None:
+        """Return to a snapshot_kb(); free if nothing was recorded since."""
+        if snap is self._kb_snapshot:
+            return
+        self.seen, may_have, base, engine = snap
+        self.may_have = dict(may_have)
+        self._engine.restore(engine)
+        self._kb_snapshot = snap
+
+    # --- AI Decision Making ---------------------------------------------------
+
+    def choose_suggestion(self, current_room):
+        """First remaining suspect & weapon, or by infogain (see AIPlayer)."""
+        if self.infogain:
+            from infogain import best_suggestion
+
+            suspect, weapon = best_suggestion(self.engine, self.id, current_room)
+            return suspect, weapon, current_room
+        possible = self.possible
+        return _lowest(possible & SUSPECT_MASK), _lowest(possible & WEAPON_MASK), current_room
+
+    def _certain(self) -> bool:
+        return all(_is_single(self.possible & cat) for cat in CATEGORY_MASKS)
+
+    def should_accuse(self):
+        """AI accuses when certain, or at accuse_confidence (see AIPlayer)."""
+        if self._certain() or self.accuse_confidence >= 1.0:
+            return self._certain()
+        return best_accusation(self.engine, self.accuse_confidence)[1] >= self.accuse_confidence
+
+    def get_accusation(self):
+        """Return the AI's accusation tuple."""
+        if self.accuse_confidence < 1.0 and not self._certain():
+            return best_accusation(self.engine, self.accuse_confidence)[0]
+        return (
+            _lowest(self.possible & SUSPECT_MASK),
+            _lowest(self.possible & WEAPON_MASK),
+            _lowest(self.possible & ROOM_MASK),
+        )
+
+
+def _is_single(mask: int) -> bool:
+    return mask != 0 and mask & (mask - 1) == 0
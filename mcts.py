@@ -0,0 +1,518 @@
+# mcts.py
+# Monte Carlo Tree Search AI: plans each turn over sampled hidden hands
+
+import atexit
+import itertools
+import math
+import multiprocessing
+import random
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from agents import AIAgent
+from cards import ROOM_IDS, CHARACTER_IDS, WEAPON_IDS, room_card
+from game import CluedoGame
+from kb_bits import BitsetAIPlayer
+from players import AIPlayer, slotted
+from sampler import HandSampler
+from state import GameState
+
+# Decision keys in the search tree. A node's children are grouped by the
+# decision that was asked next, so the branch under ("dest", destinations)
+# doubles as the chance node for a dice roll.
+PASSAGE = ("passage",)
+
+# all suspect x weapon x room triples; the value scale for knowledge
+_ALL_TRIPLES = math.log(len(CHARACTER_IDS) * len(WEAPON_IDS) * len(ROOM_IDS))
+
+
+@slotted
+@dataclass
+class MCTSPlayer(AIPlayer):
+    """
+    AIPlayer whose movement is planned by MCTSAgent: secret passage or
+    dice, then where to go, which decides whether and where it suggests.
+    The knowledge base, suggestions and accusations are AIPlayer's.
+    """
+
+    budget: float = 0.05  # wall-clock seconds per decision
+    iterations: Optional[int] = None  # cap per decision; fixed cap = reproducible
+    workers: int = 1  # root-parallel search processes
+    horizon: int = 6  # turns simulated after the one being planned
+    exploration: float = 0.1  # UCB1 constant (values are win = 1, loss = 0)
+    bias: float = 0.1  # progressive bias towards AIAgent's choice in the tree
+    evidence: float = 2.0  # standard errors a move must beat AIAgent's choice by
+    search_seed: int = 0
+
+
+@dataclass
+class SearchStats:
+    """What the search cost, summed over decisions (and games)."""
+
+    decisions: int = 0
+    iterations: int = 0
+    seconds: float = 0.0
+
+    @property
+    def decisions_per_sec(self) -> float:
+        return self.decisions / self.seconds if self.seconds else 0.0
+
+    @property
+    def iterations_per_decision(self) -> float:
+        return self.iterations / self.decisions if self.decisions else 0.0
+
+    def add(self, other: "SearchStats") -> None:
+        self.decisions += other.decisions
+        self.iterations += other.iterations
+        self.seconds += other.seconds
+
+
+@dataclass
+class _Node:
+    visits: int = 0
+    value: float = 0.0
+    # decision key -> action -> child
+    branches: Dict[tuple, Dict[object, "_Node"]] = field(default_factory=dict)
+
+
+# --- Determinization -------------------------------------------------------
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+# deals drawn per decision; searches draw their worlds from these
+DEALS = 200
+
+# per-process sampler; its buffers are reused between decisions
+_SAMPLER: Optional[HandSampler] = None
+
+
+def _worlds(player: AIPlayer, seed) -> tuple:
+    """
+    Hidden-hand deals consistent with what a seat knows, from
+    sampler.HandSampler: (hands, cumulative weights), hands as card masks
+    in seat order. Drawing with the cumulative importance weights
+    (random.choices) gives deals from the exact posterior.
+    """
+    global _SAMPLER
+    if _SAMPLER is None:
+        _SAMPLER = HandSampler(batch_size=DEALS)
+    _SAMPLER.rng = np.random.default_rng(random.Random(str(seed)).getrandbits(64))
+    hands, weights = _SAMPLER.deals(player.engine, DEALS)
+    return tuple(hands), tuple(itertools.accumulate(weights))
+
+
+# --- Simulation --------------------------------------------------------------
+
+
+class _SimGame(CluedoGame):
+    """Headless copy of a game used for rollouts; moves can be forced."""
+
+    forced_moves: Optional[Tuple[int, ...]] = None
+
+    def available_moves_for_player(self, player, roll):
+        if self.forced_moves is not None:
+            moves, self.forced_moves = self.forced_moves, None
+            return moves
+        return super().available_moves_for_player(player, roll)
+
+
+class _TreeAgent(AIAgent):
+    """
+    Plays the searching seat inside a rollout. During the planned turn its
+    decisions walk the tree (UCB1, expanding one node per rollout); after
+    that, and once it leaves the tree, it plays like AIAgent.
+    """
+
+    def __init__(self, rng: random.Random, exploration: float, bias: float):
+        self.rng = rng
+        self.exploration = exploration
+        self.bias = bias
+        self.active = False
+        self.node: Optional[_Node] = None
+        self.path: List[_Node] = []
+        self.expanded = False
+        self.forced = None  # action to take at the root this rollout
+        self.roll_only = False  # the passage was already declined
+
+    def start(self, root: _Node, action) -> None:
+        self.active, self.node, self.path, self.expanded = True, root, [root], False
+        self.forced = action
+
+    def _select(self, key: tuple, actions: Sequence, default):
+        """
+        Tree action for a decision, or None to play the default policy.
+        The default policy's own choice is expanded first.
+        """
+        if not self.active or self.expanded:
+            return None
+        branch = self.node.branches.setdefault(key, {})
+        if self.forced is not None:
+            action, self.forced = self.forced, None
+            child = branch.get(action) or branch.setdefault(action, _Node())
+            self.node = child
+            self.path.append(child)
+            return action
+        untried = [a for a in actions if a not in branch]
+        if untried:
+            action = default if default in untried else self.rng.choice(untried)
+            child = branch[action] = _Node()
+            self.expanded = True
+        else:
+            log_total = math.log(sum(branch[a].visits for a in actions))
+            c, bias = self.exploration, self.bias
+
+            def ucb(a):
+                n = branch[a].visits
+                score = branch[a].value / n + c * math.sqrt(log_total / n)
+                # progressive bias: deviating from AIAgent takes evidence
+                return score + bias / n if a == default else score
+
+            action = max(actions, key=ucb)
+            child = branch[action]
+        self.node = child
+        self.path.append(child)
+        return action
+
+    def choose_action(self, game, player):
+        # the real game has already decided not to accuse this turn
+        return "M" if self.active else super().choose_action(game, player)
+
+    def use_secret_passage(self, game, player):
+        if self.active and self.roll_only:
+            return False
+        default = super().use_secret_passage(game, player)
+        action = self._select(PASSAGE, (True, False), default)
+        return default if action is None else action
+
+    def choose_destination(self, game, player, destinations):
+        default = super().choose_destination(game, player, destinations)
+        moves = _worth_searching(destinations, default)
+        if len(moves) == 1:
+            return default
+        action = self._select(("dest", tuple(destinations)), moves, default)
+        return default if action is None else action
+
+
+def _worth_searching(destinations, default) -> Tuple[int, ...]:
+    """
+    The moves the tree compares: every reachable room, plus AIAgent's pick.
+    Only rooms lead to a suggestion, and a handful of rollouts cannot tell
+    dozens of corridor squares apart.
+    """
+    rooms = [d for d in destinations if room_card(d) is not None]
+    return tuple(rooms) if default in rooms else (default, *rooms)
+
+
+def _knowledge(player) -> float:
+    """
+    0..1: how far a seat is from certainty, by envelope triples left and
+    by cards it has placed (which is what resolves "at least one" clauses).
+    """
+    engine = player.engine
+    candidates = engine.envelope_candidates()
+    left = 1
+    for cat in engine.categories:
+        left *= _popcount(candidates & cat) or 1
+    placed = 0
+    for mask in engine.has.values():
+        placed |= mask
+    return (
+        0.7 * (1.0 - math.log(left) / _ALL_TRIPLES)
+        + 0.3 * _popcount(placed) / engine.num_cards
+    )
+
+
+def _evaluate(sim: CluedoGame, seat: int) -> float:
+    """
+    1 for a win, 0 for a loss; otherwise 0.5 plus half the lead in
+    _knowledge over the best-informed opponent.
+    """
+    me = sim.players[seat]
+    if sim.game_over:
+        return 1.0 if sim.winner is me else 0.0
+    if me.eliminated:
+        return 0.0
+    best = max(
+        (_knowledge(p) for p in sim.players if p is not me and not p.eliminated),
+        default=0.0,
+    )
+    return 0.5 + 0.5 * (_knowledge(me) - best)
+
+
+# per-process simulation games, keyed by _config()
+_SIMS: Dict[tuple, "_Sim"] = {}
+
+# bound on each simulation's cache of opponents' starting knowledge
+_KB_CACHE_SIZE = 50_000
+
+
+def _config(game: CluedoGame) -> tuple:
+    """What a simulation copy of a game needs besides its GameState."""
+    classes = tuple(
+        BitsetAIPlayer if isinstance(p, BitsetAIPlayer) else AIPlayer for p in game.players
+    )
+    confidence = tuple(getattr(p, "accuse_confidence", 1.0) for p in game.players)
+    infogain = tuple(getattr(p, "infogain", False) for p in game.players)
+    return len(game.players), classes, type(game.board), game.max_turns, confidence, infogain
+
+
+class _Sim:
+    """
+    A simulation game plus the knowledge its other seats start a rollout
+    with. Opponents' real knowledge bases are private and describe the real
+    deal, so in a rollout every other seat knows only its sampled hand.
+    """
+
+    def __init__(self, config: tuple):
+        num_players, classes, board_class, max_turns, confidence, infogain = config
+        self.game = _SimGame(
+            num_players=num_players,
+            ai_seats=range(num_players),
+            agents=[AIAgent() for _ in range(num_players)],
+            verbose=False,
+            max_turns=max_turns,
+            seed=0,
+            board_class=board_class,
+            seat_classes=dict(enumerate(classes)),
+            shared_kb=False,  # seats restart from unrelated knowledge every rollout
+        )
+        self.blank = []
+        for p, c, gain in zip(self.game.players, confidence, infogain):
+            p.accuse_confidence = c
+            p.infogain = gain
+            p.hand = []
+            p.initialize_kb(CHARACTER_IDS, WEAPON_IDS, ROOM_IDS, self.game.players)
+            self.blank.append(p.snapshot_kb())
+        self.game._deal_masks(self.game.hand_masks)  # hands were emptied above
+        self._hand_kbs: Dict[Tuple[int, int], tuple] = {}
+
+    def hand_kb(self, seat: int, hand: int) -> tuple:
+        """Knowledge snapshot of a seat that knows only its own hand."""
+        key = (seat, hand)
+        snap = self._hand_kbs.get(key)
+        if snap is None:
+            if len(self._hand_kbs) >= _KB_CACHE_SIZE:
+                self._hand_kbs.clear()
+            p = self.game.players[seat]
+            p.restore_kb(self.blank[seat])
+            mask = hand
+            while mask:
+                low = mask & -mask
+                p.record_player_has(p.id, low.bit_length() - 1)
+                mask ^= low
+            snap = self._hand_kbs[key] = p.snapshot_kb()
+        return snap
+
+
+def _sim_for(config: tuple) -> _Sim:
+    sim = _SIMS.get(config)
+    if sim is None:
+        sim = _SIMS[config] = _Sim(config)
+    return sim
+
+
+def _search(
+    config: tuple,
+    state: GameState,
+    seat: int,
+    worlds: tuple,
+    phase: str,
+    dests: Optional[Tuple[int, ...]],
+    actions: tuple,
+    default,
+    player: dict,
+    seed,
+) -> Tuple[Dict[object, Tuple[int, float, float]], int]:
+    """
+    Run one search (one worker's share). phase is "move" (secret passage
+    or dice) or "dest" (choose among dests, after the dice); worlds is
+    _worlds() for the searching seat.
+
+    Every sampled world (hidden hands and dice) is played once under each
+    root action, so root actions are compared on common random numbers;
+    below the root the tree is grown with UCB1. Returns, per root action,
+    (worlds, sum, sum of squares) of its value minus the default action's
+    in the same world, plus the number of rollouts.
+    """
+    cache = _sim_for(config)
+    sim = cache.game
+    rng = random.Random(seed)
+    sim.rng = random.Random(rng.random())
+    tree = _TreeAgent(rng, player["exploration"], player["bias"])
+    tree.roll_only = phase == "dest"
+    agents = list(sim.agents)
+    agents[seat] = tree
+    sim.agents = agents
+
+    root = _Node()
+    diffs = dict.fromkeys(actions, (0, 0.0, 0.0))
+    deadline = time.perf_counter() + player["budget"]
+    cap = player["iterations"]
+    done = 0
+    world_time = 0.0  # how long the last world took, to stop within budget
+    while (done < cap) if cap is not None else (
+        time.perf_counter() + world_time < deadline or not done
+    ):
+        world_start = time.perf_counter()
+        if not worlds[0]:
+            break
+        hands = rng.choices(*worlds)[0]
+        knowledge = tuple(
+            state.knowledge[s] if s == seat else cache.hand_kb(s, hand)
+            for s, hand in enumerate(hands)
+        )
+        world = state._replace(hands=hands, knowledge=knowledge)
+        dice = rng.random()
+        values = {}
+        for action in actions:
+            sim.restore(world)
+            sim.rng.seed(dice)
+            tree.start(root, action)
+            sim.forced_moves = dests
+            sim.play_turn()
+            tree.active = False
+            for _ in range(player["horizon"]):
+                if sim.game_over:
+                    break
+                sim.play_turn()
+            value = values[action] = _evaluate(sim, seat)
+            for node in tree.path:
+                node.visits += 1
+                node.value += value
+            done += 1
+        for action, value in values.items():
+            gain = value - values[default]
+            n, total, squares = diffs[action]
+            diffs[action] = (n + 1, total + gain, squares + gain * gain)
+        world_time = time.perf_counter() - world_start
+    return diffs, done
+
+
+def _search_job(args):
+    return _search(*args)
+
+
+# worker count -> pool of search processes, shared by every MCTSAgent
+_POOLS: Dict[int, "multiprocessing.pool.Pool"] = {}
+
+
+def _pool(workers: int):
+    pool = _POOLS.get(workers)
+    if pool is None:
+        pool = _POOLS[workers] = multiprocessing.Pool(workers)
+    return pool
+
+
+def close_pools() -> None:
+    """Stop the search worker processes; the next search starts new ones."""
+    while _POOLS:
+        _, pool = _POOLS.popitem()
+        pool.close()
+        pool.join()
+
+
+atexit.register(close_pools)
+
+
+def mcts_seats(seats, **options) -> Dict[int, type]:
+    """seat_classes entry for each seat, e.g. mcts_seats([0], budget=0.1)."""
+    return {seat: partial(MCTSPlayer, **options) for seat in seats}
+
+
+class MCTSAgent(AIAgent):
+    """
+    Decisions for an MCTSPlayer. Each movement decision runs a search from
+    the current state: every rollout re-deals the hidden hands consistently
+    with the player's knowledge, plays the rest of this turn from the tree
+    and `horizon` more turns with AIAgent, and scores the result with
+    _evaluate. AIAgent's own move is kept unless another beats it by
+    `evidence` standard errors over the same sampled worlds; most rollout
+    differences are noise. Suggestions are left to AIAgent: picking them by
+    search loses to its focused choice, whose payoff (clauses resolving
+    over many turns) is beyond the rollout horizon.
+
+    With workers > 1 the searches run in parallel processes (root
+    parallelism) and their per-world statistics are summed. Workers are not started
+    from inside a daemon process (e.g. a tournament worker); the search then
+    runs in-process.
+    """
+
+    def __init__(self):
+        self.stats = SearchStats()
+
+    def _decide(self, game, player: MCTSPlayer, phase: str, actions: tuple, default,
+                dests=None):
+        """
+        Search the root actions and return AIAgent's choice (default) unless
+        another one beats it, world for world, by `evidence` standard errors.
+        """
+        start = time.perf_counter()
+        seat = game.players.index(player)
+        seed = (player.search_seed, seat, game.turn_count, phase)
+        worlds = _worlds(player, seed)
+        settings = {
+            # sampling the deals comes out of the decision's budget
+            "budget": player.budget - (time.perf_counter() - start),
+            "iterations": player.iterations,
+            "exploration": player.exploration,
+            "bias": player.bias,
+            "horizon": player.horizon,
+        }
+        base = (
+            _config(game),
+            game.snapshot(),
+            seat,
+            worlds,
+            phase,
+            dests,
+            actions,
+            default,
+            settings,
+        )
+        workers = player.workers
+        if workers > 1 and not multiprocessing.current_process().daemon:
+            jobs = [(*base, f"{seed}:{w}") for w in range(workers)]
+            results = _pool(workers).map(_search_job, jobs)
+        else:
+            results = [_search(*base, str(seed))]
+
+        worlds = dict.fromkeys(actions, 0)
+        total = dict.fromkeys(actions, 0.0)
+        squares = dict.fromkeys(actions, 0.0)
+        for diffs, done in results:
+            self.stats.iterations += done
+            for action, (n, t, sq) in diffs.items():
+                worlds[action] += n
+                total[action] += t
+                squares[action] += sq
+        self.stats.decisions += 1
+        self.stats.seconds += time.perf_counter() - start
+
+        best, best_gain = default, 0.0
+        for action in actions:
+            n = worlds[action]
+            if action == default or n < 2:
+                continue
+            gain = total[action] / n
+            spread = max(squares[action] / n - gain * gain, 0.0)
+            if gain > best_gain and gain > player.evidence * math.sqrt(spread / (n - 1)):
+                best, best_gain = action, gain
+        return best
+
+    def use_secret_passage(self, game, player):
+        default = super().use_secret_passage(game, player)
+        return self._decide(game, player, "move", (True, False), default)
+
+    def choose_destination(self, game, player, destinations):
+        default = super().choose_destination(game, player, destinations)
+        moves = _worth_searching(destinations, default)
+        if len(moves) == 1:
+            return default
+        return self._decide(game, player, "dest", moves, default, tuple(destinations))
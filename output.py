@@ -0,0 +1,109 @@
+# output.py
+# Leveled output: sinks subscribe, and nothing is formatted unless one listens
+
+from typing import List, Tuple
+
+DEBUG = 10  # AI deductions and the card shown (spoils the game for humans)
+INFO = 20  # turn-by-turn narration
+SILENT = 100  # above every level: receives nothing
+
+
+class Sink:
+    """Receives the messages at or above its level, already formatted."""
+
+    level: int = INFO
+
+    def write(self, level: int, text: str) -> None:
+        raise NotImplementedError
+
+
+class ConsoleSink(Sink):
+    """Prints to stdout."""
+
+    def __init__(self, level: int = DEBUG):
+        self.level = level
+
+    def write(self, level, text):
+        print(text)
+
+
+class ListSink(Sink):
+    """Keeps (level, text) pairs, e.g. to send to a remote client or check in tests."""
+
+    def __init__(self, level: int = INFO):
+        self.level = level
+        self.messages: List[Tuple[int, str]] = []
+
+    def write(self, level, text):
+        self.messages.append((level, text))
+
+    def lines(self) -> List[str]:
+        return [text for _, text in self.messages]
+
+
+class Output:
+    """
+    Where a game's messages go. Messages are %-style templates plus
+    arguments, formatted only if some sink wants their level; guard loops
+    that build several messages with enabled().
+    """
+
+    def __init__(self, *sinks: Sink):
+        self.sinks: List[Sink] = list(sinks)
+        self._update()
+
+    def _update(self) -> None:
+        # lowest level anyone wants; emit() compares against this one int
+        self.level = min((s.level for s in self.sinks), default=SILENT)
+
+    def subscribe(self, sink: Sink) -> None:
+        self.sinks.append(sink)
+        self._update()
+
+    def unsubscribe(self, sink: Sink) -> None:
+        self.sinks.remove(sink)
+        self._update()
+
+    def enabled(self, level: int) -> bool:
+        return level >= self.level
+
+    def emit(self, level: int, message: str = "", *args) -> None:
+        if level < self.level:
+            return
+        text = message % args if args else message
+        for sink in self.sinks:
+            if level >= sink.level:
+                sink.write(level, text)
+
+    def debug(self, message: str = "", *args) -> None:
+        self.emit(DEBUG, message, *args)
+
+    def info(self, message: str = "", *args) -> None:
+        self.emit(INFO, message, *args)
+
+
+class NullOutput(Output):
+    """Output for batch runs: no sinks, and no way to add one."""
+
+    def __init__(self):
+        super().__init__()
+
+    def subscribe(self, sink):
+        raise TypeError("NullOutput takes no sinks; use Output() instead.")
+
+    def emit(self, level, message="", *args):
+        pass
+
+    def debug(self, message="", *args):
+        pass
+
+    def info(self, message="", *args):
+        pass
+
+
+NULL = NullOutput()
+
+
+def console(level: int = DEBUG) -> Output:
+    """Output printed to stdout (what verbose=True used to do)."""
+    return Output(ConsoleSink(level))
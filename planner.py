@@ -0,0 +1,179 @@
+# planner.py
+# Distance-aware movement: score every reachable destination by room value and turns to the next room
+
+from collections import OrderedDict
+from operator import mul
+from typing import Dict, Sequence, Tuple
+
+from board import MAX_ROLL, PROBABILITY_TURNS
+from cards import room_card
+from deduction import DeductionEngine, ENVELOPE
+
+# what a suggestion in a room is worth to the suggester
+OPEN = 1.0  # the room may still be the murder room
+PROBE = 0.6  # known to the suggester alone (its own card, or the solved room):
+# nobody can show it, so a refutation is about the suspect or the weapon
+SHOWN = 0.3  # held by an opponent, who may show it instead of another card
+
+DISCOUNT = 0.5  # value of a room one turn later, relative to now
+MEAN_ROLL = (MAX_ROLL + 1) / 2
+
+_VALUES: "OrderedDict[tuple, Tuple[float, ...]]" = OrderedDict()
+CACHE_SIZE = 4096
+cache_stats = {"hits": 0, "misses": 0}
+
+# id(board._reachable) -> (its layout's tables, kept so the id stays theirs)
+_LAYOUTS: Dict[int, "_Layout"] = {}
+
+
+class _Layout:
+    """
+    Per board layout: the expected turns from each position to each room,
+    and for each tuple of room values the best follow-up from each position
+    and the expected score of rolling there. All fill in as positions are
+    asked about.
+    """
+
+    __slots__ = ("board", "reachable", "turns", "discounts", "follow_ups", "rolls")
+
+    def __init__(self, board):
+        self.board = board
+        self.reachable = board._reachable
+        self.turns: Dict[int, Tuple[float, ...]] = {}
+        self.discounts: Dict[int, Tuple[float, ...]] = {}  # DISCOUNT ** turns, 0 here
+        self.follow_ups: "OrderedDict[tuple, Dict[int, float]]" = OrderedDict()
+        self.rolls: "OrderedDict[tuple, Dict[int, float]]" = OrderedDict()
+
+    def turns_to_rooms(self, position: int) -> Tuple[float, ...]:
+        """
+        Expected turns from position into each room (board.rooms order),
+        sum over t of P(not there within t turns), from the board's 1d6
+        reach probabilities; past PROBABILITY_TURNS the rest of the
+        distance is covered at the mean roll. 0 for the room itself.
+        """
+        turns = self.turns.get(position)
+        if turns is None:
+            board = self.board
+            reach = [board.reach_probabilities(position, t) for t in range(1, PROBABILITY_TURNS + 1)]
+            turns = []
+            for room in board.rooms:
+                if room == position:
+                    turns.append(0.0)
+                    continue
+                expected = 1.0 + sum(1.0 - r[room] for r in reach[:-1])
+                tail = max(1.0, board.distance(position, room) / MEAN_ROLL - PROBABILITY_TURNS)
+                turns.append(expected + (1.0 - reach[-1][room]) * tail)
+            turns = self.turns[position] = tuple(turns)
+        return turns
+
+    def follow_up(self, values: Tuple[float, ...], position: int) -> float:
+        """Best discounted room value from position on later turns."""
+        scores = _entry(self.follow_ups, values)
+        score = scores.get(position)
+        if score is None:
+            discounts = self.discounts.get(position)
+            if discounts is None:
+                discounts = self.discounts[position] = tuple(
+                    DISCOUNT ** t if t else 0.0 for t in self.turns_to_rooms(position)
+                )
+            score = scores[position] = max(map(mul, values, discounts))
+        return score
+
+
+def _entry(cache: OrderedDict, values: Tuple[float, ...]) -> Dict[int, float]:
+    """cache's position -> score table for these room values."""
+    scores = cache.get(values)
+    if scores is None:
+        scores = cache[values] = {}
+        if len(cache) > CACHE_SIZE:
+            cache.popitem(last=False)
+    return scores
+
+
+def _layout(board) -> _Layout:
+    layout = _LAYOUTS.get(id(board._reachable))
+    if layout is None:
+        layout = _LAYOUTS[id(board._reachable)] = _Layout(board)
+    return layout
+
+
+def room_values(engine: DeductionEngine, me: int, rooms: Sequence[int]) -> Tuple[float, ...]:
+    """
+    Suggestion value of each room position (cached per what the AI knows
+    about the room cards, so a change of knowledge means a new entry).
+    """
+    room_mask = 0
+    for pos in rooms:
+        room_mask |= 1 << room_card(pos)
+    candidates = engine.envelope_candidates() & room_mask
+    key = (tuple(rooms), candidates, engine.has[me] & room_mask)
+    hit = _VALUES.get(key)
+    if hit is not None:
+        cache_stats["hits"] += 1
+        return hit
+    cache_stats["misses"] += 1
+
+    solved = candidates & (candidates - 1) == 0
+    values = []
+    for pos in rooms:
+        bit = 1 << room_card(pos)
+        if candidates & bit:
+            values.append(PROBE if solved else OPEN)
+        elif engine.has[me] & bit or engine.has[ENVELOPE] & bit:
+            values.append(PROBE)
+        else:
+            values.append(SHOWN)
+    result = _VALUES[key] = tuple(values)
+    if len(_VALUES) > CACHE_SIZE:
+        _VALUES.popitem(last=False)
+    return result
+
+
+class MovePlan:
+    """
+    One AI's view of the board for a turn: room values from its knowledge
+    and the board layout's cached turn estimates.
+    """
+
+    __slots__ = ("board", "layout", "values", "_room_value")
+
+    def __init__(self, board, engine: DeductionEngine, me: int):
+        self.board = board
+        self.layout = _layout(board)
+        self.values = room_values(engine, me, board.rooms)
+        self._room_value = dict(zip(board.rooms, self.values))
+
+    def score(self, position: int) -> float:
+        """A suggestion here now (rooms only) plus the best room after it."""
+        return self._room_value.get(position, 0.0) + self.layout.follow_up(self.values, position)
+
+    def best(self, destinations: Sequence[int]) -> int:
+        """Highest-scoring destination; the first in order on ties."""
+        return max(destinations, key=self.score)
+
+    def roll_value(self, position: int) -> float:
+        """
+        Expected score of rolling 1d6 at position and moving as best(),
+        on an empty board (cached with the follow-ups).
+        """
+        rolls = _entry(self.layout.rolls, self.values)
+        value = rolls.get(position)
+        if value is None:
+            total = 0.0
+            for roll in range(1, MAX_ROLL + 1):
+                moves = self.board.moves(position, roll)
+                if moves:
+                    total += max(map(self.score, moves))
+            value = rolls[position] = total / MAX_ROLL
+        return value
+
+
+def plan(game, player) -> MovePlan:
+    """The MovePlan for an AI seat in game."""
+    return MovePlan(game.board, player.engine, player.id)
+
+
+def clear_cache() -> None:
+    _VALUES.clear()
+    _LAYOUTS.clear()
+    cache_stats["hits"] = cache_stats["misses"] = 0
@@ -1,17 +1,41 @@
 # players.py
 # Player and weapon token data
 
-from dataclasses import dataclass, field
-from typing import List
+from dataclasses import dataclass, field, fields
+from typing import Dict, FrozenSet, Iterable, List, Optional
 from cards import Card
-from cards import CHARACTER_NAMES
-
-
+from cards import CHARACTER_NAMES, start_name
+from cards import CARD_INDEX, CARD_NAMES, position_id, position_name
+from deduction import DeductionEngine, ENVELOPE, HAS
+from output import NULL, Output
+from public_kb import PrivateKnowledge
+from solver import best_accusation
+
+
+def slotted(cls):
+    """
+    Rebuild a dataclass with __slots__ for its own fields, as
+    dataclass(slots=True) does on Python 3.10+: no per-instance __dict__.
+    Apply it above @dataclass. Methods must not use zero-argument super()
+    (it would refer to the class before the rebuild).
+    """
+    inherited = {name for base in cls.__mro__[1:] for name in getattr(base, "__slots__", ())}
+    names = tuple(f.name for f in fields(cls) if f.name not in inherited)
+    body = {k: v for k, v in cls.__dict__.items() if k not in names}
+    body.pop("__dict__", None)
+    body.pop("__weakref__", None)
+    body["__slots__"] = names
+    rebuilt = type(cls)(cls.__name__, cls.__bases__, body)
+    rebuilt.__qualname__ = cls.__qualname__
+    return rebuilt
+
+
+@slotted
 @dataclass
 class Player:
     id: int
     character_name: str
-    position: str
+    position: int  # board position id (cards.position_id)
     hand: List[Card] = field(default_factory=list)
 
     
@@ -22,69 +46,159 @@ class Player:
     def name(self):
         return self.character_name
 
+    @property
+    def character_id(self) -> int:
+        """Card id of this player's character."""
+        return CARD_INDEX[self.character_name]
+
 
     def __str__(self):
         status = "(ELIMINATED)" if self.eliminated else ""
-        return f"Player {self.id} ({self.character_name}) at {self.position} {status}"
+        return f"Player {self.id} ({self.character_name}) at {position_name(self.position)} {status}"
 
+@slotted
 @dataclass
 class AIPlayer(Player):
 
-    # Knowledge Base Fields
-    possible_suspects: set = field(default_factory=set)
-    possible_weapons: set = field(default_factory=set)
-    possible_rooms: set = field(default_factory=set)
+    # Knowledge Base Fields (sets of card ids; read through possible_*)
+    _possible_suspects: set = field(default_factory=set)
+    _possible_weapons: set = field(default_factory=set)
+    _possible_rooms: set = field(default_factory=set)
 
     seen_cards: set = field(default_factory=set)
 
-    # player_id -> set of cards they cannot possibly have
-    known_not_have: dict = field(default_factory=dict)
+    # player_id -> bitmask of refuted suggestion cards not disproven when
+    # recorded (known_may_have drops the ones ruled out since)
+    may_have: Dict[int, int] = field(default_factory=dict)
 
-    # player_id -> set of cards they MAY have (from refutations)
-    known_may_have: dict = field(default_factory=dict)
+    out: Output = field(default=NULL, repr=False, compare=False)  # [AI DEBUG] deductions
 
-    # player_id -> confirmed card they DO have
-    known_has: dict = field(default_factory=dict)
+    # incremental constraint propagation, created by initialize_kb (see engine)
+    _engine: Optional[DeductionEngine] = field(default=None, repr=False, compare=False)
 
+    # the game's shared public_kb.PublicKnowledge, if the AI layers on one
+    public: Optional[object] = field(default=None, repr=False, compare=False)
 
-    def initialize_kb(self, all_suspects, all_weapons, all_rooms, all_players):
-        """Initialize what the AI knows at the start."""
-        self.possible_suspects = set(all_suspects)
-        self.possible_weapons = set(all_weapons)
-        self.possible_rooms = set(all_rooms)
+    # accuse once the best envelope triple reaches this probability
+    accuse_confidence: float = 1.0
+
+    # suggest by expected information gain (infogain.best_suggestion): fewer
+    # turns to solve, but headless games run about 3.5x slower
+    infogain: bool = False
+
+    # last snapshot_kb(), dropped whenever the knowledge changes
+    _kb_snapshot: Optional[tuple] = field(default=None, repr=False, compare=False)
+
+
+    # --- Per-player views ------------------------------------------------------
+    # What each player has / cannot have lives only in the engine's bitmasks;
+    # these build the card-id sets on demand instead of copying every fact.
+
+    @property
+    def known_has(self) -> Dict[int, FrozenSet[int]]:
+        """player_id -> cards they are known to hold."""
+        return {p: self._ids(self.engine.has[p]) for p in self.engine.player_ids}
+
+    @property
+    def known_not_have(self) -> Dict[int, FrozenSet[int]]:
+        """player_id -> cards they cannot possibly have."""
+        return {p: self._ids(self.engine.not_have[p]) for p in self.engine.player_ids}
+
+    @property
+    def known_may_have(self) -> Dict[int, FrozenSet[int]]:
+        """player_id -> cards they MAY have (from refutations)."""
+        not_have = self.engine.not_have
+        may_have = dict(self.may_have)
+        if self.public is not None:
+            for p, m in self.public.may_have.items():
+                may_have[p] = may_have.get(p, 0) | m
+        return {p: self._ids(m & ~not_have[p]) for p, m in may_have.items()}
+
+    def _ids(self, mask: int) -> FrozenSet[int]:
+        return frozenset(c for c in range(self.engine.num_cards) if mask >> c & 1)
+
+
+    # --- Shared public knowledge ----------------------------------------------
+    # With a PublicKnowledge the engine is a public_kb.PrivateKnowledge: this
+    # AI's own facts layered over the public ones, brought up to date when
+    # something reads it after a public event.
+
+    @property
+    def engine(self) -> DeductionEngine:
+        """The deduction engine, caught up with the public knowledge first."""
+        self._sync()
+        return self._engine
+
+    @property
+    def possible_suspects(self) -> set:
+        self._sync()
+        return self._possible_suspects
+
+    @property
+    def possible_weapons(self) -> set:
+        self._sync()
+        return self._possible_weapons
+
+    @property
+    def possible_rooms(self) -> set:
+        self._sync()
+        return self._possible_rooms
+
+    def _sync(self):
+        if self.public is not None and self._engine.sync():
+            self._apply_new_facts()
+
+
+    def initialize_kb(self, all_suspects, all_weapons, all_rooms, all_players, public=None):
+        """
+        Initialize what the AI knows at the start (card ids per category).
+        With public (the game's PublicKnowledge) the AI takes public events
+        from it instead of deducing from them itself.
+        """
+        self._possible_suspects = set(all_suspects)
+        self._possible_weapons = set(all_weapons)
+        self._possible_rooms = set(all_rooms)
 
-        # Remove AI's own cards from possible solutions
-        for card in self.hand:
-            if card.name in self.possible_suspects:
-                self.possible_suspects.remove(card.name)
-            if card.name in self.possible_weapons:
-                self.possible_weapons.remove(card.name)
-            if card.name in self.possible_rooms:
-                self.possible_rooms.remove(card.name)
-
-        # initialize player knowledge maps
         for p in all_players:
-            self.known_not_have[p.id] = set()
-            self.known_may_have[p.id] = set()
-            self.known_has[p.id] = set()
+            self.may_have[p.id] = 0
+
+        # Hand sizes are public: they follow from how deal_cards deals.
+        num_cards = len(all_suspects) + len(all_weapons) + len(all_rooms)
+        if public is not None:
+            self._engine = PrivateKnowledge(public)
+        else:
+            self._engine = DeductionEngine.for_deal([p.id for p in all_players], num_cards)
+        self.public = public
+
+        # The AI knows its own hand, so its own row is complete from the start.
+        for card in self.hand:
+            self._engine.add_has(self.id, card.id)
+        self._apply_new_facts()
 
 
     # --- Basic Recording ------------------------------------------------------
 
-    def record_seen_card(self, card_name: str):
+    def record_seen_card(self, card: int):
         """AI sees a card directly, remove from solution sets."""
-        self.seen_cards.add(card_name)
-        self._remove_from_possible(card_name)
+        self.seen_cards.add(card)
+        self._remove_from_possible(card)
+        self._engine.add_not_have(ENVELOPE, card)
+        self._apply_new_facts()
 
 
-    def record_player_cannot_have(self, player_id: int, card_name: str):
+    def record_player_cannot_have(self, player_id: int, card: int):
         """Record that a player does NOT have a given card."""
-        self.known_not_have[player_id].add(card_name)
+        self._engine.add_not_have(player_id, card)
+        self._apply_new_facts()
 
-        # if that card was in MAY_HAVE for that player remove it
-        self.known_may_have[player_id].discard(card_name)
 
-        self._deduce_from_all()
+    def record_player_has_none(self, player_id: int, card_list):
+        """Record that a player could not refute: they hold none of these cards."""
+        mask = 0
+        for c in card_list:
+            mask |= 1 << c
+        self._engine.add_none_of(player_id, mask)
+        self._apply_new_facts()
 
 
     def record_player_may_have(self, player_id: int, card_list):
@@ -92,140 +206,196 @@ class AIPlayer(Player):
         Record that a player refuted a suggestion and therefore
         has AT LEAST ONE of these cards.
         """
+        mask = 0
         for c in card_list:
-            # They may have this card, but only if not disproven
-            if c not in self.known_not_have[player_id]:
-                self.known_may_have[player_id].add(c)
+            mask |= 1 << c
 
-        self._deduce_from_all()
+        # They may have these cards, but only those not disproven
+        self.may_have[player_id] |= mask & ~self._engine.not_have[player_id]
+        self._engine.add_at_least_one(player_id, mask)
+        self._apply_new_facts()
 
 
-    def record_player_has(self, player_id: int, card_name: str):
+    def record_player_has(self, player_id: int, card: int):
         """If AI learns EXACTLY which card a player has."""
-        self.known_has[player_id].add(card_name)
-        self._remove_from_possible(card_name)
+        self._remove_from_possible(card)
 
-        # If the player has it, they cannot have the others
-        for other in [*self.possible_suspects, *self.possible_weapons, *self.possible_rooms]:
-            if other != card_name:
-                self.known_not_have[player_id].add(other)
+        # What else they cannot have follows from their hand size.
+        self._engine.add_has(player_id, card)
+        self._apply_new_facts()
 
-        self._deduce_from_all()
+
+    def record_shown_card(self, player_id: int, card: int):
+        """A player showed this AI a card: seen, and held by that player."""
+        self.record_seen_card(card)
+        self.record_player_has(player_id, card)
 
 
     # --- Deduction Helpers ---------------------------------------------------
 
-    def _remove_from_possible(self, card_name):
+    def _remove_from_possible(self, card):
         """Remove a card from any possible solution categories."""
-        self.possible_suspects.discard(card_name)
-        self.possible_weapons.discard(card_name)
-        self.possible_rooms.discard(card_name)
+        self._possible_suspects.discard(card)
+        self._possible_weapons.discard(card)
+        self._possible_rooms.discard(card)
 
 
-    def _deduce_from_all(self):
+    def _apply_new_facts(self):
         """
-        This performs logical deduction based on what we know:
-        - If NO PLAYER can have a card → card is in solution
-        - If a card is in solution, remove it from all player possibilities
+        Copy what the deduction engine derived into the knowledge sets:
+        - a card nobody can hold is in the solution
+        - a card that cannot be in the envelope is no longer a candidate
         """
-        all_cards = (
-            self.possible_suspects
-            | self.possible_weapons
-            | self.possible_rooms
-        )
+        self._kb_snapshot = None
+        for kind, owner, card in self._engine.drain_new_facts():
+            if owner == ENVELOPE:
+                if kind == HAS:
+                    self._mark_as_solution(card)
+                else:
+                    self._remove_from_possible(card)
 
-        for card in list(all_cards):
-            # Skip cards we have seen directly
-            if card in self.seen_cards:
-                continue
 
-            # If AI does not have card AND no player can have it:
-            nobody_can_have = True
-            for pid, cannot_set in self.known_not_have.items():
-                if card not in cannot_set:
-                    nobody_can_have = False
-                    break
+    def _mark_as_solution(self, card):
+        """Mark a card as part of the murder solution."""
+        self.out.debug("[AI DEBUG] AI infers: %s MUST be in the solution.", CARD_NAMES[card])
 
-            if nobody_can_have:
-                # Then card must be in the solution envelope.
-                self._mark_as_solution(card)
+        if card in self._possible_suspects:
+            self._possible_suspects = {card}
 
+        if card in self._possible_weapons:
+            self._possible_weapons = {card}
 
-    def _mark_as_solution(self, card):
-        """Mark a card as part of the murder solution."""
-        print(f"[AI DEBUG] AI infers: {card} MUST be in the solution.")
+        if card in self._possible_rooms:
+            self._possible_rooms = {card}
 
-        if card in self.possible_suspects:
-            self.possible_suspects = {card}
 
-        if card in self.possible_weapons:
-            self.possible_weapons = {card}
+    # --- Snapshots ------------------------------------------------------------
 
-        if card in self.possible_rooms:
-            self.possible_rooms = {card}
+    def snapshot_kb(self) -> tuple:
+        """
+        Immutable copy of the knowledge base, for restore_kb(). Reused until
+        the knowledge changes, so repeated snapshots cost nothing. The
+        engine's snapshot comes last; before it, the public snapshot its
+        layer lies on (the same object for every seat of the game), for
+        CluedoGame.restore().
+        """
+        engine = self.engine
+        base = self.public.snapshot() if self.public is not None else None
+        snap = self._kb_snapshot
+        if snap is None or snap[-2] is not base:
+            snap = self._kb_snapshot = (
+                frozenset(self._possible_suspects),
+                frozenset(self._possible_weapons),
+                frozenset(self._possible_rooms),
+                frozenset(self.seen_cards),
+                tuple(self.may_have.items()),
+                base,
+                engine.snapshot(),
+            )
+        return snap
+
+    def restore_kb(self, snap: tuple) -> None:
+        """Return to a snapshot_kb(); free if nothing was recorded since."""
+        if snap is self._kb_snapshot:
+            return
+        suspects, weapons, rooms, seen, may_have, base, engine = snap
+        self._possible_suspects = set(suspects)
+        self._possible_weapons = set(weapons)
+        self._possible_rooms = set(rooms)
+        self.seen_cards = set(seen)
+        self.may_have = dict(may_have)
+        self._engine.restore(engine)
+        self._kb_snapshot = snap
 
 
     # --- AI Decision Making ---------------------------------------------------
 
     def choose_suggestion(self, current_room):
-        """AI chooses suggestion based on least eliminated possibilities."""
-        # Pick first remaining suspect & weapon
-        suspect = next(iter(self.possible_suspects))
-        weapon = next(iter(self.possible_weapons))
-        room = current_room
-        return suspect, weapon, room
+        """
+        AI suggests the first remaining suspect & weapon (lowest card id =
+        card-list order), or with infogain the pair with the most expected
+        information.
+        """
+        if self.infogain:
+            from infogain import best_suggestion
+
+            suspect, weapon = best_suggestion(self.engine, self.id, current_room)
+            return suspect, weapon, current_room
+        return min(self.possible_suspects), min(self.possible_weapons), current_room
 
 
     def should_accuse(self):
-        """AI accuses only when absolutely certain."""
-        return (
+        """
+        AI accuses when certain, or, with accuse_confidence below 1, once the
+        posterior gives some envelope triple at least that probability (an
+        estimate is counted exactly first; see solver.best_accusation).
+        """
+        certain = (
             len(self.possible_suspects) == 1
             and len(self.possible_weapons) == 1
             and len(self.possible_rooms) == 1
         )
+        if certain or self.accuse_confidence >= 1.0:
+            return certain
+        return best_accusation(self.engine, self.accuse_confidence)[1] >= self.accuse_confidence
 
 
     def get_accusation(self):
         """Return the AI's accusation tuple."""
+        if self.accuse_confidence < 1.0 and not all(
+            len(s) == 1
+            for s in (self.possible_suspects, self.possible_weapons, self.possible_rooms)
+        ):
+            return best_accusation(self.engine, self.accuse_confidence)[0]
         return (
-            next(iter(self.possible_suspects)),
-            next(iter(self.possible_weapons)),
-            next(iter(self.possible_rooms)),
+            min(self.possible_suspects),
+            min(self.possible_weapons),
+            min(self.possible_rooms),
         )
 
 
+@slotted
 @dataclass
 class WeaponToken:
     name: str
-    location: str  # room name
+    location: int  # room position id
 
     def __str__(self):
-        return f"{self.name} in {self.location}"
+        return f"{self.name} in {position_name(self.location)}"
 
 
 def default_start_positions():
     """Map character -> starting node name"""
-    mapping = {
-        "Miss Scarlett": "Miss Scarlett Start",
-        "Colonel Mustard": "Colonel Mustard Start",
-        "Mrs. White": "Mrs. White Start",
-        "Reverend Green": "Reverend Green Start",
-        "Mrs. Peacock": "Mrs. Peacock Start",
-        "Professor Plum": "Professor Plum Start",
-    }
-    return mapping
-
-def create_players(num_players: int = 6) -> List[Player]:
+    return {character: start_name(character) for character in CHARACTER_NAMES}
+
+def create_players(
+    num_players: int = 6,
+    ai_seats: Optional[Iterable[int]] = None,
+    ai_class: type = AIPlayer,
+    seat_classes: Optional[Dict[int, type]] = None,
+) -> List[Player]:
+    """
+    Create the players in seat order. ai_seats holds 0-based seat indexes
+    that should be AI players (instances of ai_class); by default only the
+    last seat is AI. seat_classes overrides ai_class for single AI seats,
+    e.g. {0: mcts.MCTSPlayer}. Seat i plays the ruleset's i-th character,
+    so there are at most as many seats as characters.
+    """
+    if num_players > len(CHARACTER_NAMES):
+        raise ValueError(
+            f"At most {len(CHARACTER_NAMES)} players: one per character of the ruleset."
+        )
     starts = default_start_positions()
     players = []
+    ai_seats = {num_players - 1} if ai_seats is None else set(ai_seats)
 
     for i in range(num_players):
         character = CHARACTER_NAMES[i]
-        pos = starts[character]
+        pos = position_id(starts[character])
 
-        if i == num_players - 1:
-            # last player = AI
-            ai = AIPlayer(id=i + 1, character_name=character, position=pos, is_ai=True)
+        if i in ai_seats:
+            cls = seat_classes.get(i, ai_class) if seat_classes else ai_class
+            ai = cls(id=i + 1, character_name=character, position=pos, is_ai=True)
             players.append(ai)
         else:
             players.append(Player(id=i + 1, character_name=character, position=pos))
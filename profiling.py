@@ -0,0 +1,270 @@
+# profiling.py
+# Opt-in phase timers and hot-path counters: histograms, JSON and collapsed stacks
+
+import json
+import time
+from typing import Dict, List, Tuple
+
+# (object attribute on the game, method name, phase name); None = the game
+GAME_PHASES = (
+    (None, "play_turn", "turn"),
+    (None, "roll_dice", "roll_dice"),
+    (None, "available_moves_for_player", "movement"),
+    (None, "process_refutations", "process_refutations"),
+    (None, "handle_accusation", "accusation"),
+    ("board", "moves", "board.moves"),
+    ("board", "reachable_with_steps", "board.reachable_with_steps"),
+)
+AGENT_PHASES = (
+    ("choose_action", "choose_action"),
+    ("use_secret_passage", "use_secret_passage"),
+    ("choose_destination", "choose_destination"),
+    ("choose_suggestion", "choose_suggestion"),
+    ("choose_card_to_show", "choose_card_to_show"),
+)
+AI_PHASES = (
+    ("should_accuse", "should_accuse"),
+    ("record_seen_card", "record_seen_card"),
+    ("record_player_cannot_have", "record_player_cannot_have"),
+    ("record_player_has_none", "record_player_has_none"),
+    ("record_player_may_have", "record_player_may_have"),
+    ("record_player_has", "record_player_has"),
+    ("_apply_new_facts", "apply_facts"),  # AIPlayer
+    ("_report_new_facts", "apply_facts"),  # BitsetAIPlayer
+)
+PUBLIC_PHASES = (
+    ("record_player_has_none", "public.record_player_has_none"),
+    ("record_player_may_have", "public.record_player_may_have"),
+)
+ENGINE_PHASES = (
+    ("_propagate", "deduce"),  # DeductionEngine
+    ("_derive", "deduce"),  # public_kb.PrivateKnowledge
+    ("sync", "sync"),  # PrivateKnowledge catching up with the shared public KB
+)
+
+BUCKETS = 40  # log2 nanosecond buckets: bucket b holds [2**(b-1), 2**b) ns
+
+
+class Profiler:
+    """
+    Times the phases of every turn of the games it is attached to. Nothing
+    in the engine checks for it: attach() wraps the methods of one game's
+    objects, so games without a profiler run exactly the code they always
+    did. Totals are kept per call stack (for flame graphs) and per phase
+    (with a log2 histogram of call times); counters hold the deduction
+    engines' PropagationStats. Profilers merge, e.g. across tournament
+    worker processes.
+    """
+
+    def __init__(self):
+        self.frames: Dict[Tuple[str, ...], List[int]] = {}  # path -> [calls, total, self] ns
+        self.histograms: Dict[str, List[int]] = {}  # phase -> call count per bucket
+        self.counters: Dict[str, int] = {}
+        self._paths: List[Tuple[str, ...]] = [()]
+        self._children: List[int] = [0]
+        self._timed_classes: Dict[type, type] = {}  # slotted class -> timed subclass
+
+    # --- Instrumenting --------------------------------------------------------
+
+    def attach(self, game) -> None:
+        """Time this game's phases from now on (see the *_PHASES tables)."""
+        for target, method, phase in GAME_PHASES:
+            self._wrap(game if target is None else getattr(game, target), method, phase)
+        for agent in {id(a): a for a in game.agents}.values():
+            for method, phase in AGENT_PHASES:
+                self._wrap(agent, method, phase)
+        for player in game.players:
+            if not player.is_ai:
+                continue
+            for method, phase in AI_PHASES:
+                self._wrap(player, method, phase)
+            for method, phase in ENGINE_PHASES:
+                self._wrap(player.engine, method, phase)
+        public = getattr(game, "public", None)
+        if public is not None:
+            for method, phase in PUBLIC_PHASES:
+                self._wrap(public, method, phase)
+            for method, phase in ENGINE_PHASES:
+                self._wrap(public.engine, method, phase)
+        bus = getattr(game, "bus", None)
+        if bus is not None:
+            bus.rebind()  # its handlers were bound before the wrapping
+
+    def _wrap(self, obj, method: str, phase: str) -> None:
+        fn = getattr(obj, method, None)
+        if fn is None:
+            return
+        if hasattr(obj, "__dict__"):
+            if method not in vars(obj):  # else wrapped already
+                setattr(obj, method, self.timed(phase, fn))
+            return
+        # Slotted objects (players) take no instance attributes: the object
+        # moves to a subclass of its class, made once per profiler, whose
+        # method is timed. Objects of other games are not affected.
+        cls = type(obj)
+        if cls not in self._timed_classes.values():
+            timed = self._timed_classes.get(cls)
+            if timed is None:
+                timed = self._timed_classes[cls] = type(cls.__name__, (cls,), {"__slots__": ()})
+            obj.__class__ = cls = timed
+        if method not in vars(cls):
+            setattr(cls, method, self.timed(phase, getattr(cls.__base__, method)))
+
+    def timed(self, phase: str, fn):
+        """fn, timed as `phase` nested under whatever timed call is running."""
+        paths = self._paths
+        children = self._children
+        clock = time.perf_counter_ns
+
+        def timed_call(*args, **kwargs):
+            path = paths[-1] + (phase,)
+            paths.append(path)
+            children.append(0)
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                paths.pop()
+                inner = children.pop()
+                children[-1] += elapsed
+                self._record(phase, path, elapsed, elapsed - inner)
+
+        return timed_call
+
+    def _record(self, phase: str, path: Tuple[str, ...], elapsed: int, own: int) -> None:
+        frame = self.frames.get(path)
+        if frame is None:
+            frame = self.frames[path] = [0, 0, 0]
+        frame[0] += 1
+        frame[1] += elapsed
+        frame[2] += own
+        hist = self.histograms.get(phase)
+        if hist is None:
+            hist = self.histograms[phase] = [0] * BUCKETS
+        hist[min(elapsed.bit_length(), BUCKETS - 1)] += 1
+
+    def finish(self, game) -> None:
+        """Add a finished game's counters: games, turns and deduction work."""
+        self.count("games")
+        self.count("turns", game.turn_count)
+        for player in game.players:
+            if player.is_ai:
+                for name, value in player.engine.stats.as_dict().items():
+                    self.count("deduction." + name, value)
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge(self, other: "Profiler") -> None:
+        for path, (calls, total, own) in other.frames.items():
+            frame = self.frames.setdefault(path, [0, 0, 0])
+            frame[0] += calls
+            frame[1] += total
+            frame[2] += own
+        for phase, hist in other.histograms.items():
+            mine = self.histograms.setdefault(phase, [0] * BUCKETS)
+            for b, n in enumerate(hist):
+                mine[b] += n
+        for name, n in other.counters.items():
+            self.count(name, n)
+
+    def __getstate__(self):
+        return {"frames": self.frames, "histograms": self.histograms,
+                "counters": self.counters}
+
+    def __setstate__(self, state):
+        self.__init__()
+        self.__dict__.update(state)
+
+    # --- Reports --------------------------------------------------------------
+
+    def phases(self) -> Dict[str, Dict[str, int]]:
+        """phase -> calls, total_ns (outermost calls only) and self_ns."""
+        out: Dict[str, Dict[str, int]] = {}
+        for path, (calls, total, own) in self.frames.items():
+            phase = out.setdefault(path[-1], {"calls": 0, "total_ns": 0, "self_ns": 0})
+            phase["calls"] += calls
+            phase["self_ns"] += own
+            if path[-1] not in path[:-1]:
+                phase["total_ns"] += total
+        return out
+
+    def to_json(self) -> dict:
+        phases = self.phases()
+        for name, phase in phases.items():
+            hist = self.histograms.get(name, [])
+            phase["histogram_ns"] = {str(1 << b): n for b, n in enumerate(hist) if n}
+        return {
+            "phases": phases,
+            "stacks": {
+                ";".join(path): {"calls": c, "total_ns": t, "self_ns": s}
+                for path, (c, t, s) in sorted(self.frames.items())
+            },
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.to_json(), f, indent=1)
+
+    def collapsed(self) -> str:
+        """Self time per stack in microseconds, one "a;b;c weight" line each
+        (the input format of flamegraph.pl, speedscope and inferno)."""
+        lines = []
+        for path, (_, _, own) in sorted(self.frames.items()):
+            us = own // 1000
+            if us:
+                lines.append(f"{';'.join(path)} {us}")
+        return "\n".join(lines) + "\n"
+
+    def write_collapsed(self, path: str) -> None:
+        with open(path, "w") as f:
+            f.write(self.collapsed())
+
+    def percentile(self, phase: str, q: float) -> float:
+        """Upper bound (us) of the histogram bucket holding the q-quantile."""
+        hist = self.histograms.get(phase)
+        if not hist:
+            return 0.0
+        want = q * sum(hist)
+        seen = 0
+        for b, n in enumerate(hist):
+            seen += n
+            if n and seen >= want:
+                return (1 << b) / 1000
+        return (1 << (BUCKETS - 1)) / 1000
+
+    def summary(self) -> str:
+        """One line per phase, slowest total first."""
+        phases = self.phases()
+        lines = [
+            f"{'phase':<28}{'calls':>11}{'total ms':>11}{'self ms':>10}"
+            f"{'mean us':>10}{'p50 <us':>10}{'p99 <us':>10}"
+        ]
+        for name, p in sorted(phases.items(), key=lambda kv: -kv[1]["total_ns"]):
+            lines.append(
+                f"{name:<28}{p['calls']:>11,}{p['total_ns'] / 1e6:>11.1f}"
+                f"{p['self_ns'] / 1e6:>10.1f}{p['total_ns'] / p['calls'] / 1e3:>10.2f}"
+                f"{self.percentile(name, 0.5):>10.2f}{self.percentile(name, 0.99):>10.2f}"
+            )
+        for name, n in sorted(self.counters.items()):
+            lines.append(f"{name:<28}{n:>11,}")
+        return "\n".join(lines)
+
+    def histogram(self, phase: str, width: int = 40) -> str:
+        """Call-time histogram of one phase, one row per log2 bucket."""
+        hist = self.histograms.get(phase, [])
+        used = [b for b, n in enumerate(hist) if n]
+        if not used:
+            return f"{phase}: no calls"
+        top = max(hist)
+        lines = [f"{phase}:"]
+        for b in range(used[0], used[-1] + 1):
+            bar = "#" * round(hist[b] / top * width)
+            lines.append(f"  < {(1 << b) / 1000:>10.3f} us {hist[b]:>10,} {bar}")
+        return "\n".join(lines)
+
+    def __str__(self):
+        by_total = sorted(self.phases().items(), key=lambda kv: -kv[1]["total_ns"])
+        return "\n\n".join([self.summary()] + [self.histogram(name) for name, _ in by_total])
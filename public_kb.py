@@ -0,0 +1,543 @@
+# public_kb.py
+# Shared deduction over public information, one per game, under every AI's private knowledge
+
+from typing import Dict, List, Sequence, Tuple
+
+from deduction import DeductionEngine, ENVELOPE, Fact, HAS, NOT, PropagationStats
+
+PUBLIC = 0  # listener id on the event bus; never a player id (those start at 1)
+
+
+class PublicKnowledge:
+    """
+    What the whole table learns from suggestions: who could not refute
+    which triple, and who refuted it. Every AI seat would deduce the same
+    consequences from these, so the game deduces them once, here. Each AI
+    reads it through a PrivateKnowledge, which layers the facts only that
+    AI knows on top; version tells the layers when to look again.
+    """
+
+    __slots__ = (
+        "engine", "may_have", "version", "changed", "facts", "refuted", "refuted_by",
+        "_snapshot", "_clauses", "_clauses_version",
+    )
+
+    id = PUBLIC
+
+    def __init__(self, player_ids: Sequence[int], num_cards: int):
+        self.engine = DeductionEngine.for_deal(player_ids, num_cards)
+        # player_id -> bitmask of refuted suggestion cards (as AIPlayer.may_have)
+        self.may_have: Dict[int, int] = {p: 0 for p in player_ids}
+        self.version = 0
+        # owner -> version of the last event that added to its row
+        self.changed: Dict[int, int] = dict.fromkeys(self.engine.owners, 0)
+        # every fact the engine found, oldest first; layers take the new
+        # ones with one slice (a fresh list after restore())
+        self.facts: List[Fact] = []
+        # every "at least one of" clause as given, never cut down, as
+        # (player_id, cards) oldest first and per player: layers check them
+        # against their own facts. After restore(), the engine's open clauses.
+        self.refuted: List[Tuple[int, int]] = []
+        self.refuted_by: Dict[int, List[int]] = {p: [] for p in player_ids}
+        self._snapshot = None
+        self._clauses: Dict[int, Tuple[int, ...]] = {}
+        self._clauses_version = -1
+
+    def clauses(self) -> Dict[int, Tuple[int, ...]]:
+        """player_id -> masks of its open "at least one of" clauses, built once per version."""
+        if self._clauses_version != self.version:
+            by_owner: Dict[int, List[int]] = {}
+            for owner, mask in self.engine.open_clauses():
+                by_owner.setdefault(owner, []).append(mask)
+            self._clauses = {o: tuple(masks) for o, masks in by_owner.items()}
+            self._clauses_version = self.version
+        return self._clauses
+
+    # --- Bus handlers -----------------------------------------------------------
+
+    def record_player_has_none(self, player_id: int, card_list) -> None:
+        """A player could not refute: they hold none of these cards."""
+        mask = 0
+        for c in card_list:
+            mask |= 1 << c
+        self.may_have[player_id] &= ~mask
+        self.engine.add_none_of(player_id, mask)
+        self._learn()
+
+    def record_player_may_have(self, player_id: int, card_list) -> None:
+        """A player refuted: they hold at least one of these cards."""
+        mask = 0
+        for c in card_list:
+            mask |= 1 << c
+        self.may_have[player_id] |= mask & ~self.engine.not_have[player_id]
+        self.engine.add_at_least_one(player_id, mask)
+        self.refuted.append((player_id, mask))
+        self.refuted_by[player_id].append(mask)
+        self._learn()
+
+    def _learn(self) -> None:
+        """Close an event: log the engine's new facts and stamp the rows they are in."""
+        self.version += 1
+        self._snapshot = None
+        facts = self.engine.drain_new_facts()
+        if facts:
+            self.facts += facts
+            changed, version = self.changed, self.version
+            for _, owner, _ in facts:
+                changed[owner] = version
+
+    # --- Snapshots ----------------------------------------------------------------
+
+    def snapshot(self) -> tuple:
+        """(engine snapshot, may_have items); the same object until the next event."""
+        if self._snapshot is None:
+            self._snapshot = (self.engine.snapshot(), tuple(self.may_have.items()))
+        return self._snapshot
+
+    def restore(self, snap: tuple) -> None:
+        """Return to a snapshot(). AIs restore their own layers alongside."""
+        if snap is not self._snapshot:
+            engine, may_have = snap
+            self.engine.restore(engine)
+            self.may_have = dict(may_have)
+            self.facts = []
+            self.refuted = self.engine.open_clauses()
+            self.refuted_by = {p: [] for p in self.may_have}
+            for p, mask in self.refuted:
+                self.refuted_by[p].append(mask)
+            self._snapshot = snap
+        self.version += 1
+
+
+class PrivateKnowledge:
+    """
+    One AI's knowledge as a copy-on-write layer over the game's public
+    engine: own_has / own_not hold, per owner, only the facts this AI knows
+    that the public engine does not (its hand, cards it saw or was shown,
+    and what follows from them). has / not_have are the union of the two,
+    so this reads like a DeductionEngine. sync() copies in what the public
+    engine learned since the last one, and drops own facts it now has too.
+
+    The public engine is at its own fixpoint, so only rules with a private
+    fact among their inputs can derive anything more, and only where some
+    input changed: the hand size of a player whose row changed, an envelope
+    category, a card ruled out here that nobody is known to hold, and the
+    clauses of a player with both a changed card and one ruled out here.
+    They run on whole bitmasks, at the next sync() rather than per fact.
+    """
+
+    __slots__ = (
+        "public", "player_ids", "hand_sizes", "num_cards", "categories", "owners",
+        "all_cards", "has", "not_have", "stats", "new_facts",
+        "_own_has", "_own_not", "_held", "_ruled_out", "_clauses", "_version",
+        "_rows", "_cards", "_loose", "_refuted", "_seen", "_facts", "_heard",
+    )
+
+    def __init__(self, public: PublicKnowledge):
+        base = public.engine
+        self.public = public
+        self.player_ids = base.player_ids
+        self.hand_sizes = base.hand_sizes
+        self.num_cards = base.num_cards
+        self.categories = base.categories
+        self.owners = base.owners
+        self.all_cards = base.all_cards
+        self.has: Dict[int, int] = dict(base.has)
+        self.not_have: Dict[int, int] = dict(base.not_have)
+        self.stats = PropagationStats()
+        self.new_facts: List[Fact] = []
+        self._own_has = {o: 0 for o in self.owners}
+        self._own_not = {o: 0 for o in self.owners}
+        self._count()
+        self._clauses: List[Tuple[int, int]] = []  # own (owner, mask) clauses
+        self._version = public.version
+        # what changed since the rules last ran: owner -> cards of its row,
+        # and the cards newly ruled out for somebody
+        self._rows: Dict[int, int] = {}
+        self._cards = 0
+        # cards ruled out here for somebody and not known to be held: the
+        # only ones the exhaustion rule can place (a superset of them)
+        self._loose = 0
+        # public.refuted as last seen, and how much of it
+        self._refuted = public.refuted
+        self._seen = len(public.refuted)
+        # public.facts as last seen, and how much of it
+        self._facts = public.facts
+        self._heard = len(public.facts)
+
+    # --- Queries --------------------------------------------------------------
+
+    def envelope_candidates(self) -> int:
+        """Bitmask of cards that may still be in the envelope."""
+        return self.all_cards & ~self.not_have[ENVELOPE]
+
+    def open_clauses(self) -> List[Tuple[int, int]]:
+        """The public and own clauses, less what the private facts settle."""
+        has, not_have = self.has, self.not_have
+        out = []
+        for owner, masks in self.public.clauses().items():
+            for mask in masks:
+                if not mask & has[owner]:
+                    out.append((owner, mask & ~not_have[owner]))
+        for owner, mask in self._clauses:
+            out.append((owner, mask & ~not_have[owner]))
+        return out
+
+    # --- Input ----------------------------------------------------------------
+
+    def add_has(self, owner: int, card: int) -> None:
+        self._add(owner, 1 << card, 0)
+
+    def add_not_have(self, owner: int, card: int) -> None:
+        self._add(owner, 0, 1 << card)
+
+    def add_none_of(self, owner: int, mask: int) -> None:
+        """Owner holds none of the cards in mask."""
+        self._add(owner, 0, mask)
+
+    def add_at_least_one(self, owner: int, mask: int) -> None:
+        """Owner holds at least one card of mask."""
+        if owner == ENVELOPE:
+            raise ValueError("Clauses are about players' hands.")
+        self.stats.events += 1
+        if mask & self.has[owner]:
+            return
+        left = mask & ~self.not_have[owner]
+        if not left:
+            self.stats.contradictions += 1
+        elif left & (left - 1) == 0:
+            self.stats.clause_units += 1
+            self._settle(owner, left, 0)
+        elif not any(o == owner and m & ~left == 0 for o, m in self._clauses):
+            self._clauses.append((owner, left))
+            self._rows[owner] = self._rows.get(owner, 0) | left
+
+    def drain_new_facts(self) -> List[Fact]:
+        """Facts found since the last call, own and public (the rules' ones after a sync)."""
+        facts, self.new_facts = self.new_facts, []
+        return facts
+
+    def sync(self) -> bool:
+        """
+        Catch up with the public engine, and run the rules on what changed
+        since the last sync; False if nothing did. Everything that reads
+        the knowledge goes through here first (AIPlayer.engine).
+        """
+        public = self.public
+        if public.version == self._version:
+            if not self._rows:
+                return False
+            self._derive()
+            return True
+        since = self._version
+        restored = since < 0
+        self._version = public.version
+        base = public.engine
+        has, not_have = self.has, self.not_have
+        own_has, own_not = self._own_has, self._own_not
+        held, ruled_out = self._held, self._ruled_out
+        rows, cards = self._rows, self._cards
+        # only the rows the public engine found something in since the last look
+        facts = public.facts
+        if facts is self._facts and not restored:
+            fresh = facts[self._heard:]
+            changed = public.changed
+            owners = [o for o in self.owners if changed[o] > since]
+        else:
+            fresh = None
+            owners = self.owners
+        added = []
+        learned = 0
+        for o in owners:
+            b = base.has[o]
+            own_has[o] &= ~b
+            add_has = b & ~has[o]
+            b = base.not_have[o]
+            own_not[o] &= ~b
+            add_not = b & ~not_have[o]
+            if add_has or add_not:
+                added.append((o, add_has, add_not))
+                rows[o] = rows.get(o, 0) | add_has | add_not
+                if add_has:
+                    has[o] |= add_has
+                    self._loose &= ~add_has
+                    n = bin(add_has).count("1")
+                    held[o] += n
+                    learned += n
+                if add_not:
+                    not_have[o] |= add_not
+                    cards |= add_not
+                    n = bin(add_not).count("1")
+                    ruled_out[o] += n
+                    learned += n
+        self._cards = cards
+        self.stats.facts += learned
+        # the public engine's own fact tuples, unless some were known here already
+        if fresh is not None and len(fresh) == learned:
+            self.new_facts += fresh
+        else:
+            new_facts = self.new_facts
+            for o, add_has, add_not in added:
+                for kind, mask in ((HAS, add_has), (NOT, add_not)):
+                    while mask:
+                        low = mask & -mask
+                        new_facts.append((kind, o, low.bit_length() - 1))
+                        mask ^= low
+        self._facts = facts
+        self._heard = len(facts)
+        # new public clauses change no fact, but private ones may settle them
+        refuted = public.refuted
+        for o, mask in refuted[self._seen if refuted is self._refuted else 0:]:
+            if mask & own_not[o] and not mask & has[o]:
+                rows[o] = rows.get(o, 0) | mask
+        self._refuted = refuted
+        self._seen = len(refuted)
+        if restored:
+            # the snapshot's fixpoint was over another public state: look again everywhere
+            for o in self.owners:
+                rows[o] = self.all_cards
+            self._cards = self.all_cards
+            if self._clauses:
+                self._drop_public_clauses()
+        if rows:
+            self._derive()
+        return True
+
+    # --- Snapshots ------------------------------------------------------------
+
+    def snapshot(self) -> tuple:
+        """
+        The known facts as a DeductionEngine.snapshot() with its counters
+        left empty: the union masks and every open clause. batch.GameArrays
+        packs it alike, and a plain DeductionEngine can restore it.
+        """
+        owners = self.owners
+        clauses = self.open_clauses()
+        return (
+            tuple([self.has[o] for o in owners]),
+            tuple([self.not_have[o] for o in owners]),
+            (), (), (),
+            tuple(enumerate(clauses)),
+            len(clauses),
+        )
+
+    def restore(self, snap: tuple) -> None:
+        """
+        Return to a snapshot(). Everything is taken as own until the next
+        sync, which drops the facts and clauses the public engine has:
+        CluedoGame.restore() puts that back after the seats. New facts are
+        then found against the restored union, as if it had never been left.
+        """
+        has, not_have, _, _, _, clauses, _ = snap
+        owners = self.owners
+        self.has = dict(zip(owners, has))
+        self.not_have = dict(zip(owners, not_have))
+        self._own_has = dict(self.has)
+        self._own_not = dict(self.not_have)
+        self._count()
+        self._clauses = [clause for _, clause in clauses]
+        self._version = -1
+        self._facts = None
+        self._rows = {}
+        self._cards = 0
+        held = ruled_out = 0
+        for o in owners:
+            held |= self.has[o]
+            ruled_out |= self.not_have[o]
+        self._loose = ruled_out & ~held
+        self.new_facts = []
+
+    # --- Propagation ---------------------------------------------------------
+
+    def _add(self, owner: int, add_has: int, add_not: int) -> None:
+        """Own facts go in as they are; the rules wait for the next sync()."""
+        self.stats.events += 1
+        self._settle(owner, add_has, add_not)
+
+    def _count(self) -> None:
+        """owner -> number of HAS / NOT facts in the union, so the hand-size rule never counts bits."""
+        self._held = {o: bin(m).count("1") for o, m in self.has.items()}
+        self._ruled_out = {o: bin(m).count("1") for o, m in self.not_have.items()}
+
+    def _record(self, kind: int, owner: int, mask: int) -> None:
+        """Queue the facts of mask as new, count them, and mark them for the rules."""
+        self._rows[owner] = self._rows.get(owner, 0) | mask
+        if mask & (mask - 1):
+            n = bin(mask).count("1")
+            new_facts = self.new_facts
+            m = mask
+            while m:
+                low = m & -m
+                new_facts.append((kind, owner, low.bit_length() - 1))
+                m ^= low
+        else:
+            n = 1
+            self.new_facts.append((kind, owner, mask.bit_length() - 1))
+        if kind == NOT:
+            self._cards |= mask
+            self._ruled_out[owner] += n
+        else:
+            self._held[owner] += n
+        self.stats.facts += n
+
+    def _settle(self, owner: int, add_has: int, add_not: int) -> bool:
+        """
+        Put facts in both the union and the own layer; a held card is ruled
+        out for every other owner on the spot. False if nothing was new.
+        """
+        has, not_have = self.has, self.not_have
+        add_has &= ~has[owner]
+        add_not &= ~not_have[owner]
+        clash = add_has & not_have[owner] | add_not & has[owner]
+        if clash:
+            self.stats.contradictions += bin(clash).count("1")
+            add_has &= ~clash
+            add_not &= ~clash
+        if not (add_has or add_not):
+            return False
+        if add_not:
+            not_have[owner] |= add_not
+            self._own_not[owner] |= add_not
+            self._loose |= add_not
+            self._record(NOT, owner, add_not)
+        if add_has:
+            has[owner] |= add_has
+            self._own_has[owner] |= add_has
+            self._loose &= ~add_has
+            self._record(HAS, owner, add_has)
+            # _record inlined, as this runs for every card shown or dealt;
+            # a held card can never be placed by exhaustion, so no _cards
+            own_not, rows, ruled_out = self._own_not, self._rows, self._ruled_out
+            new_facts = self.new_facts
+            learned = 0
+            for o in self.owners:
+                if o == owner:
+                    continue
+                add = add_has & ~not_have[o]
+                if not add:
+                    continue
+                if add & has[o]:
+                    self.stats.contradictions += bin(add & has[o]).count("1")
+                not_have[o] |= add
+                own_not[o] |= add
+                rows[o] = rows.get(o, 0) | add
+                if add & (add - 1):
+                    n = 0
+                    while add:
+                        low = add & -add
+                        new_facts.append((NOT, o, low.bit_length() - 1))
+                        add ^= low
+                        n += 1
+                else:
+                    n = 1
+                    new_facts.append((NOT, o, add.bit_length() - 1))
+                ruled_out[o] += n
+                learned += n
+            self.stats.facts += learned
+        return True
+
+    def _derive(self) -> None:
+        """Run the rules private facts take part in where something changed."""
+        has, not_have = self.has, self.not_have
+        own_has, own_not = self._own_has, self._own_not
+        held, ruled_out = self._held, self._ruled_out
+        owners, all_cards, num_cards = self.owners, self.all_cards, self.num_cards
+        stats, settle = self.stats, self._settle
+        refuted_by = self.public.refuted_by
+        while self._rows:
+            rows, cards = self._rows, self._cards
+            self._rows, self._cards = {}, 0
+            stats.queue_pops += 1
+
+            for o, changed in rows.items():
+                private = own_has[o] | own_not[o]
+                if not private or held[o] + ruled_out[o] == num_cards:
+                    continue
+
+                if o == ENVELOPE:
+                    # one card per category
+                    for cat in self.categories:
+                        if not (cat & changed and cat & private):
+                            continue
+                        if has[o] & cat:
+                            settle(o, 0, cat & ~has[o])
+                            continue
+                        left = cat & ~not_have[o]
+                        if left & (left - 1) == 0:
+                            stats.category += 1
+                            settle(o, left, 0)
+                    continue
+
+                # hand size
+                size = self.hand_sizes[o]
+                if held[o] == size:
+                    stats.hand_limit += 1
+                    settle(o, 0, all_cards & ~has[o])
+                    continue
+                if num_cards - ruled_out[o] == size:
+                    stats.hand_limit += 1
+                    settle(o, all_cards & ~not_have[o], 0)
+                    continue
+
+                # clauses on changed cards (as given: the public engine's
+                # own are cut down by what it ruled out)
+                # units only: a satisfied one or one with two cards left waits
+                h, open_ = has[o], ~not_have[o]
+                for mask in refuted_by[o]:
+                    if mask & changed and mask & private and not mask & h:
+                        left = mask & open_
+                        if not left & (left - 1):
+                            self._unit(o, mask)
+                for p, mask in self._clauses:
+                    if p == o and mask & changed:
+                        self._unit(o, mask)
+
+            # a card ruled out, privately somewhere, for all owners but one goes there
+            cards &= self._loose
+            if cards:
+                private = held_any = one = more = 0
+                for o in owners:
+                    private |= own_not[o]
+                    held_any |= has[o]
+                    m = cards & ~not_have[o]
+                    more |= one & m
+                    one |= m
+                last = one & ~more & private & ~held_any
+                if last:
+                    for o in owners:
+                        m = last & ~not_have[o]
+                        if m:
+                            stats.exhaustion += 1
+                            settle(o, m, 0)
+
+        if self._clauses:
+            # satisfied ones go; the rest stay as given, like the public ones
+            self._clauses = [
+                (p, mask) for p, mask in self._clauses
+                if not mask & has[p] and mask & ~not_have[p]
+            ]
+
+    def _drop_public_clauses(self) -> None:
+        """After restore(): keep only the own clauses no public one implies."""
+        has, not_have = self.has, self.not_have
+        public = self.public.clauses()
+        self._clauses = [
+            (o, m) for o, m in self._clauses
+            if not m & has[o]
+            and not any(p & ~not_have[o] & ~m == 0 for p in public.get(o, ()))
+        ]
+
+    def _unit(self, owner: int, mask: int) -> bool:
+        """A clause down to one card makes that card held."""
+        if mask & self.has[owner]:
+            return False
+        stats = self.stats
+        stats.clause_checks += 1
+        left = mask & ~self.not_have[owner]
+        if not left:
+            stats.contradictions += 1
+            return False
+        if left & (left - 1):
+            return False
+        stats.clause_units += 1
+        return self._settle(owner, left, 0)
@@ -0,0 +1,249 @@
+# rules.py
+# Rulesets as data: cards, seats and board loaded from a JSON file, compiled and cached
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import random
+import tempfile
+from typing import Dict, NamedTuple, Optional, Tuple
+
+RULES_ENV = "CLUEDO_RULES"  # ruleset name or path for this process (default: classic)
+RULESETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rulesets")
+COMPILED_VERSION = 2  # bump when Ruleset or the board tables change shape
+
+
+class Ruleset(NamedTuple):
+    """
+    Everything that used to be hard-coded: the cards, one character per
+    seat (so len(characters) is the player cap) and the room graph. Each
+    character starts on its own start node next to its `doors` room.
+    """
+
+    name: str
+    characters: Tuple[str, ...]
+    weapons: Tuple[str, ...]
+    rooms: Tuple[str, ...]
+    doors: Tuple[str, ...]  # character i starts next to room doors[i]
+    edges: Tuple[Tuple[str, str], ...]  # room-to-room, one step either way
+    passages: Tuple[Tuple[str, str], ...]  # secret passages, usable either way
+
+    @property
+    def max_players(self) -> int:
+        return len(self.characters)
+
+    @property
+    def num_cards(self) -> int:
+        return len(self.characters) + len(self.weapons) + len(self.rooms)
+
+    def to_json(self) -> dict:
+        return {
+            "name": self.name,
+            "characters": list(self.characters),
+            "weapons": list(self.weapons),
+            "rooms": list(self.rooms),
+            "doors": dict(zip(self.characters, self.doors)),
+            "edges": [list(e) for e in self.edges],
+            "secret_passages": [list(p) for p in self.passages],
+        }
+
+
+def parse(data: dict) -> Ruleset:
+    """A Ruleset from the JSON layout of rulesets/classic.json, checked."""
+    missing = [c for c in data["characters"] if c not in data["doors"]]
+    if missing:
+        raise ValueError(f"no start door for {', '.join(missing)}")
+    rules = Ruleset(
+        name=str(data.get("name", "unnamed")),
+        characters=tuple(data["characters"]),
+        weapons=tuple(data["weapons"]),
+        rooms=tuple(data["rooms"]),
+        doors=tuple(data["doors"][c] for c in data["characters"]),
+        edges=tuple((a, b) for a, b in data.get("edges", ())),
+        passages=tuple((a, b) for a, b in data.get("secret_passages", ())),
+    )
+    names = [*rules.characters, *rules.weapons, *rules.rooms]
+    if len(set(names)) != len(names):
+        raise ValueError(f"{rules.name}: card names must be unique")
+    if not (rules.characters and rules.weapons and rules.rooms):
+        raise ValueError(f"{rules.name}: every category needs at least one card")
+    used = {r for pair in (*rules.edges, *rules.passages) for r in pair} | set(rules.doors)
+    unknown = sorted(used - set(rules.rooms))
+    if unknown:
+        raise ValueError(f"{rules.name}: not rooms: {', '.join(unknown)}")
+    passage_rooms = [r for p in rules.passages for r in p]
+    if len(set(passage_rooms)) != len(passage_rooms):
+        raise ValueError(f"{rules.name}: a room can have only one secret passage")
+    return rules
+
+
+# --- Compiled form -------------------------------------------------------------
+# The compiled file holds the parsed Ruleset and any board tables built for
+# it, keyed by a digest of the JSON source. A large variant's movement tables
+# take seconds to build; the compiled file loads them in milliseconds. Only
+# plain tuples, dicts and lists are pickled: a pickled class is looked up by
+# module name, which is __main__ when rules.py runs as a script.
+
+_compiled: Dict[str, dict] = {}  # source path -> compiled contents
+
+
+def compiled_path(path: str) -> str:
+    return path + ".cache"
+
+
+def load(path: str) -> Ruleset:
+    """The ruleset in a JSON file, through its compiled cache."""
+    with open(path, "rb") as f:
+        source = f.read()
+    digest = hashlib.sha256(source).hexdigest()
+    try:
+        with open(compiled_path(path), "rb") as f:
+            compiled = pickle.load(f)
+        if compiled["version"] != COMPILED_VERSION or compiled["digest"] != digest:
+            raise ValueError("stale")
+        rules = Ruleset(*compiled["ruleset"])
+    except (OSError, ValueError, KeyError, TypeError, EOFError, AttributeError,
+            ImportError, pickle.UnpicklingError):
+        # missing, stale or unreadable (e.g. written by an older version)
+        rules = parse(json.loads(source))
+        compiled = {
+            "version": COMPILED_VERSION,
+            "digest": digest,
+            "ruleset": tuple(rules),
+            "tables": {},
+        }
+        _save(path, compiled)
+    _compiled[path] = compiled
+    return rules
+
+
+def _save(path: str, compiled: dict) -> None:
+    """
+    Write the compiled file atomically: pool workers may save the same
+    ruleset at once, and a reader must never see a half-written pickle.
+    """
+    target = compiled_path(path)
+    try:
+        fd, tmp = tempfile.mkstemp(prefix=os.path.basename(target) + ".",
+                                   dir=os.path.dirname(target))
+    except OSError:
+        return  # read-only checkout: compile again next time
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, target)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def board_tables(key: tuple) -> Optional[dict]:
+    """Board tables compiled for the active ruleset's layout, if any."""
+    compiled = _compiled.get(_active_path or "")
+    return None if compiled is None else compiled["tables"].get(key)
+
+
+def store_board_tables(key: tuple, tables: dict) -> None:
+    """Keep freshly built board tables in the active ruleset's compiled file."""
+    compiled = _compiled.get(_active_path or "")
+    if compiled is not None:
+        compiled["tables"][key] = tables
+        _save(_active_path, compiled)
+
+
+# --- The active ruleset ------------------------------------------------------
+
+_active: Optional[Ruleset] = None
+_active_path: Optional[str] = None
+
+
+def resolve(name: str) -> str:
+    """Path of a ruleset: a file, or the name of one in rulesets/."""
+    if os.path.exists(name):
+        return os.path.abspath(name)
+    return os.path.join(RULESETS_DIR, name + ".json")
+
+
+def active() -> Ruleset:
+    """
+    The ruleset of this process, from the CLUEDO_RULES environment variable
+    (default "classic"). cards.py builds its constants from it at import, so
+    it has to be chosen before the game modules are imported; worker
+    processes inherit it through the environment.
+    """
+    global _active, _active_path
+    if _active is None:
+        _active_path = resolve(os.environ.get(RULES_ENV) or "classic")
+        _active = load(_active_path)
+    return _active
+
+
+# --- Synthetic variants ------------------------------------------------------
+
+def generate(characters: int, weapons: int, rooms: int, seed: int = 0,
+             extra_edges: float = 0.5, passages: int = 0) -> Ruleset:
+    """
+    A variant of the given size for stress tests: rooms on a ring plus
+    seeded random shortcuts (extra_edges per room), `passages` secret
+    passages between far-apart rooms, and starts spread around the ring.
+    """
+    rng = random.Random(seed)
+    room_names = [f"Room {i + 1}" for i in range(rooms)]
+    edges = set()
+    for i in range(rooms):
+        if rooms > 1:
+            edges.add(tuple(sorted((i, (i + 1) % rooms))))
+    for _ in range(int(extra_edges * rooms)):
+        a, b = rng.sample(range(rooms), 2) if rooms > 2 else (0, 0)
+        if a != b:
+            edges.add(tuple(sorted((a, b))))
+    passage_pairs = []
+    for k in range(min(passages, rooms // 2)):
+        passage_pairs.append((room_names[k], room_names[k + rooms // 2]))
+    return Ruleset(
+        name=f"generated-{characters}x{weapons}x{rooms}",
+        characters=tuple(f"Suspect {i + 1}" for i in range(characters)),
+        weapons=tuple(f"Weapon {i + 1}" for i in range(weapons)),
+        rooms=tuple(room_names),
+        doors=tuple(room_names[i * rooms // characters] for i in range(characters)),
+        edges=tuple((room_names[a], room_names[b]) for a, b in sorted(edges)),
+        passages=tuple(passage_pairs),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create, compile and inspect rulesets.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    gen = sub.add_parser("generate", help="write a synthetic variant")
+    gen.add_argument("path")
+    gen.add_argument("--characters", type=int, default=12)
+    gen.add_argument("--weapons", type=int, default=12)
+    gen.add_argument("--rooms", type=int, default=24)
+    gen.add_argument("--passages", type=int, default=2)
+    gen.add_argument("--seed", type=int, default=0)
+    show = sub.add_parser("show", help="summarise a ruleset (compiling it)")
+    show.add_argument("name", nargs="?", default="classic")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        rules = generate(args.characters, args.weapons, args.rooms, args.seed,
+                         passages=args.passages)
+        with open(args.path, "w") as f:
+            json.dump(rules.to_json(), f, indent=1)
+            f.write("\n")
+        path = args.path
+    else:
+        path = resolve(args.name)
+    rules = load(path)
+    print(f"{rules.name}: {len(rules.characters)} characters (max players), "
+          f"{len(rules.weapons)} weapons, {len(rules.rooms)} rooms, "
+          f"{rules.num_cards} cards, {len(rules.edges)} edges, "
+          f"{len(rules.passages)} secret passages")
+
+
+if __name__ == "__main__":
+    main()
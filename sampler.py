@@ -0,0 +1,322 @@
+# sampler.py
+# Vectorized Monte Carlo sampling of hidden hands (NumPy)
+
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from cards import CATEGORY_MASKS
+from deduction import DeductionEngine, ENVELOPE
+
+
+def _bits(mask: int) -> List[int]:
+    out = []
+    while mask:
+        low = mask & -mask
+        out.append(low.bit_length() - 1)
+        mask ^= low
+    return out
+
+
+@dataclass
+class SampleResult:
+    """
+    Weighted frequencies over the accepted samples. owners[0] is ENVELOPE,
+    the rest are player ids; owner_freq[card, j] estimates the probability
+    that card sits with owners[j]. envelope_freq[s, w, r] is indexed by the
+    card's position within each category (suspect, weapon, room).
+    """
+
+    owners: List[int]
+    owner_freq: np.ndarray
+    envelope_freq: np.ndarray
+    accepted: int  # samples with non-zero weight
+    attempted: int
+    effective: float  # effective sample size of the importance weights
+    seconds: float
+
+    @property
+    def samples_per_sec(self) -> float:
+        return self.attempted / self.seconds if self.seconds else float("inf")
+
+    @property
+    def acceptance(self) -> float:
+        return self.accepted / self.attempted if self.attempted else 0.0
+
+
+@dataclass
+class _Proposal:
+    """What HandSampler deals from for one knowledge state (see sample())."""
+
+    owners: List[int]  # ENVELOPE, then player ids
+    column: List[int]  # index into owners of each proposal owner
+    caps: List[int]  # open slots of each proposal owner
+    category: List[int]  # category mask of an envelope slot, else 0
+    free: List[int]  # cards left to deal, in dealing order
+    allowed: np.ndarray  # free card x proposal owner, 1 if it may hold it
+    last_for_slot: Dict[int, int]
+    clause_column: List[int]
+    clause_at: Dict[int, List[int]]
+    clause_last: Dict[int, List[int]]
+
+
+class HandSampler:
+    """
+    Draws batches of full deals consistent with a DeductionEngine's knowledge.
+
+    Free cards are dealt one card at a time for the whole batch at once
+    (most constrained card first): each sample puts the card with an owner
+    that may hold it, chosen in proportion to that owner's open hand slots.
+    A sample that reaches a card nobody can take, or that ends with an
+    "at least one of" clause unsatisfied, is rejected. The bias of the
+    constraint-aware proposal is undone with importance weights, so the
+    weighted frequencies converge to the exact posterior in solver.py.
+
+    Buffers are kept between calls and only grow, so memory stays flat
+    across a long tournament.
+    """
+
+    def __init__(self, batch_size: int = 100_000, seed=None):
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+        self._batch = 0
+        self._shape = (0, 0)
+
+    def _buffers(self, batch: int, num_free: int, num_owners: int):
+        """Reusable work arrays; reallocated only when a call needs more."""
+        f, o = self._shape
+        if batch > self._batch or num_free > f or num_owners > o:
+            # grow each dimension on its own: a call with more owners may
+            # have fewer free cards than an earlier one
+            self._batch = b = max(batch, self._batch)
+            self._shape = f, o = max(num_free, f), max(num_owners, o)
+            self._cap = np.empty(b * o, dtype=np.int16)
+            self._avail = np.empty(b * o, dtype=np.int16)
+            self._cum = np.empty(b * o, dtype=np.int16)
+            self._assign = np.empty(b * max(f, 1), dtype=np.intp)
+            self._weight = np.empty(b, dtype=np.float64)
+            self._z = np.empty(b, dtype=np.int16)
+            self._u = np.empty(b, dtype=np.float64)
+        return (
+            self._cap[: batch * num_owners].reshape(batch, num_owners),
+            self._avail[: batch * num_owners].reshape(batch, num_owners),
+            self._cum[: batch * num_owners].reshape(batch, num_owners),
+            self._assign[: batch * num_free].reshape(batch, num_free),
+            self._weight[:batch],
+            self._z[:batch],
+            self._u[:batch],
+        )
+
+    def _proposal(self, engine: DeductionEngine) -> "_Proposal":
+        players = list(engine.player_ids)
+        owners = [ENVELOPE, *players]
+
+        # Proposal owners: one per open envelope category, then players.
+        column, caps, category = [], [], []
+        for cat in engine.categories:
+            if not engine.has[ENVELOPE] & cat:
+                column.append(0)
+                caps.append(1)
+                category.append(cat)
+        for j, p in enumerate(players, start=1):
+            column.append(j)
+            caps.append(engine.hand_sizes[p] - bin(engine.has[p]).count("1"))
+            category.append(0)
+
+        held = 0
+        for o in engine.owners:
+            held |= engine.has[o]
+        free = _bits(engine.all_cards & ~held)
+        if sum(caps) != len(free):
+            raise ValueError("Knowledge is inconsistent with hand sizes.")
+
+        allowed = np.zeros((len(free), len(column)), dtype=np.int16)
+        for i, c in enumerate(free):
+            bit = 1 << c
+            for k, (j, cat) in enumerate(zip(column, category)):
+                if engine.not_have[owners[j]] & bit:
+                    continue
+                if owners[j] == ENVELOPE and not cat & bit:
+                    continue
+                allowed[i, k] = 1
+        # Deal the most constrained cards first: fewer dead ends.
+        order = np.argsort(allowed.sum(axis=1), kind="stable")
+        allowed = allowed[order]
+        free = [free[i] for i in order]
+
+        # If card i is the last one that could still fill an open envelope
+        # slot, it is forced there; otherwise the sample would dead-end.
+        last_for_slot = {}
+        for k in range(len(column)):
+            if column[k] == 0:
+                eligible = np.nonzero(allowed[:, k])[0]
+                if len(eligible):
+                    last_for_slot[int(eligible[-1])] = k
+
+        local = {c: i for i, c in enumerate(free)}
+        # "At least one of" clauses: proposal column of the player and the
+        # clause's cards. When the last of those cards comes up and the
+        # clause is still open, the card is forced to that player.
+        clause_column, clause_at, clause_last = [], {}, {}
+        for q, (owner, mask) in enumerate(engine.open_clauses()):
+            clause_column.append(column.index(owners.index(owner)))
+            cs = sorted(local[c] for c in _bits(mask) if c in local)
+            for i in cs:
+                clause_at.setdefault(i, []).append(q)
+            if cs:
+                clause_last.setdefault(cs[-1], []).append(q)
+
+        return _Proposal(owners, column, caps, category, free, allowed,
+                         last_for_slot, clause_column, clause_at, clause_last)
+
+    def _draw(self, prop: "_Proposal", batch: int):
+        """One batch of proposed deals: (assign, weight) in the work buffers."""
+        free, column, allowed = prop.free, prop.column, prop.allowed
+        cap, avail, cum, assign, weight, z, u = self._buffers(batch, len(free), len(column))
+        cap[:] = prop.caps
+        weight.fill(1.0)
+        rows = np.arange(batch)
+        satisfied = np.zeros((batch, len(prop.clause_column)), dtype=np.bool_)
+        for i in range(len(free)):
+            np.multiply(cap, allowed[i], out=avail)
+            k = prop.last_for_slot.get(i)
+            if k is not None:
+                forced = cap[:, k] > 0
+                avail[forced] = 0
+                avail[forced, k] = 1
+            for q in prop.clause_last.get(i, ()):
+                k = prop.clause_column[q]
+                if allowed[i, k]:
+                    forced = ~satisfied[:, q] & (cap[:, k] > 0)
+                    avail[forced] = 0
+                    avail[forced, k] = cap[forced, k]
+            np.sum(avail, axis=1, out=z)
+            weight *= z
+            self.rng.random(out=u)
+            u *= z
+            np.cumsum(avail, axis=1, out=cum)
+            pick = (cum <= u[:, None]).sum(axis=1)
+            np.minimum(pick, len(column) - 1, out=pick)
+            assign[:, i] = pick
+            cap[rows, pick] -= z > 0
+            for q in prop.clause_at.get(i, ()):
+                satisfied[:, q] |= pick == prop.clause_column[q]
+        weight *= satisfied.all(axis=1)
+        return assign, weight
+
+    def sample(self, engine: DeductionEngine, n: int = 100_000) -> SampleResult:
+        start = time.perf_counter()
+        prop = self._proposal(engine)
+        owners = prop.owners
+
+        owner_freq = np.zeros((engine.num_cards, len(owners)), dtype=np.float64)
+        env_freq = np.zeros([bin(cat).count("1") for cat in CATEGORY_MASKS], dtype=np.float64)
+        column_arr = np.array(prop.column, dtype=np.intp)
+        free_arr = np.array(prop.free, dtype=np.intp)
+        env_slot = {prop.category[k]: k for k, j in enumerate(prop.column) if j == 0}
+        total_w = total_w2 = 0.0
+        accepted = attempted = 0
+
+        while attempted < n:
+            batch = min(self.batch_size, n - attempted)
+            attempted += batch
+            assign, weight = self._draw(prop, batch)
+            ok = weight > 0
+            accepted += int(ok.sum())
+            total_w += weight.sum()
+            total_w2 += np.square(weight).sum()
+            self._tally(assign, weight, free_arr, column_arr, env_slot, engine,
+                        owners, owner_freq, env_freq)
+
+        if total_w:
+            owner_freq /= total_w
+            env_freq /= total_w
+        return SampleResult(
+            owners=owners,
+            owner_freq=owner_freq,
+            envelope_freq=env_freq,
+            accepted=accepted,
+            attempted=attempted,
+            effective=total_w * total_w / total_w2 if total_w2 else 0.0,
+            seconds=time.perf_counter() - start,
+        )
+
+    def deals(self, engine: DeductionEngine, n: int) -> Tuple[List[Tuple[int, ...]], List[float]]:
+        """
+        Up to n individual deals instead of frequencies: the hidden hands of
+        each accepted sample as card masks in engine.player_ids order (known
+        cards included), and its importance weight. Drawing among them in
+        proportion to the weights gives deals from the exact posterior.
+        """
+        prop = self._proposal(engine)
+        hands, weights = [], []
+        attempted = 0
+        while attempted < n:
+            batch = min(self.batch_size, n - attempted)
+            attempted += batch
+            assign, weight = self._draw(prop, batch)
+            ok = weight > 0
+            if not ok.any():
+                continue
+            owner = np.array(prop.column, dtype=np.intp)[assign[ok]]
+            bits = np.left_shift(1, np.array(prop.free, dtype=np.int64))
+            columns = [
+                ((owner == j) * bits).sum(axis=1) | engine.has[p]
+                for j, p in enumerate(engine.player_ids, start=1)
+            ]
+            hands.extend(zip(*(c.tolist() for c in columns)))
+            weights.extend(weight[ok].tolist())
+        return hands, weights
+
+    def _tally(self, assign, weight, free_arr, column_arr, env_slot, engine,
+               owners, owner_freq, env_freq):
+        total = weight.sum()
+        if not total:
+            return
+        # cards already placed for certain
+        for j, o in enumerate(owners):
+            for c in _bits(engine.has[o]):
+                owner_freq[c, j] += total
+        if assign.shape[1]:
+            flat = free_arr * len(owners) + column_arr[assign]
+            owner_freq += np.bincount(
+                flat.ravel(),
+                weights=np.repeat(weight, assign.shape[1]),
+                minlength=owner_freq.size,
+            ).reshape(owner_freq.shape)
+
+        # Envelope triple, each card as its position within its category.
+        columns = []
+        for cat in CATEGORY_MASKS:
+            first = (cat & -cat).bit_length() - 1
+            known = engine.has[ENVELOPE] & cat
+            if known:
+                columns.append(np.full(len(weight), known.bit_length() - 1 - first))
+            else:
+                k = env_slot[cat]
+                # the free card assigned to envelope slot k in each sample
+                hit = assign == k
+                columns.append(free_arr[hit.argmax(axis=1)] - first)
+        s, w, r = columns
+        shape = env_freq.shape
+        flat = (s * shape[1] + w) * shape[2] + r
+        flat[weight == 0] = 0  # rejected samples may hold partial deals
+        env_freq += np.bincount(flat, weights=weight, minlength=env_freq.size).reshape(shape)
+
+
+_default: Optional[HandSampler] = None
+
+
+def sample_hands(engine: DeductionEngine, n: int = 100_000, seed=None) -> SampleResult:
+    """
+    Sample with a shared module-level HandSampler (buffers are reused).
+    A seed restarts its random stream, so equal seeds give equal results.
+    """
+    global _default
+    if _default is None:
+        _default = HandSampler(seed=seed)
+    elif seed is not None:
+        _default.rng = np.random.default_rng(seed)
+    return _default.sample(engine, n)
@@ -0,0 +1,342 @@
+# server.py
+# asyncio game server: many CluedoGame sessions, remote seats answer over JSON lines
+
+import argparse
+import asyncio
+import itertools
+import json
+from typing import Dict, List, Optional, Set, Tuple
+
+from agents import Agent
+from cards import CARD_NAMES, CHARACTER_IDS, ROOM_IDS, WEAPON_IDS, position_name
+from game import CluedoGame
+from output import INFO, NULL, Output, Sink
+
+# Protocol: one JSON object per line, both ways. Client -> server:
+#   {"op": "create", "players": 6, "humans": [0], "seed": 1, "narrate": false}
+#       creates a session; the creator takes every human seat unless "take"
+#       lists fewer (others can then "join")
+#   {"op": "join", "session": 3, "seat": 2}
+#   {"op": "answer", "session": 3, "id": 17, "value": ...}
+# Server -> client ("session" and "seat" on every message):
+#   created, start (with the seat's hand), ask (id, kind, options),
+#   error, shown (result of the seat's own suggestion), say (narration),
+#   over (winner seat or null)
+# Cards are card ids and board positions are position ids; "names" maps
+# them for display.
+
+
+class NeedInput(Exception):
+    """A remote seat has to answer before the turn can go on."""
+
+    def __init__(self, seat: int, kind: str, options):
+        super().__init__(kind)
+        self.seat = seat
+        self.kind = kind
+        self.options = options
+
+
+class RemoteAgent(Agent):
+    """
+    A seat played by a client. Answers for the current turn are queued on
+    the session; asking for one that has not arrived yet raises NeedInput.
+    """
+
+    def __init__(self, session: "Session", seat: int):
+        self.session = session
+        self.seat = seat
+
+    def _answer(self, kind: str, options):
+        return self.session.answer(self.seat, kind, options)
+
+    def choose_action(self, game, player):
+        return self._answer("action", ["A", "M"])
+
+    def use_secret_passage(self, game, player):
+        return self._answer("passage", [True, False])
+
+    def choose_destination(self, game, player, destinations):
+        return self._answer("destination", list(destinations))
+
+    def choose_suggestion(self, game, player, room):
+        suspect, weapon = self._answer(
+            "suggestion", {"suspects": list(CHARACTER_IDS), "weapons": list(WEAPON_IDS),
+                           "room": room}
+        )
+        return suspect, weapon
+
+    def choose_card_to_show(self, game, player, suggester, matching_cards):
+        card = self._answer("show", [c.id for c in matching_cards])
+        return next(c for c in matching_cards if c.id == card)
+
+    def choose_accusation(self, game, player):
+        return tuple(self._answer(
+            "accusation", {"suspects": list(CHARACTER_IDS), "weapons": list(WEAPON_IDS),
+                           "rooms": list(ROOM_IDS)}
+        ))
+
+    def suggestion_result(self, game, player, refuter, card):
+        self.session.post(self.seat, {
+            "type": "shown",
+            "refuter": None if refuter is None else game.players.index(refuter),
+            "card": None if card is None else card.id,
+        })
+
+
+def _valid(kind: str, options, value) -> bool:
+    # exact types: 1.0 and True compare equal to card id 1
+    if kind in ("suggestion", "accusation"):
+        keys = ("suspects", "weapons", "rooms")[: 2 if kind == "suggestion" else 3]
+        return (
+            isinstance(value, list)
+            and len(value) == len(keys)
+            and all(type(v) is int and v in options[k] for v, k in zip(value, keys))
+        )
+    return value in options and type(value) is type(options[0])
+
+
+class _SessionSink(Sink):
+    """Narration for every remote seat of a session."""
+
+    def __init__(self, session: "Session"):
+        self.level = INFO
+        self.session = session
+
+    def write(self, level, text):
+        self.session.post(None, {"type": "say", "text": text})
+
+
+class Session:
+    """
+    One game. Turns are played synchronously by CluedoGame; when a remote
+    seat is asked something it has not answered yet, the turn stops with
+    NeedInput, the question goes to the seat's client, and once the answer
+    is in the turn is replayed from its snapshot (dice included) with the
+    answers so far. Replays are deterministic, so only messages beyond what
+    was already sent go out. AI seats must decide deterministically (plain
+    AIAgent does; a wall-clock MCTS budget does not).
+    """
+
+    def __init__(self, server: "Server", sid: int, num_players: int, humans: Set[int],
+                 seed, narrate: bool):
+        self.server = server
+        self.id = sid
+        self.humans = humans
+        self.game = CluedoGame(
+            num_players=num_players,
+            ai_seats=[s for s in range(num_players) if s not in humans],
+            seed=seed,
+            output=Output(_SessionSink(self)) if narrate else NULL,
+        )
+        for seat in humans:
+            self.game.agents[seat] = RemoteAgent(self, seat)
+        self.seats: Dict[int, "Connection"] = {}
+        self.answers: List[object] = []  # this turn's answers, in order asked
+        self.cursor = 0
+        self.outbox: List[Tuple[Optional[int], dict]] = []  # this attempt's messages
+        self.question: Optional[Tuple[int, NeedInput, asyncio.Future]] = None
+        self.task: Optional[asyncio.Task] = None
+
+    # --- called from inside the game ---------------------------------------
+
+    def answer(self, seat: int, kind: str, options):
+        if self.cursor < len(self.answers):
+            value = self.answers[self.cursor]
+            self.cursor += 1
+            return value
+        raise NeedInput(seat, kind, options)
+
+    def post(self, seat: Optional[int], message: dict) -> None:
+        """Queue a message for one seat, or every remote seat (None)."""
+        self.outbox.append((seat, message))
+
+    # --- event loop side ------------------------------------------------------
+
+    def join(self, seat: int, conn: "Connection") -> None:
+        if seat not in self.humans or seat in self.seats:
+            raise ValueError(f"seat {seat} is not open")
+        self.seats[seat] = conn
+        conn.sessions.add(self)
+        if len(self.seats) == len(self.humans):
+            self.task = asyncio.ensure_future(self.run())
+
+    def _send(self, seat: Optional[int], message: dict) -> None:
+        for s in (self.seats if seat is None else (seat,)):
+            self.seats[s].send({"session": self.id, "seat": s, **message})
+
+    def _flush(self, sent: int) -> int:
+        for seat, message in self.outbox[sent:]:
+            self._send(seat, message)
+        return len(self.outbox)
+
+    async def _ask(self, need: NeedInput):
+        qid = next(self.server.question_ids)
+        future = asyncio.get_event_loop().create_future()
+        self.question = (qid, need, future)
+        self._send(need.seat, {"type": "ask", "id": qid, "kind": need.kind,
+                               "options": need.options})
+        try:
+            return await future
+        finally:
+            self.question = None
+
+    def receive(self, conn: "Connection", qid: int, value) -> None:
+        if self.question is None or self.question[0] != qid:
+            raise ValueError("no such question")
+        _, need, future = self.question
+        if self.seats.get(need.seat) is not conn:
+            raise ValueError("not your question")
+        if not _valid(need.kind, need.options, value):
+            raise ValueError(f"invalid {need.kind}: {value!r}")
+        future.set_result(value)
+
+    async def run(self) -> None:
+        game = self.game
+        for seat, conn in self.seats.items():
+            self._send(seat, {"type": "start", "players": len(game.players),
+                              "hand": [c.id for c in game.players[seat].hand]})
+        try:
+            while not game.game_over:
+                state = game.snapshot(rng=True)
+                self.answers = []
+                sent = 0
+                while True:
+                    self.cursor = 0
+                    self.outbox = []
+                    try:
+                        game.play_turn()
+                        break
+                    except NeedInput as need:
+                        sent = self._flush(sent)
+                        self.answers.append(await self._ask(need))
+                        game.restore(state)
+                self._flush(sent)
+                self.server.turns += 1
+                await asyncio.sleep(0)  # let other sessions play
+            winner = game.winner
+            self._send(None, {"type": "over",
+                              "winner": None if winner is None else game.players.index(winner)})
+            self.server.finished += 1
+        except Exception as e:
+            # the seats would otherwise wait for a reply forever
+            self._send(None, {"type": "error", "error": f"session failed: {e!r}"})
+            self._send(None, {"type": "over", "winner": None})
+        finally:
+            self.server.close_session(self)
+
+
+class Connection:
+    """One client socket; it may hold seats in many sessions."""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.sessions: Set[Session] = set()
+
+    def send(self, message: dict) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(json.dumps(message).encode() + b"\n")
+
+
+class Server:
+    """Hosts the sessions and routes client messages to them."""
+
+    def __init__(self, max_sessions: int = 2000):
+        self.max_sessions = max_sessions
+        self.sessions: Dict[int, Session] = {}
+        self.session_ids = itertools.count(1)
+        self.question_ids = itertools.count(1)
+        self.turns = 0
+        self.finished = 0
+
+    def close_session(self, session: Session) -> None:
+        self.sessions.pop(session.id, None)
+        for conn in session.seats.values():
+            conn.sessions.discard(session)
+
+    def _create(self, conn: Connection, msg: dict) -> None:
+        if len(self.sessions) >= self.max_sessions:
+            raise ValueError("server full")
+        players = int(msg.get("players", 6))
+        humans = set(msg.get("humans", [0]))
+        if not humans or not humans <= set(range(players)):
+            raise ValueError("humans must be seats of the game")
+        session = Session(self, next(self.session_ids), players, humans,
+                          msg.get("seed"), bool(msg.get("narrate", False)))
+        self.sessions[session.id] = session
+        conn.send({"type": "created", "session": session.id,
+                   "tag": msg.get("tag"), "humans": sorted(humans)})
+        for seat in sorted(msg.get("take", humans)):
+            session.join(seat, conn)
+
+    def _dispatch(self, conn: Connection, msg: dict) -> None:
+        op = msg.get("op")
+        if op == "create":
+            self._create(conn, msg)
+            return
+        if op == "names":
+            conn.send({"type": "names", "cards": CARD_NAMES,
+                       "positions": [position_name(p) for p in msg.get("positions", [])]})
+            return
+        session = self.sessions.get(msg.get("session"))
+        if session is None:
+            raise ValueError("no such session")
+        if op == "join":
+            session.join(int(msg["seat"]), conn)
+        elif op == "answer":
+            session.receive(conn, msg.get("id"), msg.get("value"))
+        else:
+            raise ValueError(f"unknown op {op!r}")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        conn = Connection(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                msg = None
+                try:
+                    msg = json.loads(line)
+                    self._dispatch(conn, msg)
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    session = msg.get("session") if isinstance(msg, dict) else None
+                    conn.send({"type": "error", "session": session, "error": str(e)})
+                await writer.drain()
+        finally:
+            # a game cannot go on without its remote seats
+            for session in list(conn.sessions):
+                if session.task is not None:
+                    session.task.cancel()
+                self.close_session(session)
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765,
+                    unix: Optional[str] = None):
+        if unix:
+            return await asyncio.start_unix_server(self.handle, path=unix)
+        return await asyncio.start_server(self.handle, host, port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host many Cluedo sessions over JSON lines.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--max-sessions", type=int, default=2000)
+    args = parser.parse_args()
+
+    async def run():
+        server = Server(args.max_sessions)
+        listener = await server.serve(args.host, args.port, args.unix)
+        print(f"Listening on {args.unix or f'{args.host}:{args.port}'}")
+        async with listener:
+            await listener.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+# simulate.py
+# Headless batch simulation: every seat is an AI, no console I/O
+
+import argparse
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from board import Board
+from eventlog import INDEX, EventLog
+from game import CluedoGame
+from grid_board import GridBoard
+from kb_bits import BitsetAIPlayer
+from mcts import MCTSAgent, SearchStats, close_pools, mcts_seats
+from players import AIPlayer
+from profiling import Profiler
+
+# --kb choices: knowledge-base implementation used by every AI seat
+KB_CLASSES = {"set": AIPlayer, "bitset": BitsetAIPlayer}
+
+# --board choices: room graph or square-level grid
+BOARD_CLASSES = {"graph": Board, "grid": GridBoard}
+
+
+class GameResult(NamedTuple):
+    """Compact per-game outcome, cheap to pickle between processes."""
+
+    game_index: int
+    winner_seat: int  # -1 = no winner
+    turns: int
+    wrong_accusations: int
+    solution: Tuple[str, str, str]
+
+
+@dataclass
+class SimulationReport:
+    games: int
+    seconds: float
+    wins_by_seat: Dict[int, int] = field(default_factory=dict)
+    no_winner: int = 0
+    total_turns: int = 0
+    wrong_accusations: int = 0
+    search: Optional[SearchStats] = None  # MCTS seats' search cost, if any
+    profile: Optional[Profiler] = None  # phase timings, if profiled
+
+    @property
+    def games_per_sec(self) -> float:
+        return self.games / self.seconds if self.seconds else float("inf")
+
+    def add(self, result: GameResult) -> None:
+        """Merge one game's result into the totals."""
+        self.total_turns += result.turns
+        self.wrong_accusations += result.wrong_accusations
+        if result.winner_seat < 0:
+            self.no_winner += 1
+        else:
+            seat = result.winner_seat
+            self.wins_by_seat[seat] = self.wins_by_seat.get(seat, 0) + 1
+
+    def __str__(self):
+        lines = [
+            f"Games played:       {self.games}",
+            f"Elapsed:            {self.seconds:.2f}s",
+            f"Games/sec:          {self.games_per_sec:.1f}",
+            f"Avg turns/game:     {self.total_turns / max(self.games, 1):.1f}",
+            f"Wrong accusations:  {self.wrong_accusations}",
+            f"No winner:          {self.no_winner}",
+        ]
+        for seat in sorted(self.wins_by_seat):
+            lines.append(f"Wins seat {seat}:        {self.wins_by_seat[seat]}")
+        if self.search is not None:
+            lines += [
+                f"Search decisions:   {self.search.decisions}",
+                f"Decisions/sec:      {self.search.decisions_per_sec:.1f}",
+                f"Rollouts/decision:  {self.search.iterations_per_decision:.1f}",
+            ]
+        return "\n".join(lines)
+
+
+def game_seed(base_seed, game_index: int) -> str:
+    """Per-game seed derived from the run seed; independent of scheduling."""
+    return f"{base_seed}:{game_index}"
+
+
+def resolve_seed(seed: Optional[int]) -> int:
+    """A fixed run seed, drawing a fresh one when none is given."""
+    return random.randrange(2**32) if seed is None else seed
+
+
+def play_game(
+    game_index: int,
+    base_seed: int,
+    num_players: int = 6,
+    max_turns: int = 1000,
+    ai_class: type = AIPlayer,
+    accuse_confidence: float = 1.0,
+    board_class: type = Board,
+    event_log: Optional[EventLog] = None,
+    seat_classes: Optional[Dict[int, type]] = None,
+    search_stats: Optional[SearchStats] = None,
+    profiler: Optional[Profiler] = None,
+    deal=None,
+    infogain: bool = False,
+) -> GameResult:
+    """
+    Play one seeded all-AI game headless and summarise it. seat_classes
+    overrides ai_class per seat (see mcts_seats); the MCTS agents' search
+    cost is added to search_stats, and the game's phases are timed by
+    profiler. deal replaces the seeded deal (e.g. deals.game_deal(row)).
+    infogain: every AI suggests by expected information gain.
+    """
+    game = CluedoGame(
+        num_players=num_players,
+        ai_seats=range(num_players),
+        verbose=False,
+        max_turns=max_turns,
+        seed=game_seed(base_seed, game_index),
+        ai_class=ai_class,
+        board_class=board_class,
+        event_log=event_log,
+        seat_classes=seat_classes,
+        deal=deal,
+    )
+    for p in game.players:
+        p.accuse_confidence = accuse_confidence
+        p.infogain = infogain
+    if profiler is not None:
+        profiler.attach(game)
+    winner = game.run()
+    if profiler is not None:
+        profiler.finish(game)
+    if search_stats is not None:
+        for agent in game.agents:
+            if isinstance(agent, MCTSAgent):
+                search_stats.add(agent.stats)
+    if event_log is not None:
+        event_log.append(INDEX, game_index >> 16 & 0xFF, game_index & 0xFFFF)
+    return GameResult(
+        game_index=game_index,
+        winner_seat=-1 if winner is None else game.players.index(winner),
+        turns=game.turn_count,
+        wrong_accusations=game.wrong_accusations,
+        solution=tuple(card.name for card in game.solution),
+    )
+
+
+def simulate(
+    n_games: int,
+    seed: Optional[int] = None,
+    num_players: int = 6,
+    max_turns: int = 1000,
+    ai_class: type = AIPlayer,
+    accuse_confidence: float = 1.0,
+    board_class: type = Board,
+    seat_classes: Optional[Dict[int, type]] = None,
+    profile: bool = False,
+    infogain: bool = False,
+) -> SimulationReport:
+    """Play n_games all-AI games headless and report throughput."""
+    seed = resolve_seed(seed)
+    report = SimulationReport(games=n_games, seconds=0.0)
+    if seat_classes:
+        report.search = SearchStats()
+    if profile:
+        report.profile = Profiler()
+
+    start = time.perf_counter()
+    for i in range(n_games):
+        report.add(
+            play_game(
+                i, seed, num_players, max_turns, ai_class, accuse_confidence, board_class,
+                seat_classes=seat_classes, search_stats=report.search,
+                profiler=report.profile, infogain=infogain,
+            )
+        )
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def add_search_arguments(parser: argparse.ArgumentParser) -> None:
+    """--mcts and the search options, shared with tournament.py."""
+    parser.add_argument(
+        "--mcts", type=int, nargs="*", default=[], metavar="SEAT",
+        help="seats played by mcts.MCTSPlayer",
+    )
+    parser.add_argument("--budget", type=float, default=0.05, help="seconds per decision")
+    parser.add_argument(
+        "--iterations", type=int, default=None,
+        help="rollouts per decision instead of a time budget (reproducible)",
+    )
+    parser.add_argument("--horizon", type=int, default=6, help="turns simulated per rollout")
+    parser.add_argument("--search-workers", type=int, default=1)
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """--profile and its export files, shared with tournament.py."""
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="time every turn phase and print histograms (profiling.py)",
+    )
+    parser.add_argument("--profile-json", metavar="PATH", help="write the profile as JSON")
+    parser.add_argument(
+        "--flamegraph", metavar="PATH", help="write the profile as collapsed stacks",
+    )
+
+
+def profiling_requested(args) -> bool:
+    return bool(args.profile or args.profile_json or args.flamegraph)
+
+
+def report_profile(args, profile: Optional[Profiler]) -> None:
+    if profile is None:
+        return
+    if args.profile:
+        print()
+        print(profile)
+    if args.profile_json:
+        profile.write_json(args.profile_json)
+    if args.flamegraph:
+        profile.write_collapsed(args.flamegraph)
+
+
+def search_seat_classes(args) -> Optional[Dict[int, type]]:
+    if not args.mcts:
+        return None
+    return mcts_seats(
+        args.mcts,
+        budget=args.budget,
+        iterations=args.iterations,
+        horizon=args.horizon,
+        workers=args.search_workers,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless all-AI Cluedo games.")
+    parser.add_argument("-n", "--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--max-turns", type=int, default=1000)
+    parser.add_argument("--kb", choices=sorted(KB_CLASSES), default="set")
+    parser.add_argument("--board", choices=sorted(BOARD_CLASSES), default="graph")
+    parser.add_argument(
+        "--confidence", type=float, default=1.0,
+        help="accuse once the best envelope triple has this probability",
+    )
+    parser.add_argument(
+        "--infogain", action="store_true",
+        help="suggest by expected information gain (fewer turns, slower games)",
+    )
+    add_search_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        report = simulate(
+            args.games,
+            args.seed,
+            args.players,
+            args.max_turns,
+            KB_CLASSES[args.kb],
+            args.confidence,
+            BOARD_CLASSES[args.board],
+            search_seat_classes(args),
+            profiling_requested(args),
+            args.infogain,
+        )
+    finally:
+        close_pools()
+    print(report)
+    report_profile(args, report.profile)
+
+
+if __name__ == "__main__":
+    main()
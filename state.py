@@ -0,0 +1,32 @@
+# state.py
+# Compact immutable game state, for cheap snapshot/restore in tree search
+
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+
+class GameState(NamedTuple):
+    """
+    Everything CluedoGame.restore() needs to put a game back where it was.
+    The board, agents, event log and settings are not part of it: they never
+    change during a game and are shared between snapshots.
+    """
+
+    positions: Tuple[int, ...]  # seat -> position id
+    weapons: Tuple[int, ...]  # weapon token (WEAPON_IDS order) -> room position id
+    hands: Tuple[int, ...]  # seat -> card bitmask; the envelope is the rest
+    eliminated: int  # bit per seat
+    current: int  # seat to play
+    turn_count: int
+    wrong_accusations: int
+    winner: int  # seat, -1 = none yet
+    game_over: bool
+    knowledge: Tuple[Optional[tuple], ...]  # seat -> snapshot_kb(), None if not AI
+    rng: Optional[tuple] = None  # random.Random.getstate(), if asked for
+
+
+def hand_mask(cards: Iterable) -> int:
+    """Bitmask of a list of Cards."""
+    mask = 0
+    for card in cards:
+        mask |= 1 << card.id
+    return mask
@@ -0,0 +1,100 @@
+# test_deduction.py
+# Deduction rules, and each AI's private layer over the shared public engine
+
+import pytest
+
+from cards import CATEGORY_MASKS, SUSPECT_MASK
+from deduction import DeductionEngine, ENVELOPE
+from game import CluedoGame
+from kb_bits import BitsetAIPlayer
+from players import AIPlayer
+from public_kb import PrivateKnowledge
+from simulate import game_seed
+
+PLAYERS = [0, 1, 2, 3, 4, 5]
+
+
+def _bits(mask):
+    return [c for c in range(mask.bit_length()) if mask >> c & 1]
+
+
+@pytest.fixture
+def engine():
+    return DeductionEngine.for_deal(PLAYERS)
+
+
+def test_has_rules_out_every_other_owner(engine):
+    engine.add_has(2, 7)
+    for o in engine.owners:
+        assert bool(engine.not_have[o] >> 7 & 1) == (o != 2)
+
+
+def test_last_possible_owner_holds_the_card(engine):
+    for o in engine.owners[:-1]:
+        engine.add_not_have(o, 4)
+    assert engine.has[ENVELOPE] >> 4 & 1
+
+
+def test_envelope_holds_one_card_per_category(engine):
+    suspect = _bits(SUSPECT_MASK)[0]
+    engine.add_has(ENVELOPE, suspect)
+    assert engine.not_have[ENVELOPE] & SUSPECT_MASK == SUSPECT_MASK & ~(1 << suspect)
+
+
+def test_clause_becomes_a_fact(engine):
+    engine.add_at_least_one(3, 1 << 0 | 1 << 8 | 1 << 15)
+    engine.add_none_of(3, 1 << 0 | 1 << 8)
+    assert engine.has[3] >> 15 & 1
+    assert engine.open_clauses() == []
+
+
+def test_full_hand_rules_out_the_rest(engine):
+    hand = _bits(engine.all_cards)[: engine.hand_sizes[1]]
+    for c in hand:
+        engine.add_has(1, c)
+    assert engine.not_have[1] == engine.all_cards & ~engine.has[1]
+
+
+def test_snapshot_restore_round_trip(engine):
+    engine.add_has(0, 2)
+    engine.add_at_least_one(1, 1 << 9 | 1 << 12)
+    snap = engine.snapshot()
+    engine.add_has(1, 9)
+    engine.add_none_of(4, CATEGORY_MASKS[2])
+    engine.restore(snap)
+    assert engine.snapshot() == snap
+    engine.add_has(1, 9)
+    assert engine.open_clauses() == []
+
+
+@pytest.mark.parametrize("ai_class", [AIPlayer, BitsetAIPlayer])
+def test_private_layer_matches_standalone_engines(ai_class):
+    """Every AI knows the same with a shared public engine as with its own."""
+    for i in range(20):
+        seed = game_seed(3, i)
+        shared = CluedoGame(ai_seats=range(6), verbose=False, seed=seed,
+                            ai_class=ai_class, shared_kb=True)
+        alone = CluedoGame(ai_seats=range(6), verbose=False, seed=seed,
+                           ai_class=ai_class, shared_kb=False)
+        assert isinstance(shared.players[0].engine, PrivateKnowledge)
+        while not shared.game_over:
+            shared.play_turn()
+            alone.play_turn()
+            for p, q in zip(shared.players, alone.players):
+                assert p.engine.has == q.engine.has
+                assert p.engine.not_have == q.engine.not_have
+        assert alone.game_over and shared.turn_count == alone.turn_count
+
+
+def test_private_snapshot_restores_into_a_plain_engine():
+    game = CluedoGame(ai_seats=range(6), verbose=False, seed=game_seed(4, 0))
+    for _ in range(30):
+        if not game.game_over:
+            game.play_turn()
+    kb = game.players[0].engine
+    assert isinstance(kb, PrivateKnowledge)
+    plain = DeductionEngine.for_deal(kb.player_ids, kb.num_cards)
+    plain.restore(kb.snapshot())
+    assert plain.has == kb.has
+    assert plain.not_have == kb.not_have
+    assert sorted(plain.open_clauses()) == sorted(kb.open_clauses())
@@ -0,0 +1,44 @@
+# test_eventlog.py
+# A game rebuilt from its event log equals the game that was played
+
+import pytest
+
+from eventlog import EventLog, replay
+from game import CluedoGame
+from kb_bits import BitsetAIPlayer
+from players import AIPlayer
+from simulate import game_seed
+
+
+def _state(game):
+    return (
+        [p.position for p in game.players],
+        [p.eliminated for p in game.players],
+        [w.location for w in game.weapons.values()],
+        game.turn_count,
+        game.wrong_accusations,
+        None if game.winner is None else game.players.index(game.winner),
+        [(p.engine.has, p.engine.not_have) for p in game.players],
+    )
+
+
+@pytest.mark.parametrize("ai_class", [AIPlayer, BitsetAIPlayer])
+def test_replay_equals_live_game(ai_class):
+    log = EventLog()
+    played = []
+    for i in range(10):
+        game = CluedoGame(ai_seats=range(6), verbose=False, seed=game_seed(6, i),
+                          ai_class=ai_class, event_log=log)
+        game.run()
+        played.append(_state(game))
+
+    loaded = EventLog.from_bytes(log.to_bytes())
+    games = loaded.games()
+    assert len(games) == len(played)
+    for words, state in zip(games, played):
+        assert _state(replay(words, ai_class)) == state
+
+
+def test_replay_rejects_a_log_without_a_game_event():
+    with pytest.raises(ValueError):
+        replay([])
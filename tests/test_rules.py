@@ -0,0 +1,60 @@
+# test_rules.py
+# Ruleset parsing and the compiled cache next to each JSON file
+
+import json
+import os
+import pickle
+import shutil
+
+import pytest
+
+import rules
+
+
+@pytest.fixture
+def classic(tmp_path):
+    path = str(tmp_path / "classic.json")
+    shutil.copy(os.path.join(rules.RULESETS_DIR, "classic.json"), path)
+    return path
+
+
+def test_compile_then_load_from_cache(classic):
+    first = rules.load(classic)
+    assert os.path.exists(rules.compiled_path(classic))
+    assert rules.load(classic) == first
+    with open(classic) as f:
+        assert rules.parse(json.load(f)) == first
+    assert first.max_players == 6 and first.num_cards == 21
+
+
+def test_edited_source_is_recompiled(classic):
+    rules.load(classic)
+    with open(classic) as f:
+        data = json.load(f)
+    data["name"] = "edited"
+    with open(classic, "w") as f:
+        json.dump(data, f)
+    assert rules.load(classic).name == "edited"
+
+
+def test_unreadable_cache_is_rebuilt(classic):
+    with open(rules.compiled_path(classic), "wb") as f:
+        f.write(b"not a pickle")
+    assert rules.load(classic).name == "classic"
+    with open(rules.compiled_path(classic), "rb") as f:
+        assert pickle.load(f)["version"] == rules.COMPILED_VERSION
+
+
+def test_generated_variant_round_trips_through_json():
+    variant = rules.generate(8, 7, 12, seed=3, passages=2)
+    assert rules.parse(variant.to_json()) == variant
+
+
+def test_parse_rejects_bad_rulesets():
+    data = rules.generate(3, 3, 4).to_json()
+    with pytest.raises(ValueError):
+        rules.parse(dict(data, weapons=[data["characters"][0], *data["weapons"][1:]]))
+    with pytest.raises(ValueError):
+        rules.parse(dict(data, edges=[["Room 1", "Cellar"]]))
+    with pytest.raises(ValueError):
+        rules.parse(dict(data, doors={}))
@@ -0,0 +1,40 @@
+# test_server.py
+# Validation of client answers (server._valid)
+
+from cards import CHARACTER_IDS, ROOM_IDS, WEAPON_IDS
+from server import _valid
+
+SUGGESTION = {"suspects": list(CHARACTER_IDS), "weapons": list(WEAPON_IDS), "room": ROOM_IDS[0]}
+ACCUSATION = {"suspects": list(CHARACTER_IDS), "weapons": list(WEAPON_IDS),
+              "rooms": list(ROOM_IDS)}
+
+
+def test_suggestion():
+    assert _valid("suggestion", SUGGESTION, [CHARACTER_IDS[0], WEAPON_IDS[0]])
+    assert not _valid("suggestion", SUGGESTION, [WEAPON_IDS[0], CHARACTER_IDS[0]])
+    assert not _valid("suggestion", SUGGESTION, [CHARACTER_IDS[0]])
+    assert not _valid("suggestion", SUGGESTION, (CHARACTER_IDS[0], WEAPON_IDS[0]))
+
+
+def test_accusation():
+    triple = [CHARACTER_IDS[1], WEAPON_IDS[2], ROOM_IDS[3]]
+    assert _valid("accusation", ACCUSATION, triple)
+    assert not _valid("accusation", ACCUSATION, triple[:2])
+    assert not _valid("accusation", ACCUSATION, [triple[0], triple[1], WEAPON_IDS[0]])
+
+
+def test_exact_types():
+    # 1.0 and True compare equal to card id 1
+    assert not _valid("accusation", ACCUSATION,
+                      [float(CHARACTER_IDS[1]), WEAPON_IDS[0], ROOM_IDS[0]])
+    assert not _valid("show", [0, 1, 2], True)
+    assert not _valid("show", [0, 1, 2], 1.0)
+    assert _valid("show", [0, 1, 2], 1)
+    assert _valid("passage", [True, False], False)
+    assert not _valid("passage", [True, False], 0)
+
+
+def test_choice_from_options():
+    assert _valid("action", ["A", "M"], "M")
+    assert not _valid("action", ["A", "M"], "X")
+    assert not _valid("destination", [3, 4], 5)
@@ -0,0 +1,44 @@
+# test_state.py
+# Game snapshot / restore round trips, directly and through batch.GameArrays
+
+import pytest
+
+from batch import GameArrays
+from game import CluedoGame
+from kb_bits import BitsetAIPlayer
+from players import AIPlayer
+from simulate import game_seed
+
+
+def _knowledge(game):
+    return [(dict(p.engine.has), dict(p.engine.not_have)) for p in game.players]
+
+
+def _finish(game):
+    while not game.game_over:
+        game.play_turn()
+    return game.turn_count, game.winner and game.winner.id
+
+
+@pytest.mark.parametrize("ai_class", [AIPlayer, BitsetAIPlayer])
+def test_restore_replays_the_same_game(ai_class):
+    arrays = GameArrays(1, rng=True)
+    for i in range(10):
+        game = CluedoGame(ai_seats=range(6), verbose=False, seed=game_seed(8, i),
+                          ai_class=ai_class)
+        for _ in range(8):
+            if not game.game_over:
+                game.play_turn()
+        snap = game.snapshot(rng=True)
+        knowledge = _knowledge(game)
+        end = _finish(game)
+
+        game.restore(snap)
+        assert _knowledge(game) == knowledge
+        assert game.snapshot(rng=True) == snap
+        assert _finish(game) == end
+
+        arrays.store(0, snap)
+        game.restore(arrays.load(0))
+        assert _knowledge(game) == knowledge
+        assert _finish(game) == end
@@ -0,0 +1,10 @@
+# test_tournament.py
+# Tournament results depend only on the seed, not on the number of workers
+
+from tournament import run_tournament
+
+
+def test_digest_is_independent_of_workers():
+    one = run_tournament(300, seed=5, workers=1)
+    four = run_tournament(300, seed=5, workers=4)
+    assert one.digest() == four.digest() == "469220449c2d128f"
@@ -0,0 +1,219 @@
+# tournament.py
+# Multi-core tournament runner: seeded all-AI games spread over a process pool
+
+import argparse
+import hashlib
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from multiprocessing import Pool
+from typing import Callable, Dict, Iterable, List, Optional
+
+from board import Board
+from eventlog import EventLog
+from mcts import SearchStats, close_pools
+from players import AIPlayer
+from profiling import Profiler
+from simulate import (
+    BOARD_CLASSES,
+    KB_CLASSES,
+    GameResult,
+    SimulationReport,
+    add_profile_arguments,
+    add_search_arguments,
+    play_game,
+    profiling_requested,
+    report_profile,
+    resolve_seed,
+    search_seat_classes,
+)
+
+
+@dataclass
+class TournamentReport(SimulationReport):
+    seed: int = 0
+    workers: int = 1
+    results: List[GameResult] = field(default_factory=list)
+
+    def digest(self) -> str:
+        """Fingerprint of all results; equal for equal seeds at any worker count."""
+        h = hashlib.sha256()
+        for r in sorted(self.results):
+            h.update(repr(r).encode())
+        return h.hexdigest()[:16]
+
+    def __str__(self):
+        return (
+            super().__str__()
+            + f"\nWorkers:            {self.workers}"
+            + f"\nSeed:               {self.seed}"
+            + f"\nResult digest:      {self.digest()}"
+        )
+
+
+def run_tournament(
+    n_games: int,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    num_players: int = 6,
+    max_turns: int = 1000,
+    ai_class: type = AIPlayer,
+    accuse_confidence: float = 1.0,
+    board_class: type = Board,
+    on_result: Optional[Callable[[GameResult], None]] = None,
+    log_path: Optional[str] = None,
+    seat_classes: Optional[Dict[int, type]] = None,
+    profile: bool = False,
+    infogain: bool = False,
+) -> TournamentReport:
+    """
+    Play n_games seeded games across a process pool. Results are merged as
+    they stream back (on_result is called for each one), not after the pool
+    drains. Each game owns its RNG, so the outcome only depends on seed.
+    log_path: append every game's binary event log (eventlog.py) to this
+    file, in the order games finish.
+    seat_classes: per-seat player classes (see mcts.mcts_seats); the search
+    cost of MCTS seats is summed in report.search.
+    profile: time every game's phases (profiling.py); the workers'
+    profiles are merged into report.profile.
+    infogain: every AI suggests by expected information gain.
+    """
+    seed = resolve_seed(seed)
+    workers = workers or os.cpu_count() or 1
+    report = TournamentReport(games=n_games, seconds=0.0, seed=seed, workers=workers)
+    extended = log_path is not None or bool(seat_classes) or profile
+    if seat_classes:
+        report.search = SearchStats()
+    if profile:
+        report.profile = Profiler()
+    job = partial(
+        partial(_extended_game, log=log_path is not None, profile=profile)
+        if extended else play_game,
+        base_seed=seed,
+        num_players=num_players,
+        max_turns=max_turns,
+        ai_class=ai_class,
+        accuse_confidence=accuse_confidence,
+        board_class=board_class,
+        seat_classes=seat_classes,
+        infogain=infogain,
+    )
+
+    # Large enough chunks to amortise IPC, small enough to balance the tail.
+    chunksize = max(1, n_games // (workers * 16))
+
+    log_file = open(log_path, "ab") if log_path is not None else None
+    start = time.perf_counter()
+    try:
+        if workers == 1:
+            for result in map(job, range(n_games)):
+                _merge(report, result, on_result, log_file, extended)
+        else:
+            with Pool(workers) as pool:
+                for result in pool.imap_unordered(job, range(n_games), chunksize):
+                    _merge(report, result, on_result, log_file, extended)
+    finally:
+        if log_file is not None:
+            log_file.close()
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def _extended_game(game_index: int, log: bool, profile: bool, **kwargs):
+    """
+    play_game, also returning the game's encoded event log (if log), its
+    search cost (if any seat searches) and its profile (if profile).
+    """
+    events = EventLog() if log else None
+    search = SearchStats() if kwargs.get("seat_classes") else None
+    profiler = Profiler() if profile else None
+    result = play_game(
+        game_index, event_log=events, search_stats=search, profiler=profiler, **kwargs
+    )
+    return result, None if events is None else events.to_bytes(), search, profiler
+
+
+def _merge(report: TournamentReport, result, on_result, log_file=None,
+           extended: bool = False) -> None:
+    if extended:  # an _extended_game tuple
+        result, events, search, profile = result
+        if events is not None:
+            log_file.write(events)
+        if search is not None:
+            report.search.add(search)
+        if profile is not None:
+            report.profile.merge(profile)
+    report.add(result)
+    report.results.append(result)
+    if on_result is not None:
+        on_result(result)
+
+
+def win_rate_gain(report: TournamentReport, baseline: TournamentReport,
+                  seats: Iterable[int]) -> str:
+    """
+    Win rate of each seat against the same seeds with plain AI seats, with
+    the standard error of the change (as if the two runs were independent).
+    """
+    lines = []
+    for seat in seats:
+        new = report.wins_by_seat.get(seat, 0) / max(report.games, 1)
+        old = baseline.wins_by_seat.get(seat, 0) / max(baseline.games, 1)
+        se = math.sqrt((new * (1 - new) + old * (1 - old)) / max(report.games, 1))
+        lines.append(
+            f"Seat {seat} win rate:    {old:.1%} (baseline) -> {new:.1%}"
+            f" ({new - old:+.1%}, s.e. {se:.1%})"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a multi-core Cluedo AI tournament.")
+    parser.add_argument("-n", "--games", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--max-turns", type=int, default=1000)
+    parser.add_argument("--kb", choices=sorted(KB_CLASSES), default="set")
+    parser.add_argument("--board", choices=sorted(BOARD_CLASSES), default="graph")
+    parser.add_argument(
+        "--confidence", type=float, default=1.0,
+        help="accuse once the best envelope triple has this probability",
+    )
+    parser.add_argument(
+        "--infogain", action="store_true",
+        help="suggest by expected information gain (fewer turns, slower games)",
+    )
+    parser.add_argument("--log", default=None, help="append binary event logs to this file")
+    add_search_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    run = partial(
+        run_tournament,
+        args.games,
+        resolve_seed(args.seed),
+        args.workers,
+        args.players,
+        args.max_turns,
+        KB_CLASSES[args.kb],
+        args.confidence,
+        BOARD_CLASSES[args.board],
+        infogain=args.infogain,
+    )
+    try:
+        report = run(log_path=args.log, seat_classes=search_seat_classes(args),
+                     profile=profiling_requested(args))
+    finally:
+        close_pools()
+    print(report)
+    report_profile(args, report.profile)
+    if args.mcts:
+        # same seeds, every seat a plain AI
+        print(win_rate_gain(report, run(), args.mcts))
+
+
+if __name__ == "__main__":
+    main()
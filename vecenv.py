@@ -0,0 +1,302 @@
+# vecenv.py
+# Batched vector environment: thousands of games stepped in lockstep on NumPy arrays
+
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from board import Board, MAX_ROLL
+from cards import CARDS, CHARACTER_IDS, ROOM_IDS, WEAPON_IDS
+
+# One action per env for the seat to act, as a structured array (empty_actions):
+# accuse with (suspect, weapon, room), or take the secret passage / roll and
+# move as far towards `room` as the dice allow, then suggest (suspect, weapon)
+# if the move ends in a room. Ids are card ids.
+ACTION_DTYPE = np.dtype([
+    ("accuse", np.bool_),
+    ("passage", np.bool_),
+    ("room", np.int16),
+    ("suspect", np.int16),
+    ("weapon", np.int16),
+])
+
+NUM_CARDS = len(CARDS)
+NOBODY = -1  # refuter / shown card / winner when there is none
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer on a uint64 array: the counter-based RNG's hash."""
+    x = x + _GOLDEN
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _toward_tables(board: Board) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    position x room x roll -> where a token ends moving towards the room:
+    the room itself if the roll reaches it, else the reachable position
+    nearest to it (rooms before start nodes, then lowest id). Start nodes
+    are dead ends off a room, so this never lands on one another token could
+    block, and Board.moves' blocking never changes the outcome. Also
+    position -> secret passage destination, or -1.
+    """
+    rooms = [p for p in board.positions if p < len(ROOM_IDS)]
+    toward = np.zeros((len(board.positions), len(rooms), MAX_ROLL + 1), np.int16)
+    for p in board.positions:
+        for r in rooms:
+            toward[p, r, 0] = p
+            for roll in range(1, MAX_ROLL + 1):
+                toward[p, r, roll] = min(
+                    board.moves(p, roll),
+                    key=lambda d: (board.distance(d, r), d >= len(rooms), d),
+                )
+    passage = np.full(len(board.positions), -1, np.int16)
+    for a, b in board.secret_passages.items():
+        passage[a] = b
+    return toward, passage
+
+
+class VectorEnv:
+    """
+    num_envs games of num_players seats in lockstep. Every step() plays one
+    turn of the seat to act in every env (self-play: the caller chooses for
+    all seats). The rules are CluedoGame's, computed on arrays across the
+    whole batch: dice, movement (Board tables), refutation (nearest holder
+    clockwise, showing its lowest matching card, as AIAgent with hands in
+    card-id order) and accusation checks. An eliminated seat's turn passes.
+
+    Randomness is counter-based: each env's deals and dice are a hash of
+    (seed, env, episode, turn), so env i plays the same games whatever the
+    batch size and however other envs act. Finished envs are dealt a new
+    game within the same step (auto-reset).
+    """
+
+    def __init__(self, num_envs: int, num_players: int = 6, seed: int = 0,
+                 max_turns: int = 300, board: Optional[Board] = None):
+        if not 1 < num_players <= len(CHARACTER_IDS):
+            raise ValueError(f"num_players must be 2..{len(CHARACTER_IDS)}.")
+        self.num_envs = num_envs
+        self.num_players = num_players
+        self.max_turns = max_turns
+        self.board = board if board is not None else Board()
+        self._toward, self._passage = _toward_tables(self.board)
+        self._start = (len(ROOM_IDS) + np.arange(num_players)).astype(np.int16)  # start nodes
+        self._rows = np.arange(num_envs)
+        self._seed(seed)
+
+    def _seed(self, seed: int) -> None:
+        self.seed = seed
+        base = _mix(np.array([seed], np.uint64))
+        self._keys = _mix(base ^ np.arange(self.num_envs, dtype=np.uint64))
+        self.episode = np.zeros(self.num_envs, np.int64)
+        self._episode_keys = np.zeros(self.num_envs, np.uint64)  # hash of key and episode
+
+        n, s = self.num_envs, self.num_players
+        self.owner = np.zeros((n, NUM_CARDS), np.int8)  # seat, or -1 = envelope
+        self.solution = np.zeros((n, 3), np.int16)
+        self.position = np.zeros((n, s), np.int16)
+        self.weapons = np.zeros((n, len(WEAPON_IDS)), np.int16)
+        self.eliminated = np.zeros((n, s), np.bool_)
+        self.seen = np.zeros((n, s, NUM_CARDS), np.bool_)  # own hand + cards shown
+        self.current = np.zeros(n, np.intp)
+        self.turn = np.zeros(n, np.int32)
+
+    # --- Episodes --------------------------------------------------------------
+
+    def _deal(self, envs: np.ndarray) -> None:
+        """New games for these envs: one card per category to the envelope,
+        the rest shuffled and dealt round-robin as deck.deal_cards does."""
+        k = len(envs)
+        episode_keys = _mix(self._keys[envs] ^ self.episode[envs].astype(np.uint64))
+        self._episode_keys[envs] = episode_keys
+        # card c's shuffle key is hash(episode key, -c - 1); dice use turn numbers
+        card_counters = ~np.arange(NUM_CARDS, dtype=np.uint64)
+        keys = _mix(episode_keys[:, None] ^ card_counters)
+        solution = np.stack(
+            [ids.start + keys[:, ids.start:ids.stop].argmin(axis=1)
+             for ids in (CHARACTER_IDS, WEAPON_IDS, ROOM_IDS)], axis=1
+        )
+        rows = np.arange(k)[:, None]
+        keys[rows, solution] = np.iinfo(np.uint64).max
+        order = keys.argsort(axis=1)[:, :NUM_CARDS - 3]
+        owner = np.full((k, NUM_CARDS), NOBODY, np.int8)
+        owner[rows, order] = np.arange(NUM_CARDS - 3) % self.num_players
+
+        self.owner[envs] = owner
+        self.solution[envs] = solution
+        self.position[envs] = self._start
+        self.weapons[envs] = np.arange(len(WEAPON_IDS)) % len(ROOM_IDS)
+        self.eliminated[envs] = False
+        self.seen[envs] = owner[:, None, :] == np.arange(self.num_players)[None, :, None]
+        self.current[envs] = 0
+        self.turn[envs] = 0
+
+    def reset(self, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Deal every env's first game (optionally under a new seed)."""
+        if seed is not None:
+            self._seed(seed)
+        self.episode[:] = 0
+        self._deal(self._rows)
+        return self._observe()
+
+    def empty_actions(self) -> np.ndarray:
+        return np.zeros(self.num_envs, ACTION_DTYPE)
+
+    # --- Stepping --------------------------------------------------------------
+
+    def step(self, actions: np.ndarray):
+        """
+        One turn in every env. Returns (obs, reward, terminated, truncated,
+        info): reward is +1 / -1 for the acting seat's right / wrong
+        accusation; terminated marks a win or every seat eliminated,
+        truncated the max_turns limit. Finished envs are already reset in
+        obs; info holds the step's roll, refuter, shown card (as seen by
+        the acting seat) and winner, NOBODY where there is none.
+        """
+        n = self.num_envs
+        seat = self.current
+        alive = ~self.eliminated[self._rows, seat]
+        reward = np.zeros(n, np.float32)
+        winner = np.full(n, NOBODY, np.int8)
+        roll = np.zeros(n, np.int8)
+        refuter = np.full(n, NOBODY, np.int8)
+        shown = np.full(n, NOBODY, np.int16)
+
+        accuse = alive & actions["accuse"]
+        a = np.flatnonzero(accuse)
+        if len(a):
+            guess = np.stack(
+                [actions["suspect"][a], actions["weapon"][a], actions["room"][a]], axis=1
+            )
+            right = (guess == self.solution[a]).all(axis=1)
+            won, lost = a[right], a[~right]
+            reward[won] = 1.0
+            winner[won] = seat[won]
+            reward[lost] = -1.0
+            self.eliminated[lost, seat[lost]] = True
+
+        m = np.flatnonzero(alive & ~accuse)
+        if len(m):
+            self._move_and_suggest(m, seat[m], actions[m], roll, refuter, shown)
+
+        self.turn += 1
+        terminated = (winner >= 0) | self.eliminated.all(axis=1)
+        truncated = ~terminated & (self.turn >= self.max_turns)
+        self.current = (seat + 1) % self.num_players
+        done = np.flatnonzero(terminated | truncated)
+        if len(done):
+            self.episode[done] += 1
+            self._deal(done)
+        info = {"roll": roll, "refuter": refuter, "shown": shown, "winner": winner}
+        return self._observe(), reward, terminated, truncated, info
+
+    def _move_and_suggest(self, m, seat, actions, roll, refuter, shown) -> None:
+        room_pos = actions["room"].astype(np.intp) - ROOM_IDS.start
+        if ((room_pos < 0) | (room_pos >= len(ROOM_IDS))).any():
+            raise ValueError("action room must be a room card id")
+        pos = self.position[m, seat]
+        dest = self._passage[pos]
+        through = actions["passage"] & (dest >= 0)
+        h = _mix(self._episode_keys[m] ^ self.turn[m].astype(np.uint64))
+        dice = (h % np.uint64(MAX_ROLL)).astype(np.intp) + 1
+        new = np.where(through, dest, self._toward[pos, room_pos, dice])
+        self.position[m, seat] = new
+        roll[m] = np.where(through, 0, dice)
+
+        # every move ends in a room or on a start node; in a room, suggest
+        in_room = new < len(ROOM_IDS)
+        s, seat, new = m[in_room], seat[in_room], new[in_room]
+        suspect = actions["suspect"][in_room].astype(np.intp)
+        weapon = actions["weapon"][in_room].astype(np.intp)
+        if ((suspect < CHARACTER_IDS.start) | (suspect >= CHARACTER_IDS.stop)).any() or (
+            (weapon < WEAPON_IDS.start) | (weapon >= WEAPON_IDS.stop)
+        ).any():
+            raise ValueError("action suspect / weapon must be character / weapon card ids")
+        played = suspect < self.num_players  # seat i plays character i
+        self.position[s[played], suspect[played]] = new[played]
+        self.weapons[s, weapon - WEAPON_IDS.start] = new
+
+        # nearest holder clockwise of any of the three cards shows its lowest one
+        trio = np.stack([suspect, weapon, new + ROOM_IDS.start], axis=1)
+        owners = self.owner[s[:, None], trio].astype(np.intp)
+        offset = (owners - seat[:, None]) % self.num_players
+        offset[(owners < 0) | (offset == 0)] = self.num_players
+        first = offset.min(axis=1)
+        hit = first < self.num_players
+        card = np.where(offset == first[:, None], trio, NUM_CARDS).min(axis=1)
+        r = s[hit]
+        refuter[r] = (seat[hit] + first[hit]) % self.num_players
+        shown[r] = card[hit]
+        self.seen[r, seat[hit], card[hit]] = True
+
+    def _observe(self) -> Dict[str, np.ndarray]:
+        """What the seat to act may know: public state plus the cards it has seen."""
+        return {
+            "seat": self.current.copy(),
+            "turn": self.turn.copy(),
+            "positions": self.position.copy(),
+            "weapons": self.weapons.copy(),
+            "eliminated": self.eliminated.copy(),
+            "seen": self.seen[self._rows, self.current],
+        }
+
+    # --- Interop ---------------------------------------------------------------
+
+    def game(self, i: int, ai_seats: Iterable[int] = (), **kwargs):
+        """
+        Env i as a CluedoGame, e.g. to hand it to AIPlayers or inspect it:
+        same deal (hands in card-id order), positions, weapons, seat to act
+        and turn count. AI seats learn their own hand and the cards they
+        were shown; the env keeps no other knowledge.
+        """
+        from agents import AIAgent
+        from game import CluedoGame
+
+        owner = self.owner[i].tolist()
+        hands = [[CARDS[c] for c in range(NUM_CARDS) if owner[c] == s]
+                 for s in range(self.num_players)]
+        solution = tuple(CARDS[c] for c in self.solution[i].tolist())
+        ai_seats = list(ai_seats)
+        kwargs.setdefault("agents", [AIAgent() for _ in range(self.num_players)])
+        game = CluedoGame(self.num_players, ai_seats=ai_seats, verbose=False,
+                          deal=(solution, hands), **kwargs)
+        eliminated = 0
+        for s, out in enumerate(self.eliminated[i].tolist()):
+            eliminated |= out << s
+        game.restore(game.snapshot()._replace(
+            positions=tuple(self.position[i].tolist()),
+            weapons=tuple(self.weapons[i].tolist()),
+            eliminated=eliminated,
+            current=int(self.current[i]),
+            turn_count=int(self.turn[i]),
+        ))
+        for s in ai_seats:
+            player = game.players[s]
+            for c in np.flatnonzero(self.seen[i, s]).tolist():
+                if owner[c] != s:
+                    player.record_seen_card(c)
+                    player.record_player_has(game.players[owner[c]].id, c)
+        return game
+
+
+def seen_cards_policy(obs: Dict[str, np.ndarray], rng: np.random.Generator) -> np.ndarray:
+    """
+    Vectorized baseline for every seat: head for a random room not yet
+    seen, suggest a random unseen suspect and weapon, and accuse once a
+    single card per category is unseen. Knows only the cards it has seen.
+    """
+    unseen = ~obs["seen"]
+    keys = rng.random(unseen.shape)
+    keys[~unseen] = -1.0
+    pick = [ids.start + keys[:, ids.start:ids.stop].argmax(axis=1)
+            for ids in (CHARACTER_IDS, WEAPON_IDS, ROOM_IDS)]
+    actions = np.zeros(len(unseen), ACTION_DTYPE)
+    actions["suspect"], actions["weapon"], actions["room"] = pick
+    actions["accuse"] = np.all(
+        [unseen[:, ids.start:ids.stop].sum(axis=1) == 1
+         for ids in (CHARACTER_IDS, WEAPON_IDS, ROOM_IDS)], axis=0
+    )
+    return actions